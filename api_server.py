@@ -1,6 +1,5 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-import threading
 import time
 import os
 import signal
@@ -9,33 +8,36 @@ import atexit
 from typing import Dict, Any
 import json
 
-from src.config import Config
-from src.main import single_run
-from src.state import load_state, save_state
+from src import metrics
+from src.config import Config, parse_keywords
+from src.events import EventBroadcaster
+from src.history import MatchHistory
+from src.profiles import RESULTS_RETAINED, ProfileManager
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for browser extensions
 
 # Global state
-automation_enabled = False
-automation_thread = None
-current_config = None
-scrape_running = False
-latest_results = []  # Store latest scraping results
+current_config = None  # APIConfig of the "default" profile (the /api/config endpoints)
+PROFILES_FILE = 'api_profiles.json'  # named profiles other than "default"
+RESULTS_EPOCH = format(int(time.time()), 'x')  # tags results cursors and ETags with this server run
+# Every watch runs as a profile; at most MAX_BROWSERS Chrome instances are live
+profiles = ProfileManager(
+    max_browsers=int(os.getenv("MAX_BROWSERS", "2")),
+    on_event=lambda message, event_type='info': add_activity_event(message, event_type),
+)
+
+def default_profile():
+    return profiles.get('default')
 
 # Cleanup function for graceful shutdown
 def cleanup_and_exit():
     """Clean up resources and exit gracefully"""
-    global automation_enabled, automation_thread
-    
     print("\n[API] Shutting down server...")
     
-    # Stop automation if running
-    if automation_enabled:
-        automation_enabled = False
-        if automation_thread and automation_thread.is_alive():
-            print("[API] Stopping automation thread...")
-            automation_thread.join(timeout=5)
+    # Stop automation and close every profile's browser
+    profiles.shutdown()
+    activity.close()
     
     print("[API] Server shutdown complete.")
     sys.exit(0)
@@ -57,9 +59,10 @@ atexit.register(cleanup_and_exit)
 
 class APIConfig:
     """Configuration class for API-received settings"""
-    def __init__(self, config_data: Dict[str, Any]):
+    def __init__(self, config_data: Dict[str, Any], name: str = 'default'):
         # Store the original config data
         self.config_data = config_data
+        self.name = name
         
         # Don't modify environment variables, instead create config directly
         telegram_token = config_data['telegram'].get('botToken', '') if 'telegram' in config_data else ''
@@ -86,39 +89,35 @@ class APIConfig:
             encoded_query = urllib.parse.quote(search_query)
             search_url = f"https://x.com/search?q={encoded_query}&f=live"
             
-            print(f"[API] Updated search configuration:")
+            print(f"[API] Updated search configuration ({name}):")
             print(f"[API] - Search Keywords: {search_keywords}")
             print(f"[API] - Generated Search Query: {search_query}")
             print(f"[API] - Generated Search URL: {search_url}")
         else:
-            print(f"[API] Warning: No search keywords provided. Using empty search query.")
-        
-        # Update environment variables temporarily for this config
-        os.environ['TELEGRAM_BOT_TOKEN'] = telegram_token
-        os.environ['TELEGRAM_CHAT_ID'] = telegram_chat
-        os.environ['TWITTER_USERNAME'] = twitter_username
-        os.environ['TWITTER_EMAIL'] = twitter_email
-        os.environ['TWITTER_PASSWORD'] = twitter_password
-        
-        # Always set SEARCH_QUERY and SEARCH_URL, even if empty, to override defaults
-        os.environ['SEARCH_QUERY'] = search_query
-        os.environ['SEARCH_URL'] = search_url
-        
-        # Set contact address requirement
-        os.environ['CONTACT_ADDRESS_REQUIRED'] = str(contact_address_required).lower()
-        print(f"[API] - Contact Address Required: {contact_address_required}")
-        if required_post_keywords:
-            os.environ['REQUIRED_POST_KEYWORDS'] = ','.join(required_post_keywords)
-            print(f"[API] - Set REQUIRED_POST_KEYWORDS: {required_post_keywords}")
-        else:
-            os.environ.pop('REQUIRED_POST_KEYWORDS', None)
-            print(f"[API] - Cleared REQUIRED_POST_KEYWORDS (no optional keywords provided)")
+            print(f"[API] Warning: No search keywords provided for {name}. Using empty search query.")
         
-        # Set contact address requirement
         print(f"[API] - Contact Address Required: {contact_address_required}")
-        
-        # Create Config object with updated environment
-        self.config = Config()
+        print(f"[API] - Required Post Keywords: {required_post_keywords or 'None'}")
+        
+        changes = {}
+        if config_data.get('intervalSec'):
+            changes['run_interval_sec'] = int(config_data['intervalSec'])
+        
+        # Each profile gets its own immutable Config; the process environment
+        # only supplies defaults, so several profiles can coexist
+        self.config = Config.for_profile(
+            name,
+            telegram_bot_token=telegram_token,
+            telegram_chat_id=telegram_chat,
+            twitter_username=twitter_username,
+            twitter_email=twitter_email,
+            twitter_password=twitter_password,
+            search_query=search_query,
+            search_url=search_url,
+            contact_address_required=contact_address_required,
+            required_post_keywords=parse_keywords(required_post_keywords),
+            **changes,
+        )
         
         # Store the values we actually set
         self.search_query = search_query
@@ -126,32 +125,24 @@ class APIConfig:
         self.required_post_keywords = required_post_keywords
         self.contact_address_required = contact_address_required
 
-def automation_worker():
-    """Background worker for automation mode"""
-    global automation_enabled, scrape_running, current_config, latest_results
-    
-    while automation_enabled:
-        if current_config and not scrape_running:
-            try:
-                scrape_running = True
-                add_activity_event("🤖 Running automated scrape...", "info")
-                print("[API] Running automated scrape...")
-                result = single_run(current_config.config, return_results=True)
-                sent_count, results = result if isinstance(result, tuple) else (result, [])
-                latest_results[:] = results  # Update global results
-                add_activity_event(f"✅ Automated scrape completed - sent {sent_count} messages", "success")
-                print("[API] Automated scrape completed")
-            except Exception as e:
-                add_activity_event(f"❌ Automated scrape failed: {str(e)}", "error")
-                print(f"[API] Automation error: {e}")
-            finally:
-                scrape_running = False
-        
-        # Wait 10 minutes (600 seconds) between runs
-        for i in range(600):
-            if not automation_enabled:
-                break
-            time.sleep(1)
+def validate_config_data(config_data):
+    """Return an error message if a posted configuration is incomplete"""
+    if not config_data:
+        return 'No configuration data provided'
+    for field in ['telegram', 'twitter', 'keywords']:
+        if field not in config_data:
+            return f'Missing required field: {field}'
+    return None
+
+def missing_run_settings(cfg: Config):
+    """Return an error message if cfg cannot be scraped and delivered with"""
+    if not cfg.telegram_bot_token:
+        return 'Telegram Bot Token not configured'
+    if not cfg.telegram_chat_id:
+        return 'Telegram Chat ID not configured'
+    if not cfg.twitter_username:
+        return 'Twitter username not configured'
+    return None
 
 @app.route('/status', methods=['GET'])
 def health_check():
@@ -159,8 +150,9 @@ def health_check():
     return jsonify({
         'status': 'online',
         'message': 'Backend is running',
-        'automation_enabled': automation_enabled,
-        'scrape_running': scrape_running
+        'automation_enabled': bool(default_profile() and default_profile().automation),
+        'scrape_running': bool(default_profile() and default_profile().running),
+        'profiles': len(profiles.all())
     })
 
 @app.route('/api/config', methods=['POST'])
@@ -171,17 +163,13 @@ def save_config():
     try:
         config_data = request.get_json()
         
-        if not config_data:
-            return jsonify({'error': 'No configuration data provided'}), 400
-        
-        # Validate required fields
-        required_fields = ['telegram', 'twitter', 'keywords']
-        for field in required_fields:
-            if field not in config_data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        error = validate_config_data(config_data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Create API config that updates environment variables
+        # Build the default profile's config and swap it in
         current_config = APIConfig(config_data)
+        profiles.put('default', current_config.config, config_data)
         
         # Save config to file for persistence
         config_file = 'api_config.json'
@@ -200,16 +188,17 @@ def save_config():
 @app.route('/api/config/debug', methods=['GET'])
 def debug_config():
     """Debug endpoint to see current configuration"""
+    cfg = current_config.config if current_config else None
     return jsonify({
-        'environment_vars': {
-            'SEARCH_QUERY': os.environ.get('SEARCH_QUERY'),
-            'SEARCH_URL': os.environ.get('SEARCH_URL'),
-            'REQUIRED_POST_KEYWORDS': os.environ.get('REQUIRED_POST_KEYWORDS'),
-            'TELEGRAM_BOT_TOKEN': '***' if os.environ.get('TELEGRAM_BOT_TOKEN') else None,
-            'TELEGRAM_CHAT_ID': os.environ.get('TELEGRAM_CHAT_ID'),
-            'TWITTER_USERNAME': os.environ.get('TWITTER_USERNAME'),
-            'TWITTER_EMAIL': os.environ.get('TWITTER_EMAIL'),
-            'TWITTER_PASSWORD': '***' if os.environ.get('TWITTER_PASSWORD') else None,
+        'config_values': {
+            'SEARCH_QUERY': cfg.search_query if cfg else None,
+            'SEARCH_URL': cfg.search_url if cfg else None,
+            'REQUIRED_POST_KEYWORDS': ','.join(cfg.required_post_keywords) if cfg else None,
+            'TELEGRAM_BOT_TOKEN': '***' if cfg and cfg.telegram_bot_token else None,
+            'TELEGRAM_CHAT_ID': cfg.telegram_chat_id if cfg else None,
+            'TWITTER_USERNAME': cfg.twitter_username if cfg else None,
+            'TWITTER_EMAIL': cfg.twitter_email if cfg else None,
+            'TWITTER_PASSWORD': '***' if cfg and cfg.twitter_password else None,
         },
         'has_current_config': current_config is not None,
         'api_config_file_exists': os.path.exists('api_config.json'),
@@ -231,19 +220,122 @@ def get_config():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/results', methods=['GET'])
-def get_results():
-    """Get latest scraping results"""
-    global latest_results
-    try:
-        return jsonify({
+def results_cursor(seq):
+    """Opaque results cursor: the server run's epoch plus a match `seq`"""
+    return f'{RESULTS_EPOCH}:{seq}'
+
+def parse_results_cursor(value):
+    """The `seq` in a cursor of this server run, or None for a foreign/invalid one"""
+    epoch, _, seq = (value or '').partition(':')
+    if epoch != RESULTS_EPOCH or not seq.isdigit():
+        return None
+    return int(seq)
+
+def results_response(profile):
+    """Matches of a profile newer than ?since=<cursor>, with an ETag for cheap re-polls.
+
+    Every match carries an increasing `seq`; clients pass the returned
+    `cursor` as `since` next time. Sequence numbers restart with the
+    server, so cursors carry the run's epoch: one from another run gets
+    the full history with `reset: true`.
+    """
+    feed = profile.results if profile else None
+    last_seq = feed.last_id if feed else 0
+    raw = request.args.get('since')
+    since = parse_results_cursor(raw)
+    reset = raw is not None and (since is None or since > last_seq)
+    if since is None or reset:
+        since = 0
+    cursor = results_cursor(last_seq)
+    etag = f'W/"{cursor}-{since}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = Response(status=304)
+    else:
+        results = feed.since(since) if feed else []
+        response = jsonify({
             'status': 'success',
-            'results': latest_results,
-            'count': len(latest_results),
+            'results': results,
+            'count': len(results),
+            'cursor': cursor,
+            'reset': reset,
             'timestamp': time.time()
         })
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def results_stream(profile):
+    """SSE push of new matches; resumes after Last-Event-ID (or ?since=)"""
+    resume = last_event_id()
+    if resume is None and request.args.get('since') is not None:
+        # A cursor from another server run replays everything retained
+        resume = parse_results_cursor(request.args.get('since')) or 0
+    if resume is None:
+        # Without a cursor only matches found from now on are sent
+        resume = profile.results.last_id
+    return sse_response(profile.results.stream(resume, backlog=0, event_name='result'))
+
+@app.route('/api/results', methods=['GET'])
+def get_results():
+    """Get scraping results (all retained, or only those after ?since=<cursor>)"""
+    try:
+        return results_response(default_profile())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/results/stream')
+def stream_results():
+    """Server-sent events with each new match as it is found"""
+    profile = default_profile()
+    if not profile:
+        return jsonify({'error': 'No configuration available. Please save configuration first.'}), 400
+    return results_stream(profile)
+
+def history_for(name):
+    """Match history of a profile (?profile=, default "default"), or an error response"""
+    name = name or 'default'
+    profile = profiles.get(name)
+    if not profile:
+        return None, (jsonify({'error': f'Unknown profile: {name}'}), 404)
+    return MatchHistory(profile.cfg.history_db_path), None
+
+@app.route('/api/history', methods=['GET'])
+def search_history():
+    """Search every match ever found: ?q=&mint=&username=&feed=&since=&until=&limit=&before="""
+    history, error = history_for(request.args.get('profile'))
+    if error:
+        return error
+    try:
+        page = history.search(
+            text=request.args.get('q', ''),
+            mint=request.args.get('mint', ''),
+            username=request.args.get('username', ''),
+            feed=request.args.get('feed', ''),
+            since=request.args.get('since', type=float),
+            until=request.args.get('until', type=float),
+            limit=request.args.get('limit', 50, type=int),
+            before=request.args.get('before', type=int),
+        )
+        return jsonify({'status': 'success', 'results': page['items'], 'count': len(page['items']),
+                        'next': page['next']})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+    finally:
+        history.close()
+
+@app.route('/api/history/mints/<mint>', methods=['GET'])
+def mint_first_seen(mint):
+    """When a contract address was first seen, and in which tweet"""
+    history, error = history_for(request.args.get('profile'))
+    if error:
+        return error
+    try:
+        found = history.first_seen(mint)
+        if not found:
+            return jsonify({'error': f'Mint not in history: {mint}'}), 404
+        return jsonify({'status': 'success', **found})
+    finally:
+        history.close()
 
 @app.route('/api/credentials/clear-session', methods=['POST'])
 def clear_session():
@@ -251,24 +343,35 @@ def clear_session():
     try:
         import shutil
         
+        # The live browser holds the profile open
+        profiles.release('default')
+        cfg = current_config.config if current_config else Config()
+        
         # Clear Chrome user data directory
-        user_data_dir = os.getenv("USER_DATA_DIR", "data/chrome_profile")
+        user_data_dir = cfg.user_data_dir
         if os.path.exists(user_data_dir):
             shutil.rmtree(user_data_dir)
             print(f"[API] Cleared Chrome profile directory: {user_data_dir}")
         
         # Clear cookies file
-        cookies_path = os.getenv("COOKIES_PATH", "data/cookies.json")
+        cookies_path = cfg.cookies_path
         if os.path.exists(cookies_path):
             os.remove(cookies_path)
             print(f"[API] Cleared cookies file: {cookies_path}")
         
         # Clear state file
-        state_path = os.getenv("STATE_PATH", "data/state.json")
+        state_path = cfg.state_path
         if os.path.exists(state_path):
             os.remove(state_path)
             print(f"[API] Cleared state file: {state_path}")
         
+        # Clear state database (with its WAL side files)
+        state_db_path = cfg.state_db_path
+        for path in (state_db_path, state_db_path + "-wal", state_db_path + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"[API] Cleared state database file: {path}")
+        
         return jsonify({
             'status': 'success',
             'message': 'Browser sessions and cached data cleared successfully'
@@ -321,12 +424,14 @@ def validate_credentials():
         if twitter_changed:
             try:
                 import shutil
-                user_data_dir = os.getenv("USER_DATA_DIR", "data/chrome_profile")
+                profiles.release('default')
+                cfg = current_config.config if current_config else Config()
+                user_data_dir = cfg.user_data_dir
                 if os.path.exists(user_data_dir):
                     shutil.rmtree(user_data_dir)
                     print(f"[API] Twitter credentials changed - cleared Chrome profile: {user_data_dir}")
                 
-                cookies_path = os.getenv("COOKIES_PATH", "data/cookies.json")
+                cookies_path = cfg.cookies_path
                 if os.path.exists(cookies_path):
                     os.remove(cookies_path)
                     print(f"[API] Cleared cookies file: {cookies_path}")
@@ -347,72 +452,45 @@ def validate_credentials():
 @app.route('/api/scrape', methods=['POST'])
 def start_manual_scrape():
     """Start manual scrape operation"""
-    global current_config, scrape_running, latest_results
-    
     try:
-        if scrape_running:
+        profile = default_profile()
+        if profile and profile.running:
             return jsonify({'error': 'Scrape already in progress'}), 409
         
-        if not current_config:
+        if not current_config or not profile:
             return jsonify({'error': 'No configuration available. Please save configuration first.'}), 400
         
         # Validate required configuration
-        if not os.environ.get('TELEGRAM_BOT_TOKEN'):
-            return jsonify({'error': 'Telegram Bot Token not configured'}), 400
-            
-        if not os.environ.get('TELEGRAM_CHAT_ID'):
-            return jsonify({'error': 'Telegram Chat ID not configured'}), 400
-            
-        if not os.environ.get('TWITTER_USERNAME'):
-            return jsonify({'error': 'Twitter username not configured'}), 400
+        cfg = current_config.config
+        error = missing_run_settings(cfg)
+        if error:
+            return jsonify({'error': error}), 400
             
         # Allow empty search query - it will search all tweets if no keywords specified
-        search_query = os.environ.get('SEARCH_QUERY', '')
+        search_query = cfg.search_query
         
         print(f"[API] Starting manual scrape with:")
         print(f"[API] - Search Query: '{search_query}' {'(empty - will search all tweets)' if not search_query else ''}")
-        print(f"[API] - Search URL: {os.environ.get('SEARCH_URL')}")
-        print(f"[API] - Required Post Keywords: {os.environ.get('REQUIRED_POST_KEYWORDS', 'None')}")
-        print(f"[API] - Contact Address Required: {os.environ.get('CONTACT_ADDRESS_REQUIRED', 'true')}")
-        
-        # Start scrape in background thread
-        def run_scrape():
-            global scrape_running
-            try:
-                scrape_running = True
-                add_activity_event("🔄 Starting manual scrape...", "info")
-                add_activity_event("📋 Connecting to Twitter feeds...", "info")
-                add_activity_event("🔍 Searching for tweets with configured keywords...", "info")
-                
-                print("[API] Starting manual scrape...")
-                result = single_run(current_config.config, return_results=True)
-                sent_count, results = result if isinstance(result, tuple) else (result, [])
-                latest_results[:] = results  # Update global results
-                
-                add_activity_event(f"✅ Manual scrape completed successfully", "success")
-                add_activity_event(f"📊 Found and sent {sent_count} new messages to Telegram", "success")
-                print(f"[API] Manual scrape completed. Sent {sent_count} messages.")
-            except Exception as e:
-                add_activity_event(f"❌ Manual scrape failed: {str(e)}", "error")
-                print(f"[API] Manual scrape error: {e}")
-                import traceback
-                traceback.print_exc()
-            finally:
-                scrape_running = False
-        
-        scrape_thread = threading.Thread(target=run_scrape)
-        scrape_thread.daemon = True
-        scrape_thread.start()
+        print(f"[API] - Search URL: {cfg.search_url}")
+        print(f"[API] - Required Post Keywords: {','.join(cfg.required_post_keywords) or 'None'}")
+        print(f"[API] - Contact Address Required: {str(cfg.contact_address_required).lower()}")
+        
+        # Run the scrape on the profile worker pool
+        add_activity_event("🔄 Starting manual scrape...", "info")
+        add_activity_event("📋 Connecting to Twitter feeds...", "info")
+        add_activity_event("🔍 Searching for tweets with configured keywords...", "info")
+        if not profiles.trigger('default'):
+            return jsonify({'error': 'Scrape already in progress'}), 409
         
         return jsonify({
             'status': 'success',
             'message': 'Manual scrape started',
             'scrape_running': True,
             'config_summary': {
-                'search_query': os.environ.get('SEARCH_QUERY'),
-                'has_telegram': bool(os.environ.get('TELEGRAM_BOT_TOKEN')),
-                'has_twitter': bool(os.environ.get('TWITTER_USERNAME')),
-                'required_post_keywords': os.environ.get('REQUIRED_POST_KEYWORDS', 'None')
+                'search_query': search_query,
+                'has_telegram': bool(cfg.telegram_bot_token),
+                'has_twitter': bool(cfg.twitter_username),
+                'required_post_keywords': ','.join(cfg.required_post_keywords) or 'None'
             }
         })
         
@@ -425,37 +503,26 @@ def start_manual_scrape():
 @app.route('/api/automation', methods=['POST'])
 def toggle_automation():
     """Toggle automation on/off"""
-    global automation_enabled, automation_thread, current_config
-    
     try:
         data = request.get_json()
         enabled = data.get('enabled', False)
+        profile = default_profile()
         
-        if not current_config and enabled:
+        if (not current_config or not profile) and enabled:
             return jsonify({'error': 'No configuration available. Please save configuration first.'}), 400
         
-        if enabled and not automation_enabled:
-            # Start automation
-            automation_enabled = True
-            automation_thread = threading.Thread(target=automation_worker)
-            automation_thread.daemon = True
-            automation_thread.start()
-            message = 'Automation enabled'
-            
-        elif not enabled and automation_enabled:
-            # Stop automation
-            automation_enabled = False
-            if automation_thread:
-                automation_thread.join(timeout=1)
-            message = 'Automation disabled'
-            
+        was_enabled = bool(profile and profile.automation)
+        if enabled != was_enabled:
+            # The profile scheduler runs the scrapes on its adaptive interval
+            profiles.set_automation('default', enabled)
+            message = f'Automation {"enabled" if enabled else "disabled"}'
         else:
             message = f'Automation already {"enabled" if enabled else "disabled"}'
         
         return jsonify({
             'status': 'success',
             'message': message,
-            'automation_enabled': automation_enabled
+            'automation_enabled': bool(profile and profile.automation)
         })
         
     except Exception as e:
@@ -464,12 +531,103 @@ def toggle_automation():
 @app.route('/api/automation/status', methods=['GET'])
 def get_automation_status():
     """Get current automation status"""
+    profile = default_profile()
     return jsonify({
-        'enabled': automation_enabled,
-        'scrape_running': scrape_running,
+        'enabled': bool(profile and profile.automation),
+        'scrape_running': bool(profile and profile.running),
         'has_config': current_config is not None
     })
 
+@app.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """List watch profiles with their run status"""
+    return jsonify({
+        'profiles': [p.status() for p in profiles.all()],
+        'max_browsers': profiles.max_browsers
+    })
+
+@app.route('/api/profiles/<name>', methods=['PUT', 'POST'])
+def save_profile(name):
+    """Create or update a named watch profile (same body as /api/config, plus optional intervalSec)"""
+    global current_config
+    
+    try:
+        config_data = request.get_json()
+        error = validate_config_data(config_data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        api_config = APIConfig(config_data, name=name)
+        profile = profiles.put(name, api_config.config, config_data)
+        if name == 'default':
+            current_config = api_config
+            with open('api_config.json', 'w') as f:
+                json.dump(config_data, f, indent=2)
+        else:
+            profiles.save(PROFILES_FILE)
+        return jsonify({'status': 'success', 'profile': profile.status()})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """Status and latest results of one profile"""
+    profile = profiles.get(name)
+    if not profile:
+        return jsonify({'error': f'Unknown profile: {name}'}), 404
+    results = profile.results.recent(RESULTS_RETAINED)
+    return jsonify({'profile': profile.status(), 'results': results, 'count': len(results),
+                    'cursor': results_cursor(profile.results.last_id)})
+
+@app.route('/api/profiles/<name>/results', methods=['GET'])
+def get_profile_results(name):
+    """Results of one profile, incremental with ?since=<cursor> and ETag"""
+    profile = profiles.get(name)
+    if not profile:
+        return jsonify({'error': f'Unknown profile: {name}'}), 404
+    return results_response(profile)
+
+@app.route('/api/profiles/<name>/results/stream')
+def stream_profile_results(name):
+    """Server-sent events with each new match of one profile"""
+    profile = profiles.get(name)
+    if not profile:
+        return jsonify({'error': f'Unknown profile: {name}'}), 404
+    return results_stream(profile)
+
+@app.route('/api/profiles/<name>', methods=['DELETE'])
+def delete_profile(name):
+    """Remove a profile and stop its browser"""
+    if name == 'default':
+        return jsonify({'error': 'The default profile is managed through /api/config'}), 400
+    if not profiles.remove(name):
+        return jsonify({'error': f'Unknown profile: {name}'}), 404
+    profiles.save(PROFILES_FILE)
+    return jsonify({'status': 'success', 'message': f'Profile {name} removed'})
+
+@app.route('/api/profiles/<name>/scrape', methods=['POST'])
+def scrape_profile(name):
+    """Start a scrape of one profile"""
+    profile = profiles.get(name)
+    if not profile:
+        return jsonify({'error': f'Unknown profile: {name}'}), 404
+    error = missing_run_settings(profile.cfg)
+    if error:
+        return jsonify({'error': error}), 400
+    if not profiles.trigger(name):
+        return jsonify({'error': 'Scrape already in progress'}), 409
+    return jsonify({'status': 'success', 'message': f'Scrape of {name} started'})
+
+@app.route('/api/profiles/<name>/automation', methods=['POST'])
+def toggle_profile_automation(name):
+    """Turn scheduled scraping of one profile on or off"""
+    data = request.get_json() or {}
+    if not profiles.set_automation(name, bool(data.get('enabled', False))):
+        return jsonify({'error': f'Unknown profile: {name}'}), 404
+    return jsonify({'status': 'success', 'profile': profiles.get(name).status()})
+
 @app.route('/api/logs', methods=['GET'])
 def get_logs():
     """Get recent activity logs"""
@@ -497,70 +655,71 @@ def load_saved_config():
             with open(config_file, 'r') as f:
                 config_data = json.load(f)
             current_config = APIConfig(config_data)
+            profiles.put('default', current_config.config, config_data)
+            cfg = current_config.config
             print(f"[API] Loaded saved configuration:")
-            print(f"[API] - Search Query: {os.environ.get('SEARCH_QUERY', 'Not set')}")
-            print(f"[API] - Required Post Keywords: {os.environ.get('REQUIRED_POST_KEYWORDS', 'Not set')}")
-            print(f"[API] - Telegram Bot Token: {'Set' if os.environ.get('TELEGRAM_BOT_TOKEN') else 'Not set'}")
-            print(f"[API] - Twitter Username: {os.environ.get('TWITTER_USERNAME', 'Not set')}")
+            print(f"[API] - Search Query: {cfg.search_query or 'Not set'}")
+            print(f"[API] - Required Post Keywords: {','.join(cfg.required_post_keywords) or 'Not set'}")
+            print(f"[API] - Telegram Bot Token: {'Set' if cfg.telegram_bot_token else 'Not set'}")
+            print(f"[API] - Twitter Username: {cfg.twitter_username or 'Not set'}")
     except Exception as e:
         print(f"[API] Error loading saved config: {e}")
+    
+    # Named profiles
+    try:
+        for name, config_data in ProfileManager.load(PROFILES_FILE).items():
+            profiles.put(name, APIConfig(config_data, name=name).config, config_data)
+            print(f"[API] Loaded profile: {name}")
+    except Exception as e:
+        print(f"[API] Error loading saved profiles: {e}")
 
-# Simple event system for real-time updates
-activity_events = []
+# Activity events, pushed to every /api/activity/events subscriber
 MAX_EVENTS = 50
+activity = EventBroadcaster(MAX_EVENTS)
 
 def add_activity_event(message, event_type='info'):
     """Add an activity event for real-time logging"""
-    global activity_events
     import datetime
     
-    event = {
+    event = activity.publish({
         'timestamp': datetime.datetime.now().strftime('%H:%M:%S'),
         'message': message,
         'type': event_type,
-        'id': len(activity_events)
-    }
-    
-    activity_events.append(event)
-    
-    # Keep only recent events
-    if len(activity_events) > MAX_EVENTS:
-        activity_events = activity_events[-MAX_EVENTS:]
+    })
     
     print(f"[ACTIVITY] {event['timestamp']} - {message}")
 
-@app.route('/api/activity/events')
-def activity_stream():
-    """Server-sent events endpoint for real-time activity updates"""
-    def generate():
-        # Send existing events first
-        for event in activity_events[-10:]:  # Send last 10 events
-            yield f"data: {json.dumps(event)}\n\n"
-        
-        # Keep connection alive and send new events
-        # Note: This is a simple implementation. For production, use Redis or similar
-        last_event_id = len(activity_events)
-        
-        import time
-        while True:
-            # Check for new events
-            if len(activity_events) > last_event_id:
-                for event in activity_events[last_event_id:]:
-                    yield f"data: {json.dumps(event)}\n\n"
-                last_event_id = len(activity_events)
-            
-            time.sleep(1)  # Check every second
-    
-    response = app.response_class(generate(), mimetype='text/plain')
+def last_event_id():
+    """Resume point from the Last-Event-ID header (or ?lastEventId=), if any"""
+    value = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+def sse_response(stream):
+    response = Response(stream, mimetype='text/event-stream')
     response.headers['Cache-Control'] = 'no-cache'
     response.headers['X-Accel-Buffering'] = 'no'
     return response
 
+@app.route('/api/activity/events')
+def activity_stream():
+    """Server-sent events endpoint for real-time activity updates"""
+    # Sends the last 10 events (or those missed since Last-Event-ID), then
+    # blocks until new ones are published
+    return sse_response(activity.stream(last_event_id(), backlog=10))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Per-stage timings and counters in the Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/activity/log', methods=['GET'])
 def get_activity_log():
     """Get recent activity log events"""
     return jsonify({
-        'events': activity_events[-20:] if activity_events else []
+        'events': activity.recent(20)
     })
 
 if __name__ == '__main__':
@@ -570,6 +729,13 @@ if __name__ == '__main__':
         # Load any previously saved configuration
         load_saved_config()
         
+        # Import selenium in the background (and with PREWARM_BROWSER=true also
+        # launch Chrome) so the first scrape does not pay for a cold start
+        prewarm_browser = (os.getenv('PREWARM_BROWSER', 'false').lower() == 'true'
+                           and current_config is not None
+                           and not missing_run_settings(current_config.config))
+        profiles.prewarm('default', browser=prewarm_browser)
+        
         # Start Flask server with better error handling
         app.run(
             host='localhost',  # Bind specifically to localhost
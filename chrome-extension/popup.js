@@ -101,19 +101,27 @@ class BackendAPI {
     }
   }
 
-  async getResults() {
+  async getResults(since = null) {
     try {
-      const response = await fetch(`${this.baseUrl}/api/results`, {
+      // Only matches after the cursor are sent; 304 means nothing new
+      const query = since !== null ? `?since=${encodeURIComponent(since)}` : '';
+      const headers = { 'Content-Type': 'application/json' };
+      if (since !== null && this.resultsEtag) {
+        headers['If-None-Match'] = this.resultsEtag;
+      }
+      const response = await fetch(`${this.baseUrl}/api/results${query}`, {
         method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-        },
+        headers,
       });
       
+      if (response.status === 304) {
+        return { results: [], cursor: since, notModified: true };
+      }
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
       
+      this.resultsEtag = response.headers.get('ETag');
       return await response.json();
     } catch (error) {
       console.error('Get results failed:', error);
@@ -190,6 +198,7 @@ class CryptoScraperUI {
     this.isLoading = false;
     this.currentTab = 'results';
     this.results = [];
+    this.resultsCursor = null;
     this.activityLogTimer = null;
     this.init();
   }
@@ -296,8 +305,12 @@ class CryptoScraperUI {
 
   async loadResults() {
     try {
-      const data = await this.api.getResults();
-      this.results = data.results || [];
+      const data = await this.api.getResults(this.resultsCursor);
+      if (data.notModified) return;
+      // Newest first; a reset cursor (server restart) replaces the list
+      const fresh = (data.results || []).slice().reverse();
+      this.results = (this.resultsCursor === null || data.reset ? fresh : fresh.concat(this.results)).slice(0, 200);
+      if (data.cursor !== undefined) this.resultsCursor = data.cursor;
       this.displayResults();
       document.getElementById('resultsCount').textContent = `${this.results.length} results`;
     } catch (error) {
@@ -0,0 +1,172 @@
+"""Offline benchmark of the scrape pipeline on synthetic or recorded timelines.
+
+    python -m src.bench                      # 1k, 10k and 100k synthetic tweets
+    python -m src.bench --sizes 5000 --fixture data/capture.jsonl
+
+Each stage (parse, collect, filter, format, end-to-end cycle) is timed on its
+own and reported as items/s; a second, traced pass records the memory each
+stage allocates. No browser or network is used.
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .config import Config, parse_keywords
+
+B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+WORDS = ("gm", "the", "sol", "project", "chart", "moon", "dev", "community", "pump",
+         "wallet", "airdrop", "stealth", "fair", "liquidity", "burned", "ser", "team")
+PHRASES = ("coming soon", "launching soon", "launch", "live now")
+PAGE_SIZE = 20
+
+
+def _mint(rng: random.Random) -> str:
+    return "".join(rng.choice(B58) for _ in range(44))
+
+
+def _tweet_text(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 40))]
+    roll = rng.random()
+    if roll < 0.15:
+        words.insert(rng.randrange(len(words)), _mint(rng))
+    elif roll < 0.25:
+        words.append(f"https://pump.fun/coin/{_mint(rng)}")
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+    return " ".join(words)
+
+
+def _graphql_entry(status_id: int, text: str, rng: random.Random) -> Dict[str, Any]:
+    screen_name = f"user{rng.randint(1, 5000)}"
+    return {
+        "entryId": f"tweet-{status_id}",
+        "content": {"itemContent": {"itemType": "TimelineTweet", "tweet_results": {"result": {
+            "__typename": "Tweet",
+            "rest_id": str(status_id),
+            "core": {"user_results": {"result": {"legacy": {"name": screen_name.title(), "screen_name": screen_name}}}},
+            "legacy": {
+                "id_str": str(status_id),
+                "full_text": text,
+                "created_at": "Wed Oct 10 20:19:24 +0000 2018",
+                "favorite_count": rng.randint(0, 5000),
+                "reply_count": rng.randint(0, 500),
+                "retweet_count": rng.randint(0, 800),
+                "entities": {"urls": []},
+            },
+        }}}},
+    }
+
+
+def _write_capture(path: Path, kind: str, entries: List[Dict[str, Any]]):
+    """Write entries as SearchTimeline-shaped responses of PAGE_SIZE tweets each."""
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(0, len(entries), PAGE_SIZE):
+            body = {"data": {"timeline": {"instructions": [
+                {"type": "TimelineAddEntries", "entries": entries[i:i + PAGE_SIZE]},
+            ]}}}
+            f.write(json.dumps({"url": "", "kind": kind, "captured_at": 0, "body": body}) + "\n")
+
+
+def build_corpus(size: int, out_dir: Path, fixture: str = "", seed: int = 7) -> Dict[str, str]:
+    """Write latest/top/home captures holding `size` tweets in total.
+
+    Latest gets the whole corpus newest-first; Top and Home each repeat a 10%
+    sample so the cross-feed de-duplication has work to do. With a fixture,
+    its recorded texts are recycled under fresh ids instead of synthetic ones.
+    """
+    from .replay import load_fixture
+
+    rng = random.Random(seed)
+    texts = [t["text"] for t in load_fixture(fixture)] if fixture else []
+    base_id = 1_800_000_000_000_000_000
+    entries = []
+    for i in range(size):
+        text = texts[i % len(texts)] if texts else _tweet_text(rng)
+        entries.append(_graphql_entry(base_id + size - i, text, rng))
+    paths = {}
+    for kind, chosen in (("latest", entries),
+                         ("top", rng.sample(entries, size // 10)),
+                         ("home", rng.sample(entries, size // 10))):
+        paths[kind] = str(out_dir / f"{kind}.jsonl")
+        _write_capture(Path(paths[kind]), kind, chosen)
+    return paths
+
+
+def _measure(fn: Callable[[], Any], trace: bool) -> Tuple[Any, float, int]:
+    """Run fn quietly; returns (result, seconds, peak bytes allocated when traced)."""
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_pipeline(cfg: Config, paths: Dict[str, str], trace: bool = False) -> Dict[str, Tuple[int, float, int]]:
+    """One offline cycle; returns stage -> (items, seconds, peak bytes)."""
+    from .main import format_message
+    from .replay import ReplayWatcher, load_fixtures
+
+    stages = {}
+    timelines, secs, peak = _measure(lambda: load_fixtures(paths), trace)
+    stages["parse"] = (sum(len(t) for t in timelines.values()), secs, peak)
+
+    watcher = ReplayWatcher(cfg, timelines)
+    total = stages["parse"][0]
+    tweets, secs, peak = _measure(lambda: watcher.collect_tweets_multi_feed(max_count_per_feed=total), trace)
+    stages["collect"] = (len(tweets), secs, peak)
+
+    matches, secs, peak = _measure(lambda: watcher.filter_matches(tweets), trace)
+    stages["filter"] = (len(tweets), secs, peak)
+
+    messages, secs, peak = _measure(lambda: [format_message(m) for m in matches], trace)
+    stages["format"] = (len(messages), secs, peak)
+
+    stages["cycle"] = (total, sum(stages[s][1] for s in ("parse", "collect", "filter", "format")),
+                       max(stages[s][2] for s in ("parse", "collect", "filter", "format")))
+    return stages
+
+
+def report(size: int, timed: Dict[str, Tuple[int, float, int]], traced: Dict[str, Tuple[int, float, int]]):
+    print(f"\n[bench] corpus {size:,} tweets")
+    print(f"[bench] {'stage':<8} {'items':>9} {'seconds':>9} {'items/s':>12} {'peak alloc':>12}")
+    for stage, (items, secs, _) in timed.items():
+        rate = items / secs if secs else float("inf")
+        peak = traced.get(stage, (0, 0, 0))[2] if traced else 0
+        alloc = f"{peak / 1024 / 1024:.1f} MiB" if traced else "-"
+        print(f"[bench] {stage:<8} {items:>9,} {secs:>9.3f} {rate:>12,.0f} {alloc:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scrape pipeline benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated corpus sizes")
+    parser.add_argument("--fixture", default="", help="recorded .html/.jsonl timeline to recycle texts from")
+    parser.add_argument("--keywords", default="coming soon,launching soon,launch",
+                        help="required post keywords used for filtering")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    cfg = Config().replace(contact_address_required=True,
+                           required_post_keywords=parse_keywords(args.keywords))
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = build_corpus(size, Path(tmp), args.fixture)
+            timed = run_pipeline(cfg, paths)
+            traced = {} if args.no_alloc else run_pipeline(cfg, paths, trace=True)
+        report(size, timed, traced)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import html
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# GraphQL operations whose responses carry timeline tweets
+TIMELINE_OPERATIONS = ("SearchTimeline", "HomeTimeline", "HomeLatestTimeline")
+
+
+def timeline_kind(url: str) -> Optional[str]:
+    """Map a GraphQL timeline URL to a feed kind ("latest", "top", "home")."""
+    if "/graphql/" not in url:
+        return None
+    path = urlparse(url).path
+    operation = path.rsplit("/", 1)[-1]
+    if operation not in TIMELINE_OPERATIONS:
+        return None
+    if operation != "SearchTimeline":
+        return "home"
+    try:
+        variables = json.loads(parse_qs(urlparse(url).query).get("variables", ["{}"])[0])
+    except ValueError:
+        variables = {}
+    return "latest" if variables.get("product") == "Latest" else "top"
+
+
+def _find_instructions(obj: Any) -> List[Dict[str, Any]]:
+    """Locate the timeline instructions list wherever the operation nests it."""
+    if isinstance(obj, dict):
+        instructions = obj.get("instructions")
+        if isinstance(instructions, list):
+            return instructions
+        for value in obj.values():
+            found = _find_instructions(value)
+            if found:
+                return found
+    return []
+
+
+def _iter_item_contents(instructions: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for ins in instructions:
+        entries = ins.get("entries") or ([ins["entry"]] if ins.get("entry") else [])
+        for entry in entries:
+            if str(entry.get("entryId", "")).startswith("promoted"):
+                continue
+            content = entry.get("content") or {}
+            if content.get("itemContent"):
+                yield content["itemContent"]
+            for item in content.get("items") or []:
+                item_content = (item.get("item") or {}).get("itemContent")
+                if item_content:
+                    yield item_content
+
+
+def _format_created_at(created_at: str) -> str:
+    """Convert "Wed Oct 10 20:19:24 +0000 2018" into the DOM's ISO datetime."""
+    try:
+        dt = datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y")
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    except (TypeError, ValueError):
+        return created_at or "Unknown Time"
+
+
+def parse_tweet_result(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Turn a GraphQL tweet result into the dict shape collect_tweets produces."""
+    if not result:
+        return None
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet") or {}
+    legacy = result.get("legacy")
+    if not legacy:
+        return None
+    # Reposts render as the original tweet in the timeline
+    retweeted = (legacy.get("retweeted_status_result") or {}).get("result")
+    if retweeted:
+        return parse_tweet_result(retweeted)
+
+    user = ((result.get("core") or {}).get("user_results") or {}).get("result") or {}
+    user_core = user.get("core") or {}
+    user_legacy = user.get("legacy") or {}
+    name = user_core.get("name") or user_legacy.get("name") or "Unknown User"
+    screen_name = user_core.get("screen_name") or user_legacy.get("screen_name") or ""
+
+    note = (((result.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result") or {})
+    text = note.get("text") or legacy.get("full_text", "")
+    entity_urls = ((note.get("entity_set") or {}).get("urls") if note else None) or \
+        (legacy.get("entities") or {}).get("urls") or []
+    urls = []
+    for u in entity_urls:
+        expanded = u.get("expanded_url")
+        if not expanded:
+            continue
+        urls.append(expanded)
+        if u.get("url"):
+            text = text.replace(u["url"], expanded)
+
+    tweet_id = legacy.get("id_str") or result.get("rest_id")
+    return {
+        "id": tweet_id,
+        "text": html.unescape(text),
+        "username": name,
+        "handle": f"@{screen_name}" if screen_name else "",
+        "timestamp": _format_created_at(legacy.get("created_at", "")),
+        "post_url": f"https://x.com/{screen_name or 'i/web'}/status/{tweet_id}",
+        "likes": int(legacy.get("favorite_count") or 0),
+        "comments": int(legacy.get("reply_count") or 0),
+        "reposts": int(legacy.get("retweet_count") or 0),
+        "urls": urls,
+    }
+
+
+def parse_timeline(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Parse a SearchTimeline/HomeTimeline response body into tweet dicts."""
+    tweets = []
+    for item_content in _iter_item_contents(_find_instructions(payload)):
+        if item_content.get("itemType", "TimelineTweet") != "TimelineTweet":
+            continue
+        tweet = parse_tweet_result((item_content.get("tweet_results") or {}).get("result"))
+        if tweet and tweet["id"]:
+            tweets.append(tweet)
+    return tweets
+
+
+def load_capture_file(path: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Replay a JSONL capture written by NetworkCapture into tweet dicts.
+
+    Each line is {"url", "kind", "captured_at", "body"}; a file holding a single
+    raw GraphQL response is accepted too.
+    """
+    raw = Path(path).read_text(encoding="utf-8")
+    try:
+        doc = json.loads(raw)
+        records = [doc if "body" in doc else {"body": doc}]
+    except ValueError:
+        records = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    tweets = []
+    for record in records:
+        if kind and record.get("kind") and record["kind"] != kind:
+            continue
+        tweets.extend(parse_timeline(record.get("body") or {}))
+    return tweets
+
+
+class NetworkCapture:
+    """Collects timeline GraphQL responses from Chrome's performance log.
+
+    The driver must be created with the "goog:loggingPrefs" performance
+    capability. Response bodies are fetched with Network.getResponseBody, which
+    only works for the tab the driver is switched to, so callers drain the feed
+    kind that lives in the current tab. Reading the log consumes it, so other
+    consumers register in `observers` and get every message passed on.
+    """
+
+    def __init__(self, driver, dump_path: str = ""):
+        self.driver = driver
+        self.dump_path = dump_path
+        # requestId -> {"url", "kind", "finished"}
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.observers: List[Callable[[Dict[str, Any]], None]] = []
+
+    def poll(self):
+        for entry in self.driver.get_log("performance"):
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            for observer in self.observers:
+                observer(msg)
+            method = msg.get("method")
+            params = msg.get("params") or {}
+            if method == "Network.responseReceived":
+                url = (params.get("response") or {}).get("url", "")
+                kind = timeline_kind(url)
+                if kind:
+                    self.pending[params["requestId"]] = {"url": url, "kind": kind, "finished": False}
+            elif method == "Network.loadingFinished" and params.get("requestId") in self.pending:
+                self.pending[params["requestId"]]["finished"] = True
+            elif method == "Network.loadingFailed":
+                self.pending.pop(params.get("requestId"), None)
+
+    def reset(self):
+        """Discard everything captured so far (e.g. before a new cycle)."""
+        try:
+            self.driver.get_log("performance")
+        except Exception as e:
+            print(f"[capture] Could not clear performance log: {e}")
+        self.pending.clear()
+
+    def drain(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return tweets from finished timeline responses of the given feed kind."""
+        self.poll()
+        tweets = []
+        for request_id, req in list(self.pending.items()):
+            if not req["finished"] or (kind and req["kind"] != kind):
+                continue
+            del self.pending[request_id]
+            try:
+                res = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                body = json.loads(res.get("body") or "{}")
+            except Exception as e:
+                print(f"[capture] Could not read response body for {req['kind']}: {e}")
+                continue
+            if self.dump_path:
+                self._dump(req, body)
+            tweets.extend(parse_timeline(body))
+        return tweets
+
+    def _dump(self, req: Dict[str, Any], body: Dict[str, Any]):
+        p = Path(self.dump_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        record = {"url": req["url"], "kind": req["kind"], "captured_at": time.time(), "body": body}
+        with p.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -1,11 +1,28 @@
 import os
-from dataclasses import dataclass
+import re
+from dataclasses import InitVar, dataclass, replace as dataclass_replace
+from typing import Tuple
 
-@dataclass
+from .leanfetch import parse_resource_types
+
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+PROFILES_DIR = "data/profiles"
+
+
+@dataclass(frozen=True)
 class Config:
+    """Scraper settings. Immutable: derive variants with `replace()`.
+
+    Environment variables override the defaults unless `use_env=False`, which
+    watch profiles use so several configs can coexist in one process.
+    """
+    # Watch profile this config belongs to
+    profile_name: str = "default"
+
     # Telegram configuration - will be set by APIConfig
     telegram_bot_token: str = ""
     telegram_chat_id: str = ""
+    telegram_api_base: str = "https://api.telegram.org"  # or a local src.mock_telegram server
     
     # Solana RPC (not used in current version)
     solana_rpc_url: str = ""
@@ -17,19 +34,39 @@ class Config:
 
     # File paths
     cookies_path: str = "data/cookies.json"
-    state_path: str = "data/state.json"
+    # Re-save the live session's cookies this often; log in again once they
+    # are this close to expiring
+    cookie_refresh_sec: int = 6 * 3600
+    cookie_expiry_margin_sec: int = 3 * 24 * 3600
+    state_path: str = "data/state.json"  # legacy JSON state, imported into state_db_path once
+    state_db_path: str = "data/state.db"
     user_data_dir: str = "data/chrome_profile"
+    # Patched chromedriver per Chrome version, shared by every profile ("" disables)
+    driver_cache_dir: str = "data/driver_cache"
     
     # Contact address requirement - will be set by APIConfig
     contact_address_required: bool = True
+    # Tweets must contain one of these phrases (lowercase); empty disables the check
+    required_post_keywords: Tuple[str, ...] = ()
 
     # Search configuration - will be set by APIConfig
     search_query: str = ""
     search_url: str = ""
 
+    # Seen mints/tweet ids are forgotten after this many seconds (0 keeps them forever)
+    seen_ttl_sec: int = 30 * 24 * 3600
+
     # Timing configuration
     run_interval_sec: int = 600  # 10 minutes
     jitter_sec: int = 45
+    # Adaptive schedule: shorten the interval after cycles with new mints or
+    # fast-moving tweets (reactions/min), lengthen it while feeds are quiet.
+    adaptive_schedule: bool = True
+    min_interval_sec: int = 60
+    max_interval_sec: int = 1800
+    adaptive_speedup: float = 0.5
+    adaptive_backoff: float = 1.5
+    adaptive_velocity_threshold: float = 20.0
 
     # Browser configuration
     headless: bool = True
@@ -37,41 +74,178 @@ class Config:
 
     # Selenium timeouts
     page_load_timeout: int = 45
-    implicit_wait: int = 5
+    implicit_wait: int = 0  # keep at 0: element probes must return immediately
     explicit_wait: int = 20
+    # Seconds per cycle that may be spent on random anti-detection pauses
+    jitter_budget_sec: int = 45
+
+    # Tweet extraction: "script" serializes the whole timeline in one
+    # execute_script call per scroll step, "observer" serializes each article
+    # in-page as it is inserted and drains that buffer per step, "webdriver"
+    # queries each field.
+    extraction_mode: str = "script"
+    # Tweet source: "dom" scrapes rendered articles, "network" reads the
+    # SearchTimeline/HomeTimeline GraphQL responses from Chrome's network log.
+    capture_backend: str = "dom"
+    capture_dump_path: str = ""  # append captured GraphQL bodies here (JSONL) for replay
+    # Lean fetch: resource types the browser never downloads ("image",
+    # "media", "font", "tracking"); empty loads everything
+    blocked_resources: Tuple[str, ...] = ()
+    # Load Latest/Top/Home in separate tabs and interleave their scrolling
+    concurrent_feeds: bool = True
+
+    # Pack several alerts into one Telegram message (up to 4096 chars);
+    # a partial batch waits at most this long before it is sent.
+    telegram_batch_messages: bool = False
+    telegram_batch_max_delay_sec: float = 5.0
+
+    # Alerts are queued in a SQLite outbox and delivered with retries; with
+    # async_delivery a background worker sends them while scraping continues.
+    outbox_db_path: str = "data/outbox.db"
+    outbox_max_attempts: int = 10
+    async_delivery: bool = True
+
+    # Every match is also kept in a searchable history (mint first-seen lookups)
+    match_history: bool = True
+    history_db_path: str = "data/history.db"
+
+    # Persistent watcher: reuse one browser across cycles and recycle it
+    # after this many cycles or this much browser RSS growth (0 disables).
+    persistent_watcher: bool = True
+    watcher_max_cycles: int = 50
+    watcher_max_rss_growth_mb: int = 1024
     
-    def __post_init__(self):
+    use_env: InitVar[bool] = True
+
+    def __post_init__(self, use_env: bool):
         """Initialize config with environment variables if available (for APIConfig compatibility)"""
+        if not use_env:
+            return
+        # Frozen dataclass: overrides bypass __setattr__
+        def _set(name, value):
+            object.__setattr__(self, name, value)
+
         # Only override defaults if environment variables are explicitly set
         if os.getenv("TELEGRAM_BOT_TOKEN"):
-            self.telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN", "")
+            _set("telegram_bot_token", os.getenv("TELEGRAM_BOT_TOKEN", ""))
         if os.getenv("TELEGRAM_CHAT_ID"):
-            self.telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID", "")
+            _set("telegram_chat_id", os.getenv("TELEGRAM_CHAT_ID", ""))
+        if os.getenv("TELEGRAM_API_BASE"):
+            _set("telegram_api_base", os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org"))
         if os.getenv("TWITTER_USERNAME"):
-            self.twitter_username = os.getenv("TWITTER_USERNAME", "")
+            _set("twitter_username", os.getenv("TWITTER_USERNAME", ""))
         if os.getenv("TWITTER_PASSWORD"):
-            self.twitter_password = os.getenv("TWITTER_PASSWORD", "")
+            _set("twitter_password", os.getenv("TWITTER_PASSWORD", ""))
         if os.getenv("TWITTER_EMAIL"):
-            self.twitter_email = os.getenv("TWITTER_EMAIL", "")
+            _set("twitter_email", os.getenv("TWITTER_EMAIL", ""))
         if os.getenv("SEARCH_QUERY"):
-            self.search_query = os.getenv("SEARCH_QUERY", "")
+            _set("search_query", os.getenv("SEARCH_QUERY", ""))
         if os.getenv("SEARCH_URL"):
-            self.search_url = os.getenv("SEARCH_URL", "")
+            _set("search_url", os.getenv("SEARCH_URL", ""))
         if os.getenv("CONTACT_ADDRESS_REQUIRED"):
-            self.contact_address_required = os.getenv("CONTACT_ADDRESS_REQUIRED", "true").lower() == "true"
+            _set("contact_address_required", os.getenv("CONTACT_ADDRESS_REQUIRED", "true").lower() == "true")
+        if os.getenv("REQUIRED_POST_KEYWORDS"):
+            _set("required_post_keywords", parse_keywords(os.getenv("REQUIRED_POST_KEYWORDS", "")))
             
         # Optional overrides for other settings
+        if os.getenv("COOKIE_REFRESH_SEC"):
+            _set("cookie_refresh_sec", int(os.getenv("COOKIE_REFRESH_SEC", str(6 * 3600))))
+        if os.getenv("COOKIE_EXPIRY_MARGIN_SEC"):
+            _set("cookie_expiry_margin_sec", int(os.getenv("COOKIE_EXPIRY_MARGIN_SEC", str(3 * 24 * 3600))))
+        if os.getenv("STATE_DB_PATH"):
+            _set("state_db_path", os.getenv("STATE_DB_PATH", "data/state.db"))
+        if os.getenv("SEEN_TTL_SEC"):
+            _set("seen_ttl_sec", int(os.getenv("SEEN_TTL_SEC", str(30 * 24 * 3600))))
         if os.getenv("RUN_INTERVAL_SEC"):
-            self.run_interval_sec = int(os.getenv("RUN_INTERVAL_SEC", "600"))
+            _set("run_interval_sec", int(os.getenv("RUN_INTERVAL_SEC", "600")))
         if os.getenv("JITTER_SEC"):
-            self.jitter_sec = int(os.getenv("JITTER_SEC", "45"))
+            _set("jitter_sec", int(os.getenv("JITTER_SEC", "45")))
+        if os.getenv("ADAPTIVE_SCHEDULE"):
+            _set("adaptive_schedule", os.getenv("ADAPTIVE_SCHEDULE", "true").lower() == "true")
+        if os.getenv("MIN_INTERVAL_SEC"):
+            _set("min_interval_sec", int(os.getenv("MIN_INTERVAL_SEC", "60")))
+        if os.getenv("MAX_INTERVAL_SEC"):
+            _set("max_interval_sec", int(os.getenv("MAX_INTERVAL_SEC", "1800")))
+        if os.getenv("ADAPTIVE_SPEEDUP"):
+            _set("adaptive_speedup", float(os.getenv("ADAPTIVE_SPEEDUP", "0.5")))
+        if os.getenv("ADAPTIVE_BACKOFF"):
+            _set("adaptive_backoff", float(os.getenv("ADAPTIVE_BACKOFF", "1.5")))
+        if os.getenv("ADAPTIVE_VELOCITY_THRESHOLD"):
+            _set("adaptive_velocity_threshold", float(os.getenv("ADAPTIVE_VELOCITY_THRESHOLD", "20")))
+        if os.getenv("DRIVER_CACHE_DIR") is not None:
+            _set("driver_cache_dir", os.getenv("DRIVER_CACHE_DIR", ""))
         if os.getenv("HEADLESS"):
-            self.headless = os.getenv("HEADLESS", "true").lower() == "true"
+            _set("headless", os.getenv("HEADLESS", "true").lower() == "true")
         if os.getenv("USER_AGENT"):
-            self.user_agent = os.getenv("USER_AGENT", "")
+            _set("user_agent", os.getenv("USER_AGENT", ""))
         if os.getenv("PAGE_LOAD_TIMEOUT"):
-            self.page_load_timeout = int(os.getenv("PAGE_LOAD_TIMEOUT", "45"))
+            _set("page_load_timeout", int(os.getenv("PAGE_LOAD_TIMEOUT", "45")))
         if os.getenv("IMPLICIT_WAIT"):
-            self.implicit_wait = int(os.getenv("IMPLICIT_WAIT", "5"))
+            _set("implicit_wait", int(os.getenv("IMPLICIT_WAIT", "0")))
         if os.getenv("EXPLICIT_WAIT"):
-            self.explicit_wait = int(os.getenv("EXPLICIT_WAIT", "20"))
+            _set("explicit_wait", int(os.getenv("EXPLICIT_WAIT", "20")))
+        if os.getenv("JITTER_BUDGET_SEC"):
+            _set("jitter_budget_sec", int(os.getenv("JITTER_BUDGET_SEC", "45")))
+        if os.getenv("EXTRACTION_MODE"):
+            _set("extraction_mode", os.getenv("EXTRACTION_MODE", "script").lower())
+        if os.getenv("CAPTURE_BACKEND"):
+            _set("capture_backend", os.getenv("CAPTURE_BACKEND", "dom").lower())
+        if os.getenv("CAPTURE_DUMP_PATH"):
+            _set("capture_dump_path", os.getenv("CAPTURE_DUMP_PATH", ""))
+        if os.getenv("BLOCKED_RESOURCES"):
+            _set("blocked_resources", parse_resource_types(os.getenv("BLOCKED_RESOURCES", "")))
+        if os.getenv("CONCURRENT_FEEDS"):
+            _set("concurrent_feeds", os.getenv("CONCURRENT_FEEDS", "true").lower() == "true")
+        if os.getenv("TELEGRAM_BATCH_MESSAGES"):
+            _set("telegram_batch_messages", os.getenv("TELEGRAM_BATCH_MESSAGES", "false").lower() == "true")
+        if os.getenv("TELEGRAM_BATCH_MAX_DELAY_SEC"):
+            _set("telegram_batch_max_delay_sec", float(os.getenv("TELEGRAM_BATCH_MAX_DELAY_SEC", "5")))
+        if os.getenv("OUTBOX_DB_PATH"):
+            _set("outbox_db_path", os.getenv("OUTBOX_DB_PATH", "data/outbox.db"))
+        if os.getenv("OUTBOX_MAX_ATTEMPTS"):
+            _set("outbox_max_attempts", int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10")))
+        if os.getenv("ASYNC_DELIVERY"):
+            _set("async_delivery", os.getenv("ASYNC_DELIVERY", "true").lower() == "true")
+        if os.getenv("MATCH_HISTORY"):
+            _set("match_history", os.getenv("MATCH_HISTORY", "true").lower() == "true")
+        if os.getenv("HISTORY_DB_PATH"):
+            _set("history_db_path", os.getenv("HISTORY_DB_PATH", "data/history.db"))
+        if os.getenv("PERSISTENT_WATCHER"):
+            _set("persistent_watcher", os.getenv("PERSISTENT_WATCHER", "true").lower() == "true")
+        if os.getenv("WATCHER_MAX_CYCLES"):
+            _set("watcher_max_cycles", int(os.getenv("WATCHER_MAX_CYCLES", "50")))
+        if os.getenv("WATCHER_MAX_RSS_GROWTH_MB"):
+            _set("watcher_max_rss_growth_mb", int(os.getenv("WATCHER_MAX_RSS_GROWTH_MB", "1024")))
+
+    def replace(self, **changes) -> "Config":
+        """Copy with some fields changed (environment overrides are not re-applied)."""
+        return dataclass_replace(self, use_env=False, **changes)
+
+    @classmethod
+    def for_profile(cls, name: str, base: "Config" = None, **changes) -> "Config":
+        """Config for a named watch profile, with its own state, outbox and browser profile.
+
+        The "default" profile keeps the base paths so existing data is reused.
+        """
+        if not PROFILE_NAME_RE.match(name or ""):
+            raise ValueError(f"Invalid profile name: {name!r}")
+        base = base if base is not None else cls()
+        if name != "default":
+            root = os.path.join(PROFILES_DIR, name)
+            changes = {
+                "state_path": os.path.join(root, "state.json"),
+                "state_db_path": os.path.join(root, "state.db"),
+                "outbox_db_path": os.path.join(root, "outbox.db"),
+                "history_db_path": os.path.join(root, "history.db"),
+                "cookies_path": os.path.join(root, "cookies.json"),
+                "user_data_dir": os.path.join(root, "chrome_profile"),
+                **changes,
+            }
+        return base.replace(profile_name=name, **changes)
+
+
+def parse_keywords(value) -> Tuple[str, ...]:
+    """Normalize comma-separated or listed keywords to a lowercase tuple."""
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(k.strip().lower() for k in value or () if k and k.strip())
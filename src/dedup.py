@@ -0,0 +1,95 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+STATUS_ID_RE = re.compile(r"/status/(\d+)")
+TWITTER_EPOCH_MS = 1288834974657
+
+
+def parse_status_id(tweet: Any) -> Optional[int]:
+    """Numeric snowflake id of a tweet dict, permalink or id string, if any."""
+    if isinstance(tweet, dict):
+        return parse_status_id(tweet.get("id")) or parse_status_id(tweet.get("post_url"))
+    if isinstance(tweet, int):
+        return tweet
+    if not tweet:
+        return None
+    value = str(tweet)
+    if value.isdigit():
+        return int(value)
+    m = STATUS_ID_RE.search(value)
+    return int(m.group(1)) if m else None
+
+
+def tweet_posted_at(tweet: Dict[str, Any]) -> Optional[float]:
+    """Unix time a tweet was posted: its ISO `timestamp`, else decoded from the snowflake id."""
+    try:
+        posted = datetime.fromisoformat(str(tweet.get("timestamp", "")).replace("Z", "+00:00"))
+        if posted.tzinfo is None:
+            posted = posted.replace(tzinfo=timezone.utc)
+        return posted.timestamp()
+    except ValueError:
+        pass
+    sid = parse_status_id(tweet)
+    # Snowflake ids carry milliseconds since the Twitter epoch in their top bits
+    if sid and sid > 1 << 32:
+        return ((sid >> 22) + TWITTER_EPOCH_MS) / 1000
+    return None
+
+
+class TweetIndex:
+    """Per-cycle index of collected tweets keyed on the canonical status id.
+
+    The first sighting of a tweet is kept as its record; later sightings (a
+    re-rendered article or the same tweet in another feed) only add the feed to
+    that record's `feed_sources`/`feed_keys`. Tweets without a parsable status
+    id cannot be matched up and are always kept.
+    """
+
+    def __init__(self):
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+        self.records: List[Dict[str, Any]] = []
+        self.duplicates = 0
+
+    def __contains__(self, status_id: Any) -> bool:
+        sid = parse_status_id(status_id)
+        return sid is not None and sid in self.by_id
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def ids(self) -> List[str]:
+        return [str(sid) for sid in self.by_id]
+
+    def _tag(self, record: Dict[str, Any], feed: Optional[Dict[str, Any]], key: str):
+        if not feed:
+            return
+        if feed["name"] not in record.setdefault("feed_sources", []):
+            record["feed_sources"].append(feed["name"])
+        if key and key not in record.setdefault("feed_keys", []):
+            record["feed_keys"].append(key)
+
+    def add(self, tweet: Dict[str, Any], feed: Optional[Dict[str, Any]] = None, key: str = "") -> bool:
+        """Index a tweet; returns False if it was already seen this cycle."""
+        sid = parse_status_id(tweet)
+        existing = self.by_id.get(sid) if sid is not None else None
+        if existing is not None:
+            self.duplicates += 1
+            self._tag(existing, feed, key)
+            return False
+        if feed:
+            tweet["feed_source"] = feed["name"]
+            tweet["feed_url"] = feed["url"]
+            tweet["feed_key"] = key
+        self._tag(tweet, feed, key)
+        if sid is not None:
+            self.by_id[sid] = tweet
+        self.records.append(tweet)
+        return True
+
+    def mark_seen(self, status_id: Any, feed: Optional[Dict[str, Any]] = None, key: str = ""):
+        """Record another sighting of an already-indexed tweet without its fields."""
+        existing = self.by_id.get(parse_status_id(status_id))
+        if existing is not None:
+            self.duplicates += 1
+            self._tag(existing, feed, key)
@@ -1,18 +1,38 @@
 import re
 import os
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import Iterable, List, Tuple, Optional
 
 BASE58_RE = r"[1-9A-HJ-NP-Za-km-z]"
 SOL_ADDR_RE = re.compile(rf"\b({BASE58_RE}{{32,44}})\b")
 PUMPFUN_LINK_RE = re.compile(r"https?://pump\.fun/coin/([1-9A-HJ-NP-Za-km-z]{32,44})")
+# Links and bare addresses in one pass; a link's mint also counts as an
+# address when it ends on a word boundary, as SOL_ADDR_RE would see it
+CANDIDATE_RE = re.compile(
+    rf"https?://pump\.fun/coin/(?P<link>{BASE58_RE}{{32,44}})(?P<bound>\b)?|\b(?P<addr>{BASE58_RE}{{32,44}})\b"
+)
 
 # Default launch phrases
 DEFAULT_LAUNCH_PHRASES = (
     "coming soon",
-    "launching soon", 
+    "launching soon",
     "launch",
 )
 
+# Words bolded in Telegram messages
+HIGHLIGHT_KEYWORDS = (
+    "pump", "sol", "coming soon", "launching soon", "launch", "project"
+)
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # Longest first so "launching soon" wins over "launch"
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+HIGHLIGHT_RE = re.compile(_alternation(HIGHLIGHT_KEYWORDS), re.IGNORECASE)
+
+
 def get_launch_phrases():
     """Get launch phrases from environment or return empty list if none configured"""
     env_keywords = os.getenv('REQUIRED_POST_KEYWORDS')
@@ -21,30 +41,83 @@ def get_launch_phrases():
     return []  # Return empty list instead of defaults if not configured
 
 
-def extract_candidates(text: str) -> Tuple[List[str], List[str]]:
-    """Return (sol_addresses, pumpfun_mints) found in the text."""
-    if not text:
-        return [], []
-    addrs = [m.group(1) for m in SOL_ADDR_RE.finditer(text)]
-    links = [m.group(1) for m in PUMPFUN_LINK_RE.finditer(text)]
+def _unique(seq):
     # de-dup preserve order
-    def unique(seq):
-        seen = set()
-        out = []
-        for x in seq:
-            if x not in seen:
-                out.append(x)
-                seen.add(x)
-        return out
+    return list(dict.fromkeys(seq))
+
+
+class KeywordMatcher:
+    """Launch-phrase and contract-address detection compiled for one phrase set.
+
+    Phrases are folded into a single alternation regex, and addresses and
+    pump.fun links come out of one combined pattern, so checking a tweet is a
+    couple of linear scans no matter how many phrases are configured. Build it
+    through get_matcher(), which caches one instance per phrase set.
+    """
 
-    return unique(addrs), unique(links)
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = tuple(p.lower() for p in phrases if p)
+        self.phrase_re = re.compile(_alternation(self.phrases)) if self.phrases else None
+
+    def contains_launch_phrase(self, text: str) -> bool:
+        return bool(self.phrase_re and self.phrase_re.search((text or "").lower()))
+
+    def extract_candidates(self, text: str) -> Tuple[List[str], List[str]]:
+        """Return (sol_addresses, pumpfun_mints) found in the text."""
+        if not text:
+            return [], []
+        addrs, links = [], []
+        pos = 0
+        while True:
+            m = CANDIDATE_RE.search(text, pos)
+            if not m:
+                break
+            pos = m.end()
+            link = m.group("link")
+            if link:
+                links.append(link)
+                if m.group("bound") is not None:
+                    addrs.append(link)
+                continue
+            addr = m.group("addr")
+            addrs.append(addr)
+            # An address glued to a link ("...<addr>https://pump.fun/...")
+            # swallowed the scheme; rescan from it so the link is not lost
+            for scheme in ("https", "http"):
+                if addr.endswith(scheme):
+                    pos -= len(scheme)
+                    break
+        return _unique(addrs), _unique(links)
+
+    def highlight(self, text: str) -> str:
+        """Bold the highlight keywords for Telegram HTML."""
+        return HIGHLIGHT_RE.sub(lambda m: f"<b>{m.group(0).lower()}</b>", text)
+
+
+@lru_cache(maxsize=16)
+def _compile_matcher(phrases: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(phrases)
+
+
+def get_matcher(phrases: Optional[Iterable[str]] = None) -> KeywordMatcher:
+    """Compiled matcher for the given phrases (default: REQUIRED_POST_KEYWORDS).
+
+    The phrase tuple is the cache key, so a config change yields a new matcher
+    while repeated calls within a cycle reuse the compiled one.
+    """
+    if phrases is None:
+        phrases = get_launch_phrases()
+    return _compile_matcher(tuple(phrases))
+
+
+def extract_candidates(text: str) -> Tuple[List[str], List[str]]:
+    """Return (sol_addresses, pumpfun_mints) found in the text."""
+    return get_matcher(()).extract_candidates(text)
 
 
 def contains_launch_phrase(text: str) -> bool:
     """Check if text contains any launch-related phrases"""
-    launch_phrases = get_launch_phrases()
-    t = text.lower()
-    return any(phrase in t for phrase in launch_phrases)
+    return get_matcher().contains_launch_phrase(text)
 
 
 def has_contact_address(text: str) -> bool:
@@ -0,0 +1,122 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+DRIVER_NAME = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+CHROME_COMMANDS = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+
+
+def detect_chrome_version(binary: Optional[str] = None) -> Optional[str]:
+    """Installed Chrome version ("120.0.6099.109"), or None if it cannot be told."""
+    if sys.platform.startswith("win"):
+        try:
+            import winreg
+
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+            return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            pass
+        # Chrome installs each version in a folder next to chrome.exe
+        if binary and os.path.exists(binary):
+            versions = [d for d in os.listdir(os.path.dirname(binary)) if VERSION_RE.fullmatch(d)]
+            if versions:
+                return max(versions, key=lambda v: tuple(int(x) for x in v.split(".")))
+        return None
+    for command in ([binary] if binary else []) + list(CHROME_COMMANDS):
+        try:
+            out = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        m = VERSION_RE.search(out)
+        if m:
+            return m.group(0)
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_driver_cache(cache_dir: str, chrome_binary: Optional[str] = None) -> "DriverCache":
+    """One DriverCache per directory and Chrome binary."""
+    return DriverCache(cache_dir, chrome_binary)
+
+
+class DriverCache:
+    """Patched chromedriver binaries kept per Chrome version.
+
+    undetected-chromedriver downloads and patches a driver on every launch
+    unless it is handed one that is already patched. The first launch for a
+    Chrome version copies its patched binary here; later launches pass it as
+    `driver_executable_path` and skip the download and patching. The Chrome
+    version is detected again for every launch, so an update in a long-running
+    process misses the cache instead of launching a stale driver; drivers of
+    older versions are removed when the new one is stored.
+    """
+
+    def __init__(self, cache_dir: str, chrome_binary: Optional[str] = None):
+        self.cache_dir = Path(cache_dir)
+        self.chrome_binary = chrome_binary
+        self._version: Optional[str] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        if self._version is None:
+            self._version = detect_chrome_version(self.chrome_binary)
+        return self._version
+
+    def path(self) -> Optional[Path]:
+        return self.cache_dir / self.version / DRIVER_NAME if self.version else None
+
+    def lookup(self) -> Optional[str]:
+        """Cached driver for the installed Chrome, if there is one."""
+        path = self.path()
+        return str(path.absolute()) if path is not None and path.is_file() else None
+
+    def launch_kwargs(self) -> Dict[str, Any]:
+        """Extra uc.Chrome arguments: the cached driver and/or the Chrome major version."""
+        self._version = None  # Chrome may have updated since the last launch
+        kwargs: Dict[str, Any] = {}
+        if self.version:
+            kwargs["version_main"] = int(self.version.split(".")[0])
+        cached = self.lookup()
+        if cached:
+            kwargs["driver_executable_path"] = cached
+        return kwargs
+
+    def store(self, driver) -> bool:
+        """Copy the driver a launch just patched into the cache; True if stored."""
+        path = self.path()
+        patcher = getattr(driver, "patcher", None)
+        source = getattr(patcher, "executable_path", None)
+        if path is None or not source or not os.path.isfile(source) or path.is_file():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Copy to a unique temp file then rename, so no other process or
+        # thread ever runs (or overwrites) a half-written file
+        fd, tmp = tempfile.mkstemp(prefix=f"{DRIVER_NAME}.", suffix=".tmp", dir=path.parent)
+        os.close(fd)
+        try:
+            shutil.copy2(source, tmp)
+            os.replace(tmp, path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+        self._prune()
+        return True
+
+    def invalidate(self):
+        """Drop the cached driver for this Chrome (e.g. after it failed to start)."""
+        path = self.path()
+        if path is not None and path.parent.is_dir():
+            shutil.rmtree(path.parent, ignore_errors=True)
+        self._version = None  # Chrome may have been updated under us
+
+    def _prune(self):
+        for entry in self.cache_dir.iterdir():
+            if entry.is_dir() and entry.name != self.version:
+                shutil.rmtree(entry, ignore_errors=True)
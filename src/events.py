@@ -0,0 +1,88 @@
+import json
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def format_sse(event: Dict[str, Any], event_name: Optional[str] = None, id_field: str = "id") -> str:
+    """One server-sent event frame carrying the event as JSON."""
+    lines = [f"id: {event[id_field]}"]
+    if event_name:
+        lines.append(f"event: {event_name}")
+    lines.append(f"data: {json.dumps(event, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class EventBroadcaster:
+    """Thread-safe ring buffer of events that subscribers block on.
+
+    Every published event gets the next id from a counter that never resets,
+    so a client resuming with `Last-Event-ID` receives exactly what it missed
+    (as long as it is still buffered). Subscribers sleep on a condition
+    variable and are woken by `publish`, rather than polling. The id is stored
+    in each event under `id_field`.
+    """
+
+    def __init__(self, capacity: int = 50, id_field: str = "id"):
+        self.id_field = id_field
+        self.events: deque = deque(maxlen=capacity)
+        self.last_id = 0
+        self.cond = threading.Condition()
+        self.closed = False
+
+    def publish(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self.cond:
+            self.last_id += 1
+            event = dict(data)
+            event[self.id_field] = self.last_id
+            self.events.append(event)
+            self.cond.notify_all()
+        return event
+
+    def since(self, last_id: int) -> List[Dict[str, Any]]:
+        """Buffered events with an id above last_id, oldest first."""
+        with self.cond:
+            return [e for e in self.events if e[self.id_field] > last_id]
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        with self.cond:
+            return list(self.events)[-count:] if count > 0 else []
+
+    def wait(self, last_id: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Block until events newer than last_id exist (or timeout/close); returns them."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.last_id > last_id or self.closed, timeout)
+            return [e for e in self.events if e[self.id_field] > last_id]
+
+    def close(self):
+        """Wake every subscriber so their streams can end."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def stream(self, last_event_id: Optional[int] = None, backlog: int = 10,
+               heartbeat_sec: float = 15.0, event_name: Optional[str] = None) -> Iterator[str]:
+        """Yield SSE frames forever: missed or recent events first, then live ones.
+
+        A comment line is sent after `heartbeat_sec` without events so proxies
+        keep the connection open and dead clients are noticed.
+        """
+        yield "retry: 3000\n\n"
+        with self.cond:
+            # An id from before a server restart is ahead of the counter
+            if last_event_id is None or last_event_id > self.last_id:
+                pending = list(self.events)[-backlog:] if backlog > 0 else []
+                cursor = self.last_id
+            else:
+                pending = [e for e in self.events if e[self.id_field] > last_event_id]
+                cursor = self.last_id if pending else last_event_id
+        for event in pending:
+            yield format_sse(event, event_name, self.id_field)
+        while not self.closed:
+            events = self.wait(cursor, heartbeat_sec)
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                yield format_sse(event, event_name, self.id_field)
+            cursor = events[-1][self.id_field]
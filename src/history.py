@@ -0,0 +1,213 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .dedup import parse_status_id, tweet_posted_at
+
+MAX_PAGE_SIZE = 500
+
+# Database paths whose schema exists in this process -> whether FTS5 is available
+_schemas: Dict[str, bool] = {}
+_schemas_lock = threading.Lock()
+
+
+def _fts_query(text: str) -> str:
+    """Quote every term so user input cannot break FTS5 query syntax."""
+    return " ".join('"%s"' % term.replace('"', '""') for term in text.split())
+
+
+class MatchHistory:
+    """Every tweet that passed `filter_matches`, kept in SQLite for lookups.
+
+    Each tweet is one row (re-sightings bump `last_seen` and the reaction
+    counts); its mints go into `match_mints`, so "when did we first see this
+    CA" is one index probe. Text search uses an FTS5 index when this SQLite
+    has it and falls back to LIKE otherwise. Pages are keyed on the row id,
+    so deep pages cost the same as the first one. One connection per thread;
+    the schema is created by the first one opened on a path.
+    """
+
+    def __init__(self, path: str):
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(p), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        key = str(p.resolve())
+        with _schemas_lock:
+            if key not in _schemas:
+                _schemas[key] = self._create_schema()
+            self.fts = _schemas[key]
+
+    def _create_schema(self) -> bool:
+        """Tables, indexes and the FTS5 index; returns whether FTS5 is available."""
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS matches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tweet_id TEXT UNIQUE,
+                username TEXT,
+                handle TEXT,
+                text TEXT NOT NULL,
+                post_url TEXT,
+                feed TEXT,
+                feed_sources TEXT,
+                posted_at REAL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                likes TEXT,
+                comments TEXT,
+                reposts TEXT
+            );
+            CREATE TABLE IF NOT EXISTS match_mints (
+                mint TEXT NOT NULL,
+                match_id INTEGER NOT NULL REFERENCES matches(id),
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (mint, match_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_matches_username ON matches(username);
+            CREATE INDEX IF NOT EXISTS idx_matches_handle ON matches(handle);
+            CREATE INDEX IF NOT EXISTS idx_matches_feed ON matches(feed, id);
+            CREATE INDEX IF NOT EXISTS idx_matches_first_seen ON matches(first_seen);
+            CREATE INDEX IF NOT EXISTS idx_match_mints_first_seen ON match_mints(mint, first_seen);
+            CREATE INDEX IF NOT EXISTS idx_match_mints_match ON match_mints(match_id);
+        """)
+        fts = self._create_fts()
+        self.conn.commit()
+        return fts
+
+    def _create_fts(self) -> bool:
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS matches_fts USING fts5(
+                    text, username, handle, content='matches', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS matches_ai AFTER INSERT ON matches BEGIN
+                    INSERT INTO matches_fts(rowid, text, username, handle)
+                    VALUES (new.id, new.text, new.username, new.handle);
+                END;
+                CREATE TRIGGER IF NOT EXISTS matches_ad AFTER DELETE ON matches BEGIN
+                    INSERT INTO matches_fts(matches_fts, rowid, text, username, handle)
+                    VALUES ('delete', old.id, old.text, old.username, old.handle);
+                END;
+                CREATE TRIGGER IF NOT EXISTS matches_au AFTER UPDATE OF text, username, handle ON matches BEGIN
+                    INSERT INTO matches_fts(matches_fts, rowid, text, username, handle)
+                    VALUES ('delete', old.id, old.text, old.username, old.handle);
+                    INSERT INTO matches_fts(rowid, text, username, handle)
+                    VALUES (new.id, new.text, new.username, new.handle);
+                END;
+            """)
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"[history] FTS5 unavailable ({e}); text search falls back to LIKE.")
+            return False
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, matches: Iterable[Dict[str, Any]]) -> int:
+        """Store matches (new ones inserted, known ones refreshed); returns rows inserted."""
+        now = time.time()
+        inserted = 0
+        with self.conn:
+            for m in matches:
+                sid = parse_status_id(m)
+                tweet_id = str(sid) if sid else m.get("id") or m.get("post_url")
+                sources = m.get("feed_sources") or ([m["feed_source"]] if m.get("feed_source") else [])
+                row = self.conn.execute("SELECT id FROM matches WHERE tweet_id = ?", (tweet_id,)).fetchone()
+                if row is None:
+                    cur = self.conn.execute(
+                        "INSERT INTO matches (tweet_id, username, handle, text, post_url, feed, feed_sources, "
+                        "posted_at, first_seen, last_seen, likes, comments, reposts) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (tweet_id, m.get("username"), m.get("handle"), m.get("text") or "", m.get("post_url"),
+                         sources[0] if sources else None, json.dumps(sources), tweet_posted_at(m), now, now,
+                         str(m.get("likes", "")), str(m.get("comments", "")), str(m.get("reposts", ""))),
+                    )
+                    match_id = cur.lastrowid
+                    inserted += 1
+                else:
+                    match_id = row["id"]
+                    self.conn.execute(
+                        "UPDATE matches SET last_seen = ?, likes = ?, comments = ?, reposts = ? WHERE id = ?",
+                        (now, str(m.get("likes", "")), str(m.get("comments", "")), str(m.get("reposts", "")),
+                         match_id),
+                    )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO match_mints (mint, match_id, first_seen) VALUES (?, ?, ?)",
+                    [(mint, match_id, now) for mint in m.get("mints") or []],
+                )
+        return inserted
+
+    def _row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item["feed_sources"] = json.loads(item.get("feed_sources") or "[]")
+        item["mints"] = [r[0] for r in self.conn.execute(
+            "SELECT mint FROM match_mints WHERE match_id = ? ORDER BY first_seen", (item["id"],))]
+        return item
+
+    def search(self, text: str = "", mint: str = "", username: str = "", feed: str = "",
+               since: Optional[float] = None, until: Optional[float] = None,
+               limit: int = 50, before: Optional[int] = None) -> Dict[str, Any]:
+        """Newest matches first, filtered; pass the returned `next` as `before` for the next page.
+
+        `since`/`until` bound `first_seen` (unix time). `username` matches the
+        display name or the @handle.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where, params = [], []
+        if text and self.fts:
+            where.append("m.id IN (SELECT rowid FROM matches_fts WHERE matches_fts MATCH ?)")
+            params.append(_fts_query(text))
+        elif text:
+            where.append("(m.text LIKE ? OR m.username LIKE ?)")
+            params += [f"%{text}%"] * 2
+        if mint:
+            where.append("m.id IN (SELECT match_id FROM match_mints WHERE mint = ?)")
+            params.append(mint)
+        if username:
+            # Handles are stored as scraped, with or without the "@"
+            handle = username.lstrip("@")
+            where.append("(m.username = ? OR m.handle IN (?, ?))")
+            params += [username, handle, "@" + handle]
+        if feed:
+            where.append("m.feed = ?")
+            params.append(feed)
+        if since is not None:
+            where.append("m.first_seen >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("m.first_seen < ?")
+            params.append(until)
+        if before is not None:
+            where.append("m.id < ?")
+            params.append(before)
+        sql = "SELECT m.* FROM matches m"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY m.id DESC LIMIT ?"
+        rows = self.conn.execute(sql, params + [limit + 1]).fetchall()
+        items = [self._row(r) for r in rows[:limit]]
+        return {"items": items, "next": items[-1]["id"] if len(rows) > limit else None}
+
+    def first_seen(self, mint: str) -> Optional[Dict[str, Any]]:
+        """The earliest match that carried `mint`, with how often it was seen since."""
+        row = self.conn.execute(
+            "SELECT m.*, mm.first_seen AS mint_first_seen FROM match_mints mm "
+            "JOIN matches m ON m.id = mm.match_id WHERE mm.mint = ? "
+            "ORDER BY mm.first_seen, mm.match_id LIMIT 1",
+            (mint,),
+        ).fetchone()
+        if row is None:
+            return None
+        stats = self.conn.execute(
+            "SELECT COUNT(*), MAX(first_seen) FROM match_mints WHERE mint = ?", (mint,)
+        ).fetchone()
+        return {"mint": mint, "first_seen": row["mint_first_seen"], "last_seen": stats[1],
+                "tweets": stats[0], "first_match": self._row(row)}
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
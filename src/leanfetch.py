@@ -0,0 +1,129 @@
+import json
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Tuple
+
+# Network.setBlockedURLs patterns per resource type. Tweet text, times and
+# counts come from the document and the GraphQL API, which none of these touch.
+RESOURCE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "image": (
+        "*://pbs.twimg.com/media/*",
+        "*://pbs.twimg.com/profile_images/*",
+        "*://pbs.twimg.com/profile_banners/*",
+        "*://pbs.twimg.com/card_img/*",
+        "*://pbs.twimg.com/ext_tw_video_thumb/*",
+        "*://pbs.twimg.com/amplify_video_thumb/*",
+        "*://pbs.twimg.com/tweet_video_thumb/*",
+        "*://abs.twimg.com/emoji/*",
+        "*://abs.twimg.com/hashflags/*",
+    ),
+    "media": (
+        "*://video.twimg.com/*",
+        "*.m3u8*",
+        "*.m4s*",
+        "*.mp4*",
+    ),
+    "font": (
+        "*.woff2*",
+        "*.woff*",
+        "*.ttf*",
+        "*.otf*",
+    ),
+    "tracking": (
+        "*://*.google-analytics.com/*",
+        "*://*.googletagmanager.com/*",
+        "*://*.doubleclick.net/*",
+        "*://static.ads-twitter.com/*",
+        "*://ads-api.x.com/*",
+        "*://ads-api.twitter.com/*",
+        "*://analytics.twitter.com/*",
+        "*/1.1/jot/*",
+        "*/i/jot*",
+        "*/i/adsct*",
+    ),
+}
+
+# Typical transfer size of one blocked request, for the bytes-saved estimate
+ESTIMATED_BYTES = {"image": 40_000, "media": 350_000, "font": 35_000, "tracking": 1_500}
+
+
+def parse_resource_types(value) -> Tuple[str, ...]:
+    """Normalize "image,font" / "all" / "none" to known resource types."""
+    if isinstance(value, str):
+        value = value.split(",")
+    types = tuple(t.strip().lower() for t in value or () if t and t.strip())
+    if "all" in types:
+        return tuple(RESOURCE_PATTERNS)
+    unknown = [t for t in types if t not in RESOURCE_PATTERNS and t != "none"]
+    if unknown:
+        raise ValueError(f"Unknown resource types to block: {', '.join(unknown)}")
+    return tuple(t for t in types if t in RESOURCE_PATTERNS)
+
+
+class LeanFetch:
+    """Blocks heavy resource types in the scraping browser via CDP.
+
+    `apply()` must run once per tab, since Network.setBlockedURLs is scoped to
+    the target the driver is switched to. Blocked requests show up in Chrome's
+    performance log as loadingFailed with blockedReason "inspector"; `observe`
+    counts them per type so `report()` can estimate the bytes saved, next to
+    the bytes that were actually fetched.
+    """
+
+    def __init__(self, driver, resource_types: Iterable[str]):
+        self.driver = driver
+        self.resource_types = tuple(resource_types)
+        self.patterns = [p for t in self.resource_types for p in RESOURCE_PATTERNS[t]]
+        self.urls: Dict[str, str] = {}  # requestId -> url, until it finishes
+        self.blocked: Counter = Counter()
+        self.loaded_bytes = 0
+
+    def apply(self):
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+        except Exception as e:
+            print(f"[leanfetch] Could not block resources in this tab: {e}")
+
+    def classify(self, url: str) -> str:
+        for resource_type in self.resource_types:
+            if any(fnmatchcase(url, p) for p in RESOURCE_PATTERNS[resource_type]):
+                return resource_type
+        return "other"
+
+    def observe(self, msg: Dict[str, Any]):
+        method = msg.get("method")
+        params = msg.get("params") or {}
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            self.urls[request_id] = (params.get("request") or {}).get("url", "")
+        elif method == "Network.loadingFailed":
+            url = self.urls.pop(request_id, "")
+            if params.get("blockedReason") == "inspector":
+                self.blocked[self.classify(url)] += 1
+        elif method == "Network.loadingFinished":
+            self.urls.pop(request_id, None)
+            self.loaded_bytes += int(params.get("encodedDataLength") or 0)
+
+    def read_log(self):
+        """Consume the performance log (when no NetworkCapture is reading it)."""
+        for entry in self.driver.get_log("performance"):
+            try:
+                self.observe(json.loads(entry["message"])["message"])
+            except (KeyError, ValueError):
+                continue
+
+    def reset(self):
+        self.urls.clear()
+        self.blocked.clear()
+        self.loaded_bytes = 0
+
+    def saved_bytes(self) -> int:
+        return sum(ESTIMATED_BYTES.get(t, 0) * n for t, n in self.blocked.items())
+
+    def report(self):
+        if not self.blocked and not self.loaded_bytes:
+            return
+        detail = ", ".join(f"{t} {n}" for t, n in self.blocked.most_common()) or "none"
+        print(f"[leanfetch] Blocked {sum(self.blocked.values())} requests ({detail}); "
+              f"~{self.saved_bytes() / 1e6:.1f} MB saved, {self.loaded_bytes / 1e6:.1f} MB fetched this cycle.")
@@ -1,24 +1,31 @@
+import html
 import os
-import random
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+from . import metrics
 from .config import Config
-from .state import load_state, save_state
+from .state import StateStore
+from .outbox import DeliveryWorker, Outbox, deliver_pending
 from .telegram_client import TelegramClient
+from .dedup import parse_status_id
+from .history import MatchHistory
+from .detect import get_matcher
+from .scheduler import AdaptiveScheduler
 from .twitter import TwitterWatcher
 
 
 def format_message(item: Dict) -> str:
-    username = item.get("username", "Unknown User")
-    text = item.get("text", "").strip()
+    # Tweet content goes into HTML parse mode, so it must not carry markup
+    username = html.escape(item.get("username", "Unknown User"), quote=False)
+    text = html.escape(item.get("text", "").strip(), quote=False)
     mints = item.get("mints", [])
     timestamp = item.get("timestamp", "Unknown Time")
     post_url = item.get("post_url", "Unknown URL")
     likes = item.get("likes", "0")
     comments = item.get("comments", "0")
     reposts = item.get("reposts", "0")
-    feed_source = item.get("feed_source", "Unknown Feed")
+    feed_source = ", ".join(item.get("feed_sources") or []) or item.get("feed_source", "Unknown Feed")
     
     # Format timestamp to be more readable
     formatted_time = timestamp
@@ -41,16 +48,8 @@ def format_message(item: Dict) -> str:
     except Exception:
         pass  # Keep original timestamp if parsing fails
     
-    # Bold the new search keywords in post content
-    keywords = [
-        "pump", "sol", "coming soon", "launching soon", "launch", "project"
-    ]
-    formatted_text = text
-    for keyword in keywords:
-        # Case-insensitive replacement with bold formatting
-        import re
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-        formatted_text = pattern.sub(f"<b>{keyword}</b>", formatted_text)
+    # Bold the search keywords in post content (one precompiled pass)
+    formatted_text = get_matcher(()).highlight(text)
     
     # Format contract addresses as inline quotes
     contracts_str = "\n".join(f"> {m}" for m in mints) if mints else "> No contract address found"
@@ -79,90 +78,181 @@ def format_message(item: Dict) -> str:
 
 
 
-def single_run(cfg: Config, return_results: bool = False):
+def _tweet_key(item: Dict) -> Optional[str]:
+    """Seen-set key for a tweet: its status id, else whatever id it carries."""
+    sid = parse_status_id(item)
+    return str(sid) if sid else item.get("id")
+
+
+def _deliver_inline(cfg: Config, outbox: Outbox) -> int:
+    """Drain the outbox in this thread when no background worker is running."""
+    if not outbox.pending_count():
+        return 0
+    tg = TelegramClient(cfg.telegram_bot_token, cfg.telegram_chat_id, base_url=cfg.telegram_api_base)
+    try:
+        # Paced by the client's rate limiter, not by sleeps between sends
+        return deliver_pending(cfg, outbox, tg, force=True)
+    finally:
+        tg.close()
+
+
+def _record_history(cfg: Config, matches: List[Dict]):
+    """Add this cycle's matches to the searchable history; never fails the cycle."""
+    try:
+        history = MatchHistory(cfg.history_db_path)
+        try:
+            added = history.record(matches)
+        finally:
+            history.close()
+        print(f"[main] Recorded {len(matches)} matches in history ({added} new).")
+    except Exception as e:
+        print(f"[main] Could not record match history: {e}")
+
+
+def single_run(cfg: Config, return_results: bool = False, watcher: Optional[TwitterWatcher] = None,
+               delivery: Optional[DeliveryWorker] = None, scheduler: Optional[AdaptiveScheduler] = None):
     """Run a single scraping cycle. 
     
     Args:
         cfg: Configuration object
-        return_results: If True, returns (sent_count, results_list), otherwise just sent_count
+        return_results: If True, returns (count, results_list), otherwise just count.
+            The count is messages sent, or only queued when `delivery` is given.
+        watcher: Optional persistent TwitterWatcher to reuse. When given, the
+            browser is health-checked and kept alive after the cycle; otherwise
+            a fresh watcher is started and stopped for this cycle only.
+        delivery: Optional running DeliveryWorker. When given, new items are
+            only queued in the outbox and the worker sends them; otherwise the
+            outbox is drained before returning.
+        scheduler: Optional AdaptiveScheduler that is told what the cycle
+            yielded, so it can pick the pause before the next one.
     """
+    cycle_started = time.monotonic()
     print("[main] Loading state...")
-    state = load_state(cfg.state_path)
-    last_id = state.get("last_tweet_id")
-    seen_mints = set(state.get("seen_mints", []))
+    store = StateStore(cfg.state_db_path, cfg.seen_ttl_sec, legacy_json_path=cfg.state_path)
+    evicted = store.evict_expired()
+    if evicted:
+        print(f"[main] Evicted {evicted} expired seen entries.")
+    last_id = parse_status_id(store.get_meta("last_tweet_id"))
+    watermarks: Dict[str, int] = dict(store.get_meta("feed_watermarks") or {})
 
-    print("[main] Starting TwitterWatcher...")
-    watcher = TwitterWatcher(cfg)
-    watcher.start()
+    owns_watcher = watcher is None
+    if owns_watcher:
+        print("[main] Starting TwitterWatcher...")
+        watcher = TwitterWatcher(cfg)
+    watcher.waits.reset()
     try:
-        print("[main] Opening search page...")
-        watcher.open_search()
+        if owns_watcher:
+            watcher.start()
+            print("[main] Opening search page...")
+            watcher.open_search()
+        else:
+            print("[main] Preparing persistent TwitterWatcher...")
+            watcher.ensure_ready()
         print("[main] Collecting tweets from multiple feeds...")
-        tweets = watcher.collect_tweets_multi_feed(max_count_per_feed=20)  # 20 tweets from each feed
+        tweets = watcher.collect_tweets_multi_feed(max_count_per_feed=20, watermarks=watermarks)  # 20 tweets from each feed
         print(f"[main] Extracted {len(tweets)} tweets total from all feeds.")
+        watcher.waits.report()
+        # Advance each feed's watermark to the newest status id it produced
+        for t in tweets:
+            sid = parse_status_id(t)
+            for key in t.get("feed_keys") or [t.get("feed_key")]:
+                if sid and key and sid > watermarks.get(key, 0):
+                    watermarks[key] = sid
         print("[main] Filtering matches...")
         matches = watcher.filter_matches(tweets)
         print(f"[main] Found {len(matches)} candidate matches.")
+        if cfg.match_history and matches:
+            _record_history(cfg, matches)
 
-        # Allow duplicate tweets - just check for new mints
+        # Send a tweet once, and only if it brings a mint we have not alerted
+        # on yet (or carries no mint at all, when addresses are optional)
         new_items: List[Dict] = []
+        claimed = set()
         for m in matches:
-            new_mints = [x for x in m.get("mints", []) if x not in seen_mints]
+            tweet_id = _tweet_key(m)
+            if tweet_id and store.has_tweet(tweet_id):
+                continue
+            mints = m.get("mints", [])
+            new_mints = [x for x in mints if x not in claimed and not store.has_mint(x)]
             if new_mints:
                 m["mints"] = new_mints
+                claimed.update(new_mints)
                 new_items.append(m)
-            # Also include tweets with no new mints but that haven't been seen recently
-            elif not seen_mints or len(seen_mints) < 100:  # Allow some duplicates
+            elif not mints:
                 new_items.append(m)
 
         print(f"[main] {len(new_items)} new items to send to Telegram.")
-        if not new_items:
-            print("[main] No new items. Exiting.")
-            return 0
-
-        tg = TelegramClient(cfg.telegram_bot_token, cfg.telegram_chat_id)
-        sent = 0
-        for idx, item in enumerate(new_items):
-            msg = format_message(item)
-            print(f"[main] Sending item {idx+1}/{len(new_items)} to Telegram...")
-            res = tg.send_message(msg)
-            if res:
-                print(f"[main] Sent successfully: {item.get('id')}")
-                sent += 1
+        if scheduler is not None:
+            scheduler.record(cfg.search_query, len(tweets), new_items)
+        outbox = Outbox(cfg.outbox_db_path, cfg.outbox_max_attempts)
+        try:
+            queued = 0
+            for item in new_items:
+                # Queue before marking seen: a crash in between re-scrapes the
+                # tweet next cycle and the unique key keeps it from doubling
+                if outbox.enqueue(_tweet_key(item), format_message(item), item):
+                    queued += 1
+                store.mark_seen(item.get("mints", []), _tweet_key(item))
+                sid = parse_status_id(item)
+                if sid and sid > (last_id or 0):
+                    last_id = sid
+                    store.set_meta("last_tweet_id", str(last_id))
+            # Only now: a crash before this re-scrapes the same tweets next
+            # cycle, and the seen-tweet dedup drops those already queued
+            store.set_meta("feed_watermarks", watermarks)
+
+            if delivery is not None:
+                delivery.wake()
+                sent = queued  # the worker reports actual deliveries
+                print(f"[main] Done. Queued {queued} messages for delivery.")
             else:
-                print(f"[main] Failed to send: {item.get('id')}")
-            # update state progressively
-            if item.get("id"):
-                last_id = max(last_id or "", item["id"])  # lexical fallback
-            for mint in item.get("mints", []):
-                seen_mints.add(mint)
-            time.sleep(random.uniform(0.8, 1.6))
-
-        print("[main] Saving state...")
-        save_state(cfg.state_path, {
-            "last_tweet_id": last_id,
-            "seen_mints": sorted(seen_mints),
-        })
-        print(f"[main] Done. Sent {sent} messages.")
+                sent = _deliver_inline(cfg, outbox)
+                pending = outbox.pending_count()
+                print(f"[main] Done. Sent {sent} messages."
+                      + (f" {pending} left in the outbox for retry." if pending else ""))
+        finally:
+            outbox.close()
+        metrics.CYCLE_SECONDS.observe(time.monotonic() - cycle_started, result="ok")
         
         if return_results:
             return sent, new_items
         return sent
+    except Exception:
+        metrics.CYCLE_SECONDS.observe(time.monotonic() - cycle_started, result="error")
+        # A crashed browser is rebuilt on the next cycle rather than reused
+        if not owns_watcher and not watcher.is_healthy():
+            watcher.stop()
+        raise
     finally:
-        print("[main] Stopping TwitterWatcher...")
-        watcher.stop()
+        store.close()
+        if owns_watcher:
+            print("[main] Stopping TwitterWatcher...")
+            watcher.stop()
 
 
 def main_loop():
     cfg = Config()
+    watcher = TwitterWatcher(cfg) if cfg.persistent_watcher else None
+    delivery = DeliveryWorker(cfg) if cfg.async_delivery else None
+    if delivery is not None:
+        delivery.start()
+    try:
+        _run_forever(cfg, watcher, delivery, AdaptiveScheduler(cfg))
+    finally:
+        if delivery is not None:
+            delivery.stop()
+        if watcher is not None:
+            watcher.stop()
+
+
+def _run_forever(cfg: Config, watcher: Optional[TwitterWatcher], delivery: Optional[DeliveryWorker] = None,
+                 scheduler: Optional[AdaptiveScheduler] = None):
+    scheduler = scheduler or AdaptiveScheduler(cfg)
     while True:
         try:
-            n = single_run(cfg)
-            # jitter
-            sleep_s = cfg.run_interval_sec + random.randint(-cfg.jitter_sec, cfg.jitter_sec)
-            if sleep_s < 60:
-                sleep_s = 60
-            print(f"Cycle done. Sent {n}. Sleeping {sleep_s}s...")
+            n = single_run(cfg, watcher=watcher, delivery=delivery, scheduler=scheduler)
+            sleep_s = round(scheduler.next_interval(cfg.search_query))
+            print(f"Cycle done. {'Queued' if delivery is not None else 'Sent'} {n}. Sleeping {sleep_s}s...")
             time.sleep(sleep_s)
         except KeyboardInterrupt:
             print("Stopped by user.")
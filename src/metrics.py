@@ -0,0 +1,152 @@
+"""In-process counters and histograms, rendered in the Prometheus text format.
+
+The scraper, the outbox and the Telegram client record into the module-level
+metrics below; `render()` produces the body served at the API's /metrics.
+"""
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20)
+FRESHNESS_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Sample lines of the exposition, one per series."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self.lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}{_label_str(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self.values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[i] += 1
+            self.values[key] = (counts, total + value)
+
+    def _samples(self) -> List[str]:
+        with self.lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self.values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _num(bound)
+                labels = _label_str(self.labelnames, key, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def _register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Browser
+DRIVER_BUILD_SECONDS = _register(Histogram(
+    "xscraper_driver_build_seconds", "Time to launch Chrome and attach the driver.", ("cache",)))
+LOGIN_PROBE_SECONDS = _register(Histogram(
+    "xscraper_login_probe_seconds", "Time to decide whether the session is logged in.", ("result",)))
+FEED_LOAD_SECONDS = _register(Histogram(
+    "xscraper_feed_load_seconds", "Time from navigation until a feed renders tweets.", ("feed", "result")))
+SCROLL_PASSES = _register(Counter(
+    "xscraper_scroll_passes_total", "Extract-and-scroll steps taken.", ("feed",)))
+TWEETS_EXTRACTED = _register(Counter(
+    "xscraper_tweets_extracted_total", "New unique tweets collected.", ("feed",)))
+WAIT_SECONDS = _register(Counter(
+    "xscraper_wait_seconds_total", "Time spent idle in condition waits and pauses.", ("stage",)))
+
+# Cycle
+CYCLE_SECONDS = _register(Histogram(
+    "xscraper_cycle_seconds", "Duration of a full scrape cycle.", ("result",),
+    buckets=(5, 10, 20, 30, 60, 90, 120, 180, 240, 300, 600)))
+FILTER_RESULTS = _register(Counter(
+    "xscraper_filter_results_total", "Tweets passed or rejected by the match filter.", ("result",)))
+
+# Delivery
+TELEGRAM_REQUEST_SECONDS = _register(Histogram(
+    "xscraper_telegram_request_seconds", "Bot API request latency.", ("method", "status"),
+    buckets=LATENCY_BUCKETS))
+TELEGRAM_RATE_LIMITED = _register(Counter(
+    "xscraper_telegram_rate_limited_total", "Bot API calls answered with 429.", ("method",)))
+ALERTS_DELIVERED = _register(Counter(
+    "xscraper_alerts_delivered_total", "Outbox items delivered, failed or rejected.", ("result",)))
+ALERT_FRESHNESS_SECONDS = _register(Histogram(
+    "xscraper_alert_freshness_seconds", "Time from a tweet being posted to its alert being sent.",
+    buckets=FRESHNESS_BUCKETS))
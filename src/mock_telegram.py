@@ -0,0 +1,275 @@
+"""Local stand-in for the Telegram Bot API, for load tests and formatting checks.
+
+    python -m src.mock_telegram --port 8081              # serve until Ctrl+C
+    python -m src.mock_telegram --load 2000 --chats 20   # drive TelegramClient against it
+
+Point the scraper at it with TELEGRAM_API_BASE=http://127.0.0.1:8081. Only
+sendMessage and editMessageText are implemented; every accepted call is
+recorded and GET /_recorded returns the log as JSON.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from .telegram_client import GLOBAL_RATE, GROUP_CHAT_RATE, MAX_MESSAGE_CHARS, PRIVATE_CHAT_RATE
+
+# Tags Telegram accepts with parse_mode=HTML
+ALLOWED_TAGS = {"b", "strong", "i", "em", "u", "ins", "s", "strike", "del", "span",
+                "tg-spoiler", "a", "code", "pre", "blockquote", "tg-emoji"}
+
+
+class _EntityChecker(HTMLParser):
+    """Rejects HTML the way Telegram does: unknown or unbalanced tags."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: List[str] = []
+        self.error: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ALLOWED_TAGS:
+            self.error = self.error or f"Unsupported start tag \"{tag}\""
+        self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if not self.stack or self.stack.pop() != tag:
+            self.error = self.error or f"Unmatched end tag \"{tag}\""
+
+
+def check_html(text: str) -> Optional[str]:
+    """Return Telegram's "can't parse entities" reason for text, or None if it is valid."""
+    checker = _EntityChecker()
+    checker.feed(text)
+    checker.close()
+    if not checker.error and checker.stack:
+        checker.error = f"Can't find end tag corresponding to start tag \"{checker.stack[-1]}\""
+    return checker.error
+
+
+class _RateWindow:
+    """Non-blocking token bucket: take() reports how long until a token is free."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class MockTelegramServer:
+    """Threaded HTTP server that mimics sendMessage/editMessageText.
+
+    `latency` is a (min, max) delay in seconds added to every call. Chats are
+    limited like the real API (private 1/s, groups 20/min, 30/s overall) with
+    `strict_limits`, and `fail_rate` injects random 429s on top. Rate-limited
+    calls get a 429 with `parameters.retry_after`, as Telegram sends them.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: Tuple[float, float] = (0.0, 0.0),
+                 strict_limits: bool = True, fail_rate: float = 0.0, retry_after: int = 1):
+        self.latency = latency
+        self.strict_limits = strict_limits
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.recorded: List[Dict[str, Any]] = []
+        self.rejected: Dict[str, int] = {}
+        self.messages: Dict[Tuple[str, int], str] = {}
+        self.next_message_id: Dict[str, int] = {}
+        self.global_window = _RateWindow(GLOBAL_RATE, GLOBAL_RATE)
+        self.chat_windows: Dict[str, _RateWindow] = {}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockTelegramServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-telegram", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self):
+        with self.lock:
+            self.recorded.clear()
+            self.rejected.clear()
+            self.messages.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"accepted": len(self.recorded), "rejected": dict(self.rejected)}
+
+    # Bot API behaviour
+
+    def _reject(self, reason: str, code: int, description: str, **extra) -> Tuple[int, Dict[str, Any]]:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        body = {"ok": False, "error_code": code, "description": description}
+        body.update(extra)
+        return code, body
+
+    def _rate_limited(self, chat_id: str) -> float:
+        if self.fail_rate and random.random() < self.fail_rate:
+            return float(self.retry_after)
+        if not self.strict_limits:
+            return 0.0
+        window = self.chat_windows.get(chat_id)
+        if window is None:
+            rate = GROUP_CHAT_RATE if chat_id.startswith(("-", "@")) else PRIVATE_CHAT_RATE
+            # Telegram tolerates short bursts before it starts answering 429
+            window = self.chat_windows[chat_id] = _RateWindow(rate, 3)
+        return max(window.take(), self.global_window.take())
+
+    def handle(self, method: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        low, high = self.latency
+        if high > 0:
+            time.sleep(random.uniform(low, high))
+        chat_id = str(params.get("chat_id") or "")
+        text = params.get("text") or ""
+        with self.lock:
+            if method not in ("sendMessage", "editMessageText"):
+                return self._reject("not_found", 404, "Not Found: method not found")
+            if not chat_id:
+                return self._reject("bad_request", 400, "Bad Request: chat_id is empty")
+            if not text.strip():
+                return self._reject("bad_request", 400, "Bad Request: message text is empty")
+            if len(text) > MAX_MESSAGE_CHARS:
+                return self._reject("too_long", 400, "Bad Request: message is too long")
+            if params.get("parse_mode") == "HTML":
+                error = check_html(text)
+                if error:
+                    return self._reject("bad_html", 400, f"Bad Request: can't parse entities: {error}")
+            wait = self._rate_limited(chat_id)
+            if wait > 0:
+                retry_after = max(1, math.ceil(wait))
+                return self._reject("rate_limited", 429, f"Too Many Requests: retry after {retry_after}",
+                                    parameters={"retry_after": retry_after})
+
+            if method == "editMessageText":
+                message_id = int(params.get("message_id") or 0)
+                previous = self.messages.get((chat_id, message_id))
+                if previous is None:
+                    return self._reject("bad_request", 400, "Bad Request: message to edit not found")
+                if previous == text:
+                    return self._reject("not_modified", 400, "Bad Request: message is not modified")
+            else:
+                message_id = self.next_message_id.get(chat_id, 0) + 1
+                self.next_message_id[chat_id] = message_id
+            self.messages[(chat_id, message_id)] = text
+            self.recorded.append({"method": method, "chat_id": chat_id, "message_id": message_id,
+                                  "text": text, "at": time.time()})
+        return 200, {"ok": True, "result": {"message_id": message_id, "chat": {"id": chat_id},
+                                            "date": int(time.time()), "text": text}}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, code: int, body: Any):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/_recorded":
+                    with server.lock:
+                        self._send(200, server.recorded)
+                else:
+                    self._send(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    params = json.loads(raw or "{}")
+                else:
+                    params = {k: v[0] for k, v in parse_qs(raw).items()}
+                # /bot<token>/<method>
+                method = self.path.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+                self._send(*server.handle(method, params))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def load_test(server: MockTelegramServer, messages: int, chats: int, concurrency: int):
+    """Push messages through TelegramClient and report throughput and 429s."""
+    from .telegram_client import TelegramClient
+
+    client = TelegramClient("mock-token", "1", base_url=server.base_url, concurrency=concurrency)
+    batch = [(str(1000 + i % chats), f"<b>load</b> test message {i}") for i in range(messages)]
+    started = time.perf_counter()
+    results = client.send_many(batch)
+    elapsed = time.perf_counter() - started
+    client.close()
+    ok = sum(1 for r in results if r and r.get("ok"))
+    stats = server.stats()
+    print(f"[mock-telegram] Delivered {ok}/{messages} to {chats} chats in {elapsed:.1f}s "
+          f"({ok / elapsed * 60:.0f} msg/min); rejected: {stats['rejected'] or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Telegram Bot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", default="0,0", help="min,max seconds added to each call")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of calls answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--no-limits", action="store_true", help="disable per-chat/global rate limits")
+    parser.add_argument("--load", type=int, default=0, help="send this many messages through TelegramClient and exit")
+    parser.add_argument("--chats", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    low, high = (float(x) for x in args.latency.split(","))
+    server = MockTelegramServer(args.host, 0 if args.load else args.port, (low, high),
+                                strict_limits=not args.no_limits, fail_rate=args.fail_rate,
+                                retry_after=args.retry_after)
+    with server:
+        if args.load:
+            load_test(server, args.load, args.chats, args.concurrency)
+            return
+        print(f"[mock-telegram] Listening on {server.base_url} (set TELEGRAM_API_BASE to use it)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("[mock-telegram] Stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import metrics
+from .config import Config
+from .dedup import tweet_posted_at
+from .telegram_client import MessageBatcher, TelegramClient, is_rejected
+
+RETRY_BASE_SEC = 5
+RETRY_MAX_SEC = 600
+SENT_RETENTION_SEC = 24 * 3600
+
+
+class Outbox:
+    """Durable queue of formatted Telegram alerts (SQLite, one row per item).
+
+    The scraper enqueues an item before marking its tweet and mints as seen,
+    and `item_key` is unique, so a crash in between re-enqueues nothing twice
+    and loses nothing. Rows stay pending until delivered; failures are retried
+    with exponential backoff and parked as "failed" after `max_attempts`.
+    A connection belongs to one thread, so each thread opens its own Outbox.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 10):
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(str(p), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_key TEXT UNIQUE,
+                text TEXT NOT NULL,
+                item TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                sent_at REAL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at);
+        """)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, key: Optional[str], text: str, item: Dict[str, Any]) -> bool:
+        """Queue a message; returns False if this key was queued before."""
+        now = time.time()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO outbox (item_key, text, item, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, text, json.dumps(item, ensure_ascii=False), now, now),
+            )
+        return cur.rowcount > 0
+
+    def due(self, limit: int = 100) -> List[sqlite3.Row]:
+        """Pending rows whose next attempt is due, oldest first."""
+        return self.conn.execute(
+            "SELECT * FROM outbox WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+            (time.time(), limit),
+        ).fetchall()
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next pending row is due (None when the queue is empty)."""
+        row = self.conn.execute(
+            "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'"
+        ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def pending_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def mark_sent(self, ids: List[int]):
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE outbox SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+                [(time.time(), i) for i in ids],
+            )
+
+    def mark_failed(self, ids: List[int], error: str):
+        """Schedule a retry with backoff, or park rows that ran out of attempts."""
+        now = time.time()
+        with self.conn:
+            for row_id in ids:
+                attempts = self.conn.execute("SELECT attempts FROM outbox WHERE id = ?", (row_id,)).fetchone()[0] + 1
+                delay = min(RETRY_BASE_SEC * 2 ** (attempts - 1), RETRY_MAX_SEC)
+                status = "failed" if attempts >= self.max_attempts else "pending"
+                self.conn.execute(
+                    "UPDATE outbox SET attempts = ?, status = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    (attempts, status, now + delay, error, row_id),
+                )
+
+    def mark_rejected(self, ids: List[int], error: str):
+        """Park rows Telegram refused for good, without spending their retries."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, status = 'failed', last_error = ? WHERE id = ?",
+                [(error, i) for i in ids],
+            )
+
+    def purge_sent(self, older_than_sec: float = SENT_RETENTION_SEC) -> int:
+        with self.conn:
+            return self.conn.execute(
+                "DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?", (time.time() - older_than_sec,)
+            ).rowcount
+
+
+def _observe_freshness(rows: List[sqlite3.Row]):
+    """Record how long after posting each delivered tweet reached Telegram."""
+    now = time.time()
+    metrics.ALERTS_DELIVERED.inc(len(rows), result="sent")
+    for row in rows:
+        try:
+            posted = tweet_posted_at(json.loads(row["item"]))
+        except ValueError:
+            continue
+        if posted is not None:
+            metrics.ALERT_FRESHNESS_SECONDS.observe(max(0.0, now - posted))
+
+
+def deliver_pending(cfg: Config, outbox: Outbox, tg: TelegramClient, force: bool = False) -> int:
+    """Send every due outbox row once; returns how many rows were delivered.
+
+    With batching on, full batches go out immediately and the trailing partial
+    batch waits until its oldest row is `telegram_batch_max_delay_sec` old,
+    unless `force` is set.
+    """
+    rows = outbox.due()
+    if not rows:
+        return 0
+    if cfg.telegram_batch_messages:
+        batcher = MessageBatcher(max_delay_sec=cfg.telegram_batch_max_delay_sec)
+        batches = []
+        for row in rows:
+            batches.extend(batcher.add(row, row["text"]))
+        oldest = batcher.keys[0]["created_at"] if len(batcher) else None
+        if oldest is not None and (force or time.time() - oldest >= batcher.max_delay_sec):
+            batches.append(batcher.flush())
+        if not batches:
+            return 0
+        print(f"[outbox] Packed {sum(len(keys) for keys, _ in batches)} items into {len(batches)} messages.")
+    else:
+        batches = [([row], row["text"]) for row in rows]
+
+    delivered = 0
+    singles: List[sqlite3.Row] = []
+    results = tg.send_many([text for _, text in batches])
+    for (batch_rows, _), res in zip(batches, results):
+        if is_rejected(res) and len(batch_rows) > 1:
+            # One bad item must not sink the ones packed with it
+            print(f"[outbox] A batch of {len(batch_rows)} was rejected; sending its items one by one.")
+            singles.extend(batch_rows)
+        else:
+            delivered += _settle(outbox, batch_rows, res)
+    if singles:
+        results = tg.send_many([row["text"] for row in singles])
+        for row, res in zip(singles, results):
+            delivered += _settle(outbox, [row], res)
+    outbox.purge_sent()
+    return delivered
+
+
+def _settle(outbox: Outbox, rows: List[sqlite3.Row], res: Optional[dict]) -> int:
+    """Record the outcome of one sendMessage; returns how many rows it delivered."""
+    ids = [row["id"] for row in rows]
+    if res and res.get("ok", True):
+        outbox.mark_sent(ids)
+        _observe_freshness(rows)
+        return len(ids)
+    if is_rejected(res):
+        outbox.mark_rejected(ids, res.get("description") or "rejected")
+        metrics.ALERTS_DELIVERED.inc(len(ids), result="rejected")
+        print(f"[outbox] Telegram rejected {len(ids)} item(s): {res.get('description')}")
+    else:
+        outbox.mark_failed(ids, "send failed")
+        metrics.ALERTS_DELIVERED.inc(len(ids), result="failed")
+        print(f"[outbox] Delivery failed for {len(ids)} item(s); will retry.")
+    return 0
+
+
+class DeliveryWorker:
+    """Background thread that drains the outbox so scraping never waits on Telegram."""
+
+    def __init__(self, cfg: Config, poll_interval: float = 30.0):
+        self.cfg = cfg
+        self.poll_interval = poll_interval
+        self.wake_event = threading.Event()
+        self.stopping = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="telegram-delivery", daemon=True)
+        self.thread.start()
+        print("[outbox] Delivery worker started.")
+
+    def wake(self):
+        """Deliver newly queued items now instead of at the next poll."""
+        self.wake_event.set()
+
+    def stop(self, timeout: float = 10.0):
+        self.stopping = True
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _run(self):
+        outbox = Outbox(self.cfg.outbox_db_path, self.cfg.outbox_max_attempts)
+        tg = None
+        try:
+            while not self.stopping:
+                wait = self.poll_interval
+                # Cleared before delivering, so a wake() during delivery is not lost
+                self.wake_event.clear()
+                try:
+                    if tg is None:
+                        tg = TelegramClient(self.cfg.telegram_bot_token, self.cfg.telegram_chat_id,
+                                            base_url=self.cfg.telegram_api_base)
+                    deliver_pending(self.cfg, outbox, tg)
+                    next_due = outbox.next_due_in()
+                    if next_due is not None:
+                        # A held partial batch becomes due after the batching delay
+                        if self.cfg.telegram_batch_messages:
+                            next_due = max(next_due, min(self.cfg.telegram_batch_max_delay_sec, 1.0))
+                        wait = min(wait, max(next_due, 0.5))
+                except Exception as e:
+                    print(f"[outbox] Delivery error: {e}")
+                self.wake_event.wait(wait)
+        finally:
+            if tg is not None:
+                tg.close()
+            outbox.close()
@@ -0,0 +1,309 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .config import Config
+from .events import EventBroadcaster
+from .scheduler import AdaptiveScheduler
+
+# The browser stack (selenium, undetected_chromedriver) is imported on first
+# use so the API server answers requests right after it starts
+if TYPE_CHECKING:
+    from .outbox import DeliveryWorker
+    from .twitter import TwitterWatcher
+
+RESULTS_RETAINED = 200  # matches kept per profile for /api/results
+
+
+class WatchProfile:
+    """A named watch: one immutable Config plus its run state and schedule.
+
+    The profile owns its persistent browser and delivery worker; both are
+    rebuilt whenever a new Config is put in place.
+    """
+
+    def __init__(self, name: str, cfg: Config, source: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.cfg = cfg
+        self.source = source or {}  # settings as received from the API, for persistence
+        self.automation = False
+        self.running = False
+        self.next_run = 0.0
+        self.last_run: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_sent = 0
+        self.last_queued = 0  # handed to the delivery worker, not yet confirmed sent
+        # Every new match, numbered with an increasing `seq`
+        self.results = EventBroadcaster(RESULTS_RETAINED, id_field="seq")
+        self.watcher: Optional["TwitterWatcher"] = None
+        self.delivery: Optional["DeliveryWorker"] = None
+        self.warm = threading.Event()  # cleared while the browser is pre-warmed
+        self.warm.set()
+        self.browser_lock = threading.RLock()  # guards `watcher` between the pre-warm and runs
+        self.scheduler = AdaptiveScheduler(cfg)
+
+    def watcher_for(self, cfg: Config) -> "TwitterWatcher":
+        from .twitter import TwitterWatcher
+
+        with self.browser_lock:
+            if self.watcher is not None and self.watcher.cfg is not cfg:
+                self.watcher.stop()
+                self.watcher = None
+            if self.watcher is None:
+                self.watcher = TwitterWatcher(cfg)
+            return self.watcher
+
+    def delivery_for(self, cfg: Config) -> Optional["DeliveryWorker"]:
+        from .outbox import DeliveryWorker
+
+        if self.delivery is not None and self.delivery.cfg is not cfg:
+            self.delivery.stop()
+            self.delivery = None
+        if cfg.async_delivery and self.delivery is None:
+            self.delivery = DeliveryWorker(cfg)
+            self.delivery.start()
+        return self.delivery
+
+    def release_browser(self):
+        with self.browser_lock:
+            if self.watcher is not None:
+                print(f"[profiles] Stopping browser of profile '{self.name}'...")
+                self.watcher.stop()
+                self.watcher = None
+
+    def release(self):
+        self.release_browser()
+        if self.delivery is not None:
+            self.delivery.stop()
+            self.delivery = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "search_query": self.cfg.search_query,
+            "automation_enabled": self.automation,
+            "scrape_running": self.running,
+            "interval_sec": self.cfg.run_interval_sec,
+            "yield": self.scheduler.snapshot().get(self.cfg.search_query),
+            "next_run": self.next_run if self.automation else None,
+            "last_run": self.last_run,
+            "last_sent": self.last_sent,
+            "last_queued": self.last_queued,
+            "last_error": self.last_error,
+            "browser_live": self.watcher is not None and self.watcher.driver is not None,
+        }
+
+
+class ProfileManager:
+    """Runs watch profiles concurrently with a global cap on live browsers.
+
+    Scrapes go through a thread pool; each one holds a slot of
+    `max_browsers` while its browser is in use. Profiles keep their browser
+    between cycles only while there are no more profiles than slots, so the
+    cap holds for idle browsers too. A scheduler thread starts automated
+    profiles when their adaptive interval has passed.
+    """
+
+    def __init__(self, max_browsers: int = 2, max_workers: Optional[int] = None,
+                 on_event: Optional[Callable[..., None]] = None):
+        self.max_browsers = max(1, max_browsers)
+        self.browser_slots = threading.BoundedSemaphore(self.max_browsers)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or self.max_browsers * 2,
+                                       thread_name_prefix="profile")
+        self.profiles: Dict[str, WatchProfile] = {}
+        self.lock = threading.RLock()
+        self.on_event = on_event or (lambda message, event_type="info": None)
+        self.stopping = threading.Event()
+        self.scheduler: Optional[threading.Thread] = None
+
+    # Registry
+
+    def get(self, name: str) -> Optional[WatchProfile]:
+        with self.lock:
+            return self.profiles.get(name)
+
+    def all(self) -> List[WatchProfile]:
+        with self.lock:
+            return list(self.profiles.values())
+
+    def put(self, name: str, cfg: Config, source: Optional[Dict[str, Any]] = None) -> WatchProfile:
+        """Add a profile or swap in a new Config; schedule and automation are kept."""
+        with self.lock:
+            profile = self.profiles.get(name)
+            if profile is None:
+                profile = self.profiles[name] = WatchProfile(name, cfg, source)
+            else:
+                profile.cfg = cfg
+                profile.scheduler.cfg = cfg
+                profile.source = source or profile.source
+                if not profile.running:
+                    # Built for the old config; the next run starts fresh ones
+                    profile.release()
+            if len(self.profiles) > self.max_browsers:
+                for other in self.profiles.values():
+                    if not other.running:
+                        other.release_browser()
+            return profile
+
+    def remove(self, name: str) -> bool:
+        with self.lock:
+            profile = self.profiles.pop(name, None)
+        if profile is None:
+            return False
+        profile.automation = False
+        profile.results.close()
+        if not profile.running:
+            profile.release()
+        return True
+
+    # Running
+
+    def trigger(self, name: str) -> bool:
+        """Start a scrape of the profile now; False if it is unknown or already running."""
+        with self.lock:
+            profile = self.profiles.get(name)
+            if profile is None or profile.running:
+                return False
+            profile.running = True
+        self.pool.submit(self._run, profile)
+        return True
+
+    def set_automation(self, name: str, enabled: bool) -> bool:
+        with self.lock:
+            profile = self.profiles.get(name)
+            if profile is None:
+                return False
+            if enabled and not profile.automation:
+                profile.next_run = time.time()
+            profile.automation = enabled
+        if enabled:
+            self._ensure_scheduler()
+        return True
+
+    def _ensure_scheduler(self):
+        if self.scheduler and self.scheduler.is_alive():
+            return
+        self.stopping.clear()
+        self.scheduler = threading.Thread(target=self._schedule_loop, name="profile-scheduler", daemon=True)
+        self.scheduler.start()
+
+    def _schedule_loop(self):
+        while not self.stopping.wait(1):
+            now = time.time()
+            for profile in self.all():
+                if profile.automation and not profile.running and now >= profile.next_run:
+                    self.trigger(profile.name)
+
+    def _label(self, profile: WatchProfile) -> str:
+        return "" if profile.name == "default" else f"[{profile.name}] "
+
+    def prewarm(self, name: str = "default", browser: bool = False):
+        """Import the browser stack in the background, and optionally launch
+        and log in the profile's persistent browser so its first scrape starts warm."""
+        profile = self.get(name) if browser else None
+        # Browsers are not kept between runs when profiles outnumber slots
+        if profile is not None and (not profile.cfg.persistent_watcher or len(self.profiles) > self.max_browsers):
+            profile = None
+        if profile is not None:
+            # Before the thread starts, so a scrape requested during the
+            # import already waits for the browser
+            profile.warm.clear()
+
+        def warm():
+            started = time.monotonic()
+            try:
+                from . import main  # noqa: F401 - selenium, undetected_chromedriver
+                print(f"[profiles] Browser modules imported in {time.monotonic() - started:.1f}s.")
+                if profile is None:
+                    return
+                with self.browser_slots:
+                    profile.watcher_for(profile.cfg).warm_up()
+                print(f"[profiles] Browser of profile '{name}' pre-warmed in {time.monotonic() - started:.1f}s.")
+            except Exception as e:
+                print(f"[profiles] Pre-warming profile '{name}' failed: {e}")
+                if profile is not None:
+                    profile.release_browser()
+            finally:
+                if profile is not None:
+                    profile.warm.set()
+
+        threading.Thread(target=warm, name="prewarm", daemon=True).start()
+
+    def _run(self, profile: WatchProfile):
+        from .main import single_run
+
+        label = self._label(profile)
+        cfg = profile.cfg
+        # A scrape requested while the browser is still starting waits for it
+        profile.warm.wait()
+        try:
+            if self._slots_busy():
+                self.on_event(f"{label}⏳ Waiting for a free browser slot...", "info")
+            with self.browser_slots:
+                self.on_event(f"{label}🤖 Running scrape...", "info")
+                keep_browser = cfg.persistent_watcher and len(self.profiles) <= self.max_browsers
+                if not keep_browser:
+                    profile.release_browser()
+                watcher = profile.watcher_for(cfg) if keep_browser else None
+                delivery = profile.delivery_for(cfg)
+                result = single_run(cfg, return_results=True, watcher=watcher,
+                                    delivery=delivery, scheduler=profile.scheduler)
+                if not keep_browser or profile.cfg is not cfg:
+                    profile.release_browser()
+            sent, results = result if isinstance(result, tuple) else (result, [])
+            for item in results:
+                profile.results.publish(item)
+            profile.last_error = None
+            if delivery is not None:
+                profile.last_queued = sent
+                self.on_event(f"{label}✅ Scrape completed - queued {sent} messages for delivery", "success")
+            else:
+                profile.last_sent = sent
+                self.on_event(f"{label}✅ Scrape completed - sent {sent} messages", "success")
+        except Exception as e:
+            profile.last_error = str(e)
+            self.on_event(f"{label}❌ Scrape failed: {e}", "error")
+            print(f"[profiles] Profile '{profile.name}' run failed: {e}")
+        finally:
+            profile.last_run = time.time()
+            profile.next_run = profile.last_run + profile.scheduler.next_interval(cfg.search_query)
+            profile.running = False
+            if self.get(profile.name) is not profile:
+                # Removed while it was running
+                profile.release()
+
+    def _slots_busy(self) -> bool:
+        if self.browser_slots.acquire(blocking=False):
+            self.browser_slots.release()
+            return False
+        return True
+
+    def release(self, name: Optional[str] = None):
+        """Stop the browsers (and delivery workers) of one or every profile."""
+        for profile in self.all():
+            if name is None or profile.name == name:
+                profile.release()
+
+    def shutdown(self):
+        self.stopping.set()
+        for profile in self.all():
+            profile.automation = False
+            profile.results.close()
+        self.pool.shutdown(wait=False)
+        self.release()
+
+    # Persistence of the API-supplied settings
+
+    def save(self, path: str, skip=("default",)):
+        data = {p.name: p.source for p in self.all() if p.name not in skip}
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Dict[str, Any]]:
+        p = Path(path)
+        if not p.exists():
+            return {}
+        return json.loads(p.read_text(encoding="utf-8"))
@@ -0,0 +1,148 @@
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .capture import load_capture_file
+from .config import Config
+from .dedup import parse_status_id
+from .twitter import FeedCursor, TwitterWatcher
+
+FEED_KINDS = ("latest", "top", "home")
+COUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:([KMB])(?![a-z]))?", re.IGNORECASE)
+COUNT_MULTIPLIERS = {"k": 1e3, "m": 1e6, "b": 1e9}
+
+
+def _parse_count(label: str) -> int:
+    """Python twin of the serializer's parseCount ("1.2K Likes" -> 1200)."""
+    m = COUNT_RE.search((label or "").replace(",", ""))
+    if not m:
+        return 0
+    return round(float(m.group(1)) * COUNT_MULTIPLIERS.get((m.group(2) or "").lower(), 1))
+
+
+def parse_timeline_html(html: str) -> List[Dict[str, Any]]:
+    """Parse a saved timeline page the way TWEET_SERIALIZER_JS reads the live DOM."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    tweets = []
+    for art in soup.select('article[data-testid="tweet"]'):
+        time_el = art.find("time")
+        link = time_el.find_parent("a", href=re.compile(r"/status/")) if time_el else None
+        link = link or art.find("a", href=re.compile(r"/status/"))
+        href = link["href"].split("?")[0] if link else ""
+        if href.startswith("/"):
+            href = "https://x.com" + href
+        sid = parse_status_id(href)
+        if sid is None:
+            continue
+
+        username, handle = "Unknown User", ""
+        name_box = art.select_one('[data-testid="User-Name"]')
+        if name_box:
+            spans = [t for t in (s.get_text().strip() for s in name_box.find_all("span")) if t and t != "·"]
+            handle = next((t for t in spans if t.startswith("@")), "")
+            username = next((t for t in spans if not t.startswith("@")), username)
+        if not handle:
+            hm = re.search(r"/([^/]+)/status/", href)
+            handle = f"@{hm.group(1)}" if hm else ""
+
+        def count_of(*testids):
+            for testid in testids:
+                btn = art.select_one(f'[data-testid="{testid}"]')
+                if btn:
+                    return _parse_count(btn.get("aria-label") or btn.get_text())
+            return 0
+
+        text_el = art.select_one('div[data-testid="tweetText"]')
+        tweets.append({
+            "id": str(sid),
+            "text": text_el.get_text() if text_el else "",
+            "username": username,
+            "handle": handle,
+            "timestamp": (time_el.get("datetime") or time_el.get("title") or time_el.get_text()) if time_el else "Unknown Time",
+            "post_url": href,
+            "likes": count_of("like", "unlike"),
+            "comments": count_of("reply"),
+            "reposts": count_of("retweet", "unretweet"),
+        })
+    return tweets
+
+
+def load_fixture(path: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Tweets from a saved timeline: .html pages or GraphQL JSON/JSONL captures."""
+    if Path(path).suffix.lower() in (".html", ".htm"):
+        return parse_timeline_html(Path(path).read_text(encoding="utf-8"))
+    return load_capture_file(path, kind)
+
+
+def load_fixtures(fixtures: Union[str, Dict[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Map each feed kind to its recorded timeline.
+
+    `fixtures` is either {kind: path}, a directory holding files named after
+    the kinds (latest.jsonl, top.html, ...), or a single capture file whose
+    records carry their own kind.
+    """
+    if isinstance(fixtures, dict):
+        return {kind: load_fixture(path, kind) for kind, path in fixtures.items()}
+    p = Path(fixtures)
+    if p.is_dir():
+        timelines = {}
+        for f in sorted(p.iterdir()):
+            if f.stem in FEED_KINDS and f.suffix.lower() in (".html", ".htm", ".json", ".jsonl"):
+                timelines[f.stem] = load_fixture(str(f), f.stem)
+        return timelines
+    return {kind: load_fixture(str(p), kind) for kind in FEED_KINDS}
+
+
+class ReplayWatcher(TwitterWatcher):
+    """Offline stand-in for TwitterWatcher that serves recorded timelines.
+
+    No browser is started: each feed's cursor pages through its fixture in
+    `page_size` steps, going through the same watermark and de-duplication
+    logic as a live scroll, so single_run, filter_matches and the benchmarks
+    can run without an X session.
+    """
+
+    def __init__(self, cfg: Config, fixtures: Union[str, Dict[str, str], Dict[str, List[Dict[str, Any]]]],
+                 page_size: int = 20):
+        super().__init__(cfg)
+        if isinstance(fixtures, dict) and all(isinstance(v, list) for v in fixtures.values()):
+            self.timelines = fixtures
+        else:
+            self.timelines = load_fixtures(fixtures)
+        self.page_size = page_size
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def open_search(self):
+        pass
+
+    def ensure_ready(self):
+        pass
+
+    def is_healthy(self) -> bool:
+        return True
+
+    def _collect_feeds(self, cursors: List[FeedCursor]):
+        for cursor in cursors:
+            self._replay(cursor, self.timelines.get(cursor.feed["kind"]) or [])
+
+    def collect_tweets(self, max_count: int = 40, watermark: Optional[int] = None) -> List[Dict[str, Any]]:
+        cursor = FeedCursor(max_count, watermark)
+        self._replay(cursor, self.timelines.get("latest") or [])
+        return cursor.results
+
+    def _replay(self, cursor: FeedCursor, timeline: List[Dict[str, Any]]):
+        pos = 0
+        while not cursor.done and pos < len(timeline):
+            # Copies, as the index tags records with their feeds
+            page = [dict(t) for t in timeline[pos:pos + self.page_size]]
+            pos += len(page)
+            cursor.scroll_attempts += 1
+            if self._accept_batch(cursor, page, []) or len(cursor.results) >= cursor.max_count:
+                cursor.done = True
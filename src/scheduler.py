@@ -0,0 +1,139 @@
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from .config import Config
+from .dedup import tweet_posted_at
+
+COUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*([KMB])?", re.IGNORECASE)
+COUNT_MULTIPLIERS = {"k": 1e3, "m": 1e6, "b": 1e9}
+YIELD_SMOOTHING = 0.3  # weight of the latest cycle in the moving averages
+
+
+def _count(value: Any) -> float:
+    """Reaction count from an int or a label such as "1.2K"."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = COUNT_RE.search(str(value or "").replace(",", ""))
+    if not m:
+        return 0.0
+    return float(m.group(1)) * COUNT_MULTIPLIERS.get((m.group(2) or "").lower(), 1)
+
+
+def tweet_velocity(item: Dict[str, Any], now: Optional[float] = None) -> float:
+    """Likes + replies + reposts per minute since the tweet was posted (0 if unknown)."""
+    posted = tweet_posted_at(item)
+    if posted is None:
+        return 0.0
+    age_min = max(1.0, ((now or time.time()) - posted) / 60)
+    reactions = sum(_count(item.get(k)) for k in ("likes", "comments", "reposts"))
+    return reactions / age_min
+
+
+class QueryStats:
+    """Running yield of one search query."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.cycles = 0
+        self.hot_cycles = 0
+        self.quiet_streak = 0
+        self.tweets = 0
+        self.new_items = 0
+        self.new_mints = 0
+        self.avg_new_items = 0.0
+        self.avg_tweets = 0.0
+        self.last_cycle_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "interval_sec": round(self.interval, 1),
+            "cycles": self.cycles,
+            "hot_cycles": self.hot_cycles,
+            "quiet_streak": self.quiet_streak,
+            "tweets": self.tweets,
+            "new_items": self.new_items,
+            "new_mints": self.new_mints,
+            "avg_new_items": round(self.avg_new_items, 2),
+            "avg_tweets": round(self.avg_tweets, 1),
+            "last_cycle_at": self.last_cycle_at,
+        }
+
+
+class AdaptiveScheduler:
+    """Picks the pause before the next scrape from what recent cycles yielded.
+
+    A cycle is "hot" when it found new mints or a newly found tweet gathers
+    reactions faster than `adaptive_velocity_threshold` per minute; the
+    interval then shrinks by `adaptive_speedup`. A cycle without new items
+    grows it by `adaptive_backoff`, and one in between drifts it back toward
+    `run_interval_sec`. The result always stays within
+    `min_interval_sec`..`max_interval_sec`. Stats are kept per search query.
+    Only new items count toward velocity: Top and Home return the same popular
+    tweets every cycle, and those must not keep the interval at the floor.
+    """
+
+    def __init__(self, cfg: Config):
+        self.cfg = cfg
+        self.stats: Dict[str, QueryStats] = {}
+        self.lock = threading.Lock()
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.cfg.min_interval_sec), self.cfg.max_interval_sec)
+
+    def _stats_for(self, query: str) -> QueryStats:
+        stats = self.stats.get(query)
+        if stats is None:
+            stats = self.stats[query] = QueryStats(self._clamp(self.cfg.run_interval_sec))
+        return stats
+
+    def record(self, query: str, tweets: int, new_items: Iterable[Dict[str, Any]]) -> float:
+        """Account for one finished cycle; returns the query's new base interval."""
+        new_items = list(new_items)
+        new_mints = sum(len(item.get("mints") or []) for item in new_items)
+        now = time.time()
+        fastest = max((tweet_velocity(item, now) for item in new_items), default=0.0)
+        hot = new_mints > 0 or fastest >= self.cfg.adaptive_velocity_threshold
+
+        with self.lock:
+            stats = self._stats_for(query)
+            stats.cycles += 1
+            stats.tweets += tweets
+            stats.new_items += len(new_items)
+            stats.new_mints += new_mints
+            stats.avg_new_items += YIELD_SMOOTHING * (len(new_items) - stats.avg_new_items)
+            stats.avg_tweets += YIELD_SMOOTHING * (tweets - stats.avg_tweets)
+            stats.last_cycle_at = now
+            if not self.cfg.adaptive_schedule:
+                stats.interval = self.cfg.run_interval_sec
+            elif hot:
+                stats.hot_cycles += 1
+                stats.quiet_streak = 0
+                stats.interval = self._clamp(stats.interval * self.cfg.adaptive_speedup)
+            elif not new_items:
+                stats.quiet_streak += 1
+                stats.interval = self._clamp(stats.interval * self.cfg.adaptive_backoff)
+            else:
+                stats.quiet_streak = 0
+                stats.interval = self._clamp(stats.interval + (self.cfg.run_interval_sec - stats.interval) / 2)
+            interval = stats.interval
+
+        if self.cfg.adaptive_schedule:
+            label = "hot" if hot else "quiet" if not new_items else "steady"
+            print(f"[scheduler] '{query}' {label}: {len(new_items)} new items, {new_mints} new mints, "
+                  f"top velocity {fastest:.1f}/min -> interval {interval:.0f}s")
+        return interval
+
+    def next_interval(self, query: str) -> float:
+        """Seconds to sleep before the next cycle of `query`, with jitter."""
+        with self.lock:
+            base = self._stats_for(query).interval if self.cfg.adaptive_schedule else self.cfg.run_interval_sec
+        # Keep jitter proportional so short intervals stay short
+        jitter = min(self.cfg.jitter_sec, base * 0.1)
+        return max(self.cfg.min_interval_sec, base + random.uniform(-jitter, jitter))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return {query: stats.as_dict() for query, stats in self.stats.items()}
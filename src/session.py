@@ -1,8 +1,12 @@
 import json
+import time
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 
+# Cookies that make up an authenticated X session
+AUTH_COOKIES = ("auth_token", "ct0")
+
 
 def save_cookies(driver: WebDriver, path: str) -> None:
     p = Path(path)
@@ -11,12 +15,23 @@ def save_cookies(driver: WebDriver, path: str) -> None:
     p.write_text(json.dumps(cookies, indent=2), encoding="utf-8")
 
 
+def read_cookies(path: str) -> List[dict]:
+    p = Path(path)
+    if not p.exists():
+        return []
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return []
+
+
 def load_cookies(driver: WebDriver, path: str, domain_hint: str = ".x.com") -> bool:
     p = Path(path)
     if not p.exists():
         return False
     try:
         cookies: List[dict[str, Any]] = json.loads(p.read_text(encoding="utf-8"))
+        now = time.time()
         for c in cookies:
             # Selenium requires we're on the matching domain before adding cookies.
             # Callers should first driver.get("https://x.com") then load_cookies.
@@ -26,7 +41,28 @@ def load_cookies(driver: WebDriver, path: str, domain_hint: str = ".x.com") -> b
             # Remove expiry None to avoid type issues
             if c.get("expiry") is None:
                 c.pop("expiry", None)
+            elif c["expiry"] < now:
+                continue
             driver.add_cookie(c)
         return True
     except Exception:
         return False
+
+
+def has_auth_cookies(cookies: List[dict]) -> bool:
+    """True if every session cookie is present and not expired."""
+    now = time.time()
+    live = {c.get("name") for c in cookies if not c.get("expiry") or c["expiry"] > now}
+    return all(name in live for name in AUTH_COOKIES)
+
+
+def auth_expires_at(cookies: List[dict]) -> Optional[float]:
+    """Earliest expiry among the session cookies (None if they are session-only or absent)."""
+    expiries = [c["expiry"] for c in cookies if c.get("name") in AUTH_COOKIES and c.get("expiry")]
+    return min(expiries) if expiries else None
+
+
+def cookie_age_sec(path: str) -> Optional[float]:
+    """Seconds since the cookie file was last written (None if there is none)."""
+    p = Path(path)
+    return time.time() - p.stat().st_mtime if p.exists() else None
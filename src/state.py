@@ -1,19 +1,125 @@
 import json
+import sqlite3
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
 
 
 def load_state(path: str) -> Dict[str, Any]:
     p = Path(path)
     if not p.exists():
-        return {"last_tweet_id": None, "seen_mints": []}
+        return {"last_tweet_id": None, "seen_mints": [], "feed_watermarks": {}}
     try:
         return json.loads(p.read_text(encoding="utf-8"))
     except Exception:
-        return {"last_tweet_id": None, "seen_mints": []}
+        return {"last_tweet_id": None, "seen_mints": [], "feed_watermarks": {}}
 
 
 def save_state(path: str, state: Dict[str, Any]) -> None:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+class StateStore:
+    """SQLite-backed scraper state: seen mints and tweet ids, plus small metadata.
+
+    Membership checks hit a primary-key index and every write is committed on
+    its own, so nothing is lost if a cycle dies half-way and startup/save cost
+    does not grow with history. Entries older than `ttl_sec` are evicted by
+    `evict_expired()`. On first use, seen mints and ids from the legacy JSON
+    state file are imported.
+    """
+
+    def __init__(self, path: str, ttl_sec: int = 0, legacy_json_path: Optional[str] = None):
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.conn = sqlite3.connect(str(p), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen_mints (
+                mint TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS seen_tweets (
+                tweet_id TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_seen_mints_first_seen ON seen_mints(first_seen);
+            CREATE INDEX IF NOT EXISTS idx_seen_tweets_first_seen ON seen_tweets(first_seen);
+        """)
+        self.conn.commit()
+        if legacy_json_path and self.get_meta("migrated_from_json") is None:
+            self._import_json(legacy_json_path)
+
+    def _import_json(self, path: str):
+        legacy = load_state(path)
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_mints (mint, first_seen) VALUES (?, ?)",
+                [(m, now) for m in legacy.get("seen_mints") or []],
+            )
+            for key in ("last_tweet_id", "feed_watermarks"):
+                if legacy.get(key):
+                    self._set_meta(key, json.dumps(legacy[key]))
+            self._set_meta("migrated_from_json", json.dumps(path))
+        if legacy.get("seen_mints"):
+            print(f"[state] Imported {len(legacy['seen_mints'])} seen mints from {path}")
+
+    def close(self):
+        self.conn.close()
+
+    # Seen sets
+
+    def has_mint(self, mint: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM seen_mints WHERE mint = ?", (mint,)).fetchone() is not None
+
+    def has_tweet(self, tweet_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM seen_tweets WHERE tweet_id = ?", (tweet_id,)).fetchone() is not None
+
+    def mark_seen(self, mints: Iterable[str] = (), tweet_id: Optional[str] = None):
+        """Record mints and a tweet id as seen, committed immediately."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_mints (mint, first_seen) VALUES (?, ?)",
+                [(m, now) for m in mints],
+            )
+            if tweet_id:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO seen_tweets (tweet_id, first_seen) VALUES (?, ?)",
+                    (tweet_id, now),
+                )
+
+    def evict_expired(self) -> int:
+        """Drop seen entries older than the TTL; returns how many were removed."""
+        if self.ttl_sec <= 0:
+            return 0
+        cutoff = time.time() - self.ttl_sec
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM seen_mints WHERE first_seen < ?", (cutoff,)).rowcount
+            removed += self.conn.execute("DELETE FROM seen_tweets WHERE first_seen < ?", (cutoff,)).rowcount
+        return removed
+
+    # Metadata (last tweet id, feed watermarks)
+
+    def _set_meta(self, key: str, value: str):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key: str, value: Any):
+        with self.conn:
+            self._set_meta(key, json.dumps(value))
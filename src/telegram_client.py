@@ -1,32 +1,211 @@
-import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+from .ratelimit import TokenBucket
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+
+# Bot API limits: ~30 messages/s overall, 1/s into a private chat and
+# 20/min into a group or channel (negative ids or @channelusername).
+GLOBAL_RATE = 30.0
+PRIVATE_CHAT_RATE = 1.0
+GROUP_CHAT_RATE = 20 / 60
+MAX_MESSAGE_CHARS = 4096
+BATCH_SEPARATOR = "\n\n━━━━━━━━━━━━\n\n"
+
 
 class TelegramClient:
-    def __init__(self, bot_token: str, chat_id: str):
+    """Bot API sender on a pooled keep-alive session.
+
+    Every request passes a global and a per-chat token bucket, so throughput is
+    set by Telegram's limits rather than fixed sleeps. A 429 holds the chat's
+    bucket back for the returned retry_after; 5xx and connection errors are
+    retried with exponential backoff. Other 4xx answers (bad HTML, message too
+    long, chat not found) are permanent: they come back at once as the error
+    body, with `ok` false, rather than None. `base_url` points the client at a
+    local Bot API stub for testing.
+    """
+
+    def __init__(self, bot_token: str, chat_id: str, base_url: str = TELEGRAM_API_BASE,
+                 max_retries: int = 3, concurrency: int = 4):
         self.bot_token = bot_token
         self.chat_id = chat_id
         if not self.bot_token or not self.chat_id:
             raise ValueError("Telegram bot token or chat id missing.")
+        self.base_url = (base_url or TELEGRAM_API_BASE).rstrip("/")
+        self.max_retries = max_retries
+        self.concurrency = max(1, concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.global_bucket = TokenBucket(GLOBAL_RATE)
+        self.chat_buckets: Dict[str, TokenBucket] = {}
+        self.buckets_lock = threading.Lock()
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        with self.buckets_lock:
+            bucket = self.chat_buckets.get(chat_id)
+            if bucket is None:
+                rate = GROUP_CHAT_RATE if str(chat_id).startswith(("-", "@")) else PRIVATE_CHAT_RATE
+                bucket = self.chat_buckets[chat_id] = TokenBucket(rate, capacity=1)
+            return bucket
+
+    def _call(self, method: str, payload: dict) -> Optional[dict]:
+        """POST a Bot API method, honouring rate limits and retry_after."""
+        url = f"{self.base_url}/bot{self.bot_token}/{method}"
+        chat_bucket = self._chat_bucket(str(payload.get("chat_id", self.chat_id)))
+        attempt = 0
+        while True:
+            chat_bucket.acquire()
+            self.global_bucket.acquire()
+            started = time.monotonic()
+            try:
+                r = self.session.post(url, json=payload, timeout=20)
+            except requests.RequestException as e:
+                metrics.TELEGRAM_REQUEST_SECONDS.observe(time.monotonic() - started, method=method, status="error")
+                if attempt >= self.max_retries:
+                    print(f"[telegram] failed to send: {e}")
+                    return None
+                delay = 2 ** attempt
+                print(f"[telegram] {method} connection error, retrying in {delay}s: {e}")
+            else:
+                metrics.TELEGRAM_REQUEST_SECONDS.observe(time.monotonic() - started, method=method,
+                                                         status=str(r.status_code))
+                if r.status_code == 429:
+                    metrics.TELEGRAM_RATE_LIMITED.inc(method=method)
+                    try:
+                        retry_after = float(r.json().get("parameters", {}).get("retry_after", 2))
+                    except ValueError:
+                        retry_after = 2.0
+                    if attempt >= self.max_retries:
+                        print(f"[telegram] failed to send: rate limited (retry_after={retry_after}s)")
+                        return None
+                    print(f"[telegram] Rate limited on {method}, retrying after {retry_after}s")
+                    chat_bucket.block_for(retry_after)
+                    attempt += 1
+                    continue
+                if r.status_code >= 500 and attempt < self.max_retries:
+                    delay = 2 ** attempt
+                    print(f"[telegram] {method} returned {r.status_code}, retrying in {delay}s")
+                elif 400 <= r.status_code < 500 and r.status_code != 401:
+                    # A bad token (401) fails every message alike, so it stays retryable
+                    try:
+                        description = r.json().get("description", "")
+                    except ValueError:
+                        description = r.text[:200]
+                    print(f"[telegram] {method} rejected ({r.status_code}): {description}")
+                    return {"ok": False, "error_code": r.status_code, "description": description}
+                else:
+                    try:
+                        r.raise_for_status()
+                        return r.json()
+                    except Exception as e:
+                        print(f"[telegram] failed to send: {e}")
+                        return None
+            time.sleep(delay)
+            attempt += 1
+
+    def send_message(self, text: str, disable_web_page_preview: bool = True,
+                     chat_id: Optional[str] = None) -> Optional[dict]:
+        payload = {
+            "chat_id": chat_id or self.chat_id,
+            "text": text,
+            "disable_web_page_preview": disable_web_page_preview,
+            "parse_mode": "HTML",
+        }
+        return self._call("sendMessage", payload)
+
+    def edit_message(self, message_id: int, text: str, disable_web_page_preview: bool = True,
+                     chat_id: Optional[str] = None) -> Optional[dict]:
+        payload = {
+            "chat_id": chat_id or self.chat_id,
+            "message_id": message_id,
+            "text": text,
+            "disable_web_page_preview": disable_web_page_preview,
+            "parse_mode": "HTML",
+        }
+        return self._call("editMessageText", payload)
+
+    def send_many(self, messages: Sequence[Union[str, Tuple[str, str]]]) -> List[Optional[dict]]:
+        """Send messages, each a text or a (chat_id, text) pair.
+
+        Chats are served concurrently (up to `concurrency` at once) while the
+        messages within a chat keep their order. Results line up with the input;
+        see `is_rejected` for telling permanent failures apart.
+        """
+        results: List[Optional[dict]] = [None] * len(messages)
+        by_chat: Dict[str, List[Tuple[int, str]]] = {}
+        for i, msg in enumerate(messages):
+            chat_id, text = msg if isinstance(msg, tuple) else (self.chat_id, msg)
+            by_chat.setdefault(str(chat_id), []).append((i, text))
+
+        def send_chat(chat_id: str):
+            for i, text in by_chat[chat_id]:
+                results[i] = self.send_message(text, chat_id=chat_id)
+
+        if len(by_chat) == 1:
+            send_chat(next(iter(by_chat)))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(by_chat))) as pool:
+                list(pool.map(send_chat, by_chat))
+        return results
+
+    def close(self):
+        self.session.close()
+
+
+def is_rejected(result: Optional[dict]) -> bool:
+    """True if Telegram refused a message for good, so retrying it cannot help."""
+    return bool(result) and not result.get("ok", True)
+
+
+class MessageBatcher:
+    """Packs formatted alerts into as few messages as Telegram allows.
+
+    Items are joined with a separator up to `max_chars` and never split, so an
+    item longer than the limit goes out on its own as before. `add` returns the
+    batches that filled up; the partial batch is held until `flush`, which
+    callers do once its oldest item has waited `max_delay_sec`. Each batch is
+    (keys, text), keys being what was passed to add.
+    """
+
+    def __init__(self, max_chars: int = MAX_MESSAGE_CHARS, max_delay_sec: float = 5.0,
+                 separator: str = BATCH_SEPARATOR):
+        self.max_chars = max_chars
+        self.max_delay_sec = max_delay_sec
+        self.separator = separator
+        self.keys: List[Any] = []
+        self.texts: List[str] = []
+        self.chars = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: Any, text: str) -> List[Tuple[List[Any], str]]:
+        ready = []
+        extra = len(text) + (len(self.separator) if self.texts else 0)
+        if self.texts and self.chars + extra > self.max_chars:
+            ready.append(self.flush())
+            extra = len(text)
+        self.keys.append(key)
+        self.texts.append(text)
+        self.chars += extra
+        if self.chars >= self.max_chars:
+            ready.append(self.flush())
+        return ready
 
-    def send_message(self, text: str, disable_web_page_preview: bool = True) -> Optional[dict]:
-        try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                "chat_id": self.chat_id,
-                "text": text,
-                "disable_web_page_preview": disable_web_page_preview,
-                "parse_mode": "HTML",
-            }
-            r = requests.post(url, json=payload, timeout=20)
-            if r.status_code == 429:
-                # simple backoff
-                retry_after = r.json().get("parameters", {}).get("retry_after", 2)
-                time.sleep(retry_after + 1)
-                r = requests.post(url, json=payload, timeout=20)
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:
-            print(f"[telegram] failed to send: {e}")
+    def flush(self) -> Optional[Tuple[List[Any], str]]:
+        if not self.texts:
             return None
+        batch = (self.keys, self.separator.join(self.texts))
+        self.keys, self.texts, self.chars = [], [], 0
+        return batch
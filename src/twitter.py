@@ -1,43 +1,301 @@
 import random
+import threading
 import time
 from typing import List, Dict, Any, Optional
+from urllib.parse import quote_plus
 
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+try:
+    import psutil
+except ImportError:  # RSS-based recycling is skipped without psutil
+    psutil = None
+
 from .config import Config
 from . import session as sess
-from .detect import extract_candidates, contains_launch_phrase, has_contact_address, get_launch_phrases
+from .driver_cache import get_driver_cache
+from .capture import NetworkCapture
+from .leanfetch import LeanFetch
+from .dedup import TweetIndex, parse_status_id
+from .waits import WaitPolicy
+from .detect import get_matcher
+from . import metrics
 
 TWEET_SELECTOR = 'article[data-testid="tweet"]'
 TWEET_TEXT_SELECTOR = 'div[data-testid="tweetText"]'
 TIME_SELECTOR = 'time'
+PASSWORD_SELECTOR = 'input[name="password"], input[type="password"], input[autocomplete="current-password"]'
+EMAIL_CHECK_SELECTOR = 'input[data-testid="ocfEnterTextTextInput"]'
+# Elements that only appear when logged in
+LOGGED_IN_SELECTOR = ", ".join([
+    '[data-testid="SideNav_NewTweet_Button"]',  # Tweet button
+    '[data-testid="AppTabBar_Home_Link"]',       # Home link in sidebar
+    '[data-testid="primaryColumn"]',             # Main timeline column
+    '[data-testid="tweetTextarea_0"]',           # Tweet compose box
+    'nav[role="navigation"]',                    # Main navigation
+])
+
+# Serializes every rendered tweet article in the page. Status ids stay strings
+# because snowflake ids do not fit in a JS number.
+TWEET_SERIALIZER_JS = r"""
+const parseCount = (label) => {
+  const m = (label || '').replace(/,/g, '').match(/(\d+(?:\.\d+)?)\s*(?:([KMB])(?![a-z]))?/i);
+  if (!m) return 0;
+  const mult = {k: 1e3, m: 1e6, b: 1e9}[(m[2] || '').toLowerCase()] || 1;
+  return Math.round(parseFloat(m[1]) * mult);
+};
+const countOf = (art, testids) => {
+  for (const testid of testids) {
+    const btn = art.querySelector('[data-testid="' + testid + '"]');
+    if (btn) return parseCount(btn.getAttribute('aria-label') || btn.textContent);
+  }
+  return 0;
+};
+const statusHref = (art) => {
+  const timeEl = art.querySelector('time');
+  let link = timeEl ? timeEl.closest('a[href*="/status/"]') : null;
+  if (!link) link = art.querySelector('a[href*="/status/"]');
+  return link ? link.href.split('?')[0] : '';
+};
+const statusId = (href) => {
+  const m = href.match(/\/status\/(\d+)/);
+  return m ? m[1] : null;
+};
+const serializeTweet = (art) => {
+  const timeEl = art.querySelector('time');
+  const href = statusHref(art);
+  const id = statusId(href);
+  if (!id) return null;
+  let username = 'Unknown User';
+  let handle = '';
+  const nameBox = art.querySelector('[data-testid="User-Name"]');
+  if (nameBox) {
+    const spans = Array.from(nameBox.querySelectorAll('span'))
+      .map((el) => el.textContent.trim())
+      .filter((t) => t && t !== '·');
+    handle = spans.find((t) => t.startsWith('@')) || '';
+    username = spans.find((t) => !t.startsWith('@')) || username;
+  }
+  if (!handle) {
+    const hm = href.match(/\/([^\/]+)\/status\//);
+    if (hm) handle = '@' + hm[1];
+  }
+  const textEl = art.querySelector('div[data-testid="tweetText"]');
+  return {
+    id: id,
+    text: textEl ? textEl.innerText : '',
+    username: username,
+    handle: handle,
+    timestamp: timeEl ? (timeEl.getAttribute('datetime') || timeEl.getAttribute('title') || timeEl.textContent) : 'Unknown Time',
+    post_url: href,
+    likes: countOf(art, ['like', 'unlike']),
+    comments: countOf(art, ['reply']),
+    reposts: countOf(art, ['retweet', 'unretweet']),
+  };
+};
+"""
+
+# One round trip per scroll step: serialize the visible timeline, then scroll
+# by arguments[0] pixels (0 to stay put). Articles whose status id is in
+# arguments[1] are only reported by id instead of being serialized again.
+EXTRACT_AND_SCROLL_JS = TWEET_SERIALIZER_JS + r"""
+const seen = new Set(arguments[1] || []);
+const articles = document.querySelectorAll('article[data-testid="tweet"]');
+const tweets = [];
+const seenIds = [];
+for (const art of articles) {
+  try {
+    const id = statusId(statusHref(art));
+    if (!id) continue;
+    if (seen.has(id)) {
+      seenIds.push(id);
+      continue;
+    }
+    const t = serializeTweet(art);
+    if (t) tweets.push(t);
+  } catch (e) {}
+}
+const last = articles.length ? articles[articles.length - 1].querySelector('a[href*="/status/"]') : null;
+const height = document.body.scrollHeight;
+if (arguments[0]) window.scrollBy(0, arguments[0]);
+return {count: articles.length, tweets: tweets, seen: seenIds, height: height, last: last ? last.getAttribute('href') : null};
+"""
+
+# Observer mode: a MutationObserver (installed once per page load) serializes
+# each tweet article as soon as X inserts it, before the virtualized timeline
+# can recycle it. Each step drains that in-page buffer, then scrolls by
+# arguments[0] pixels. An article is serialized once both its text and its
+# time have rendered; one that shows a time but no text (media-only) goes out
+# after a short grace period, or when X recycles it before then.
+OBSERVE_AND_SCROLL_JS = TWEET_SERIALIZER_JS + r"""
+const ARTICLE = 'article[data-testid="tweet"]';
+const MEDIA_ONLY_GRACE_MS = 1500;
+let h = window.__tweetHarvest;
+if (!h) {
+  // pending: article -> when it was first noticed
+  h = window.__tweetHarvest = {buffer: [], seen: new Set(), pending: new Map(), timer: null};
+  h.flush = () => {
+    h.timer = null;
+    const now = Date.now();
+    let waiting = false;
+    for (const [art, since] of Array.from(h.pending)) {
+      try {
+        const id = statusId(statusHref(art));
+        if (id && h.seen.has(id)) { h.pending.delete(art); continue; }
+        const hasTime = !!art.querySelector('time');
+        const hasText = !!art.querySelector('div[data-testid="tweetText"]');
+        const ready = id && hasTime && (hasText || !art.isConnected || now - since >= MEDIA_ONLY_GRACE_MS);
+        if (!ready) {
+          if (!art.isConnected) h.pending.delete(art);
+          else if (id && hasTime) waiting = true;
+          continue;
+        }
+        const t = serializeTweet(art);
+        h.pending.delete(art);
+        if (t) { h.seen.add(id); h.buffer.push(t); }
+      } catch (e) { h.pending.delete(art); }
+    }
+    // Text-less articles are rechecked once their grace period is over
+    if (waiting && !h.timer) h.timer = setTimeout(h.flush, MEDIA_ONLY_GRACE_MS);
+  };
+  const track = (art) => { if (!h.pending.has(art)) h.pending.set(art, Date.now()); };
+  const collect = (node) => {
+    if (node.nodeType === 3) node = node.parentElement;
+    if (!node || node.nodeType !== 1) return;
+    const art = node.closest(ARTICLE);
+    if (art) track(art);
+    else node.querySelectorAll(ARTICLE).forEach(track);
+  };
+  new MutationObserver((mutations) => {
+    for (const m of mutations) {
+      collect(m.target);
+      m.addedNodes.forEach(collect);
+    }
+    if (h.pending.size && !h.timer) h.timer = setTimeout(h.flush, 50);
+  }).observe(document.body, {childList: true, subtree: true, characterData: true});
+  document.querySelectorAll(ARTICLE).forEach(track);
+}
+h.flush();
+const tweets = h.buffer.splice(0, h.buffer.length);
+const articles = document.querySelectorAll(ARTICLE);
+const last = articles.length ? articles[articles.length - 1].querySelector('a[href*="/status/"]') : null;
+const height = document.body.scrollHeight;
+if (arguments[0]) window.scrollBy(0, arguments[0]);
+return {count: articles.length, tweets: tweets, height: height, last: last ? last.getAttribute('href') : null};
+"""
+
+# Scroll step for the network backend, which takes tweets from the captured
+# timeline responses instead of the DOM.
+SCROLL_ONLY_JS = r"""
+const articles = document.querySelectorAll('article[data-testid="tweet"]');
+const last = articles.length ? articles[articles.length - 1].querySelector('a[href*="/status/"]') : null;
+const height = document.body.scrollHeight;
+if (arguments[0]) window.scrollBy(0, arguments[0]);
+return {count: articles.length, tweets: [], height: height, last: last ? last.getAttribute('href') : null};
+"""
+
+# Permalink of the last rendered article; changes once a scroll has rendered more
+LAST_RENDERED_JS = r"""
+const articles = document.querySelectorAll('article[data-testid="tweet"]');
+const last = articles.length ? articles[articles.length - 1].querySelector('a[href*="/status/"]') : null;
+return last ? last.getAttribute('href') : null;
+"""
+
+TWEETS_PRESENT_JS = "return document.querySelector('article[data-testid=\"tweet\"]') !== null;"
+
+# Per-feed scroll limits
+MAX_SCROLL_ATTEMPTS = 15
+MAX_STALL_RETRIES = 8
+MAX_REFRESH_ATTEMPTS = 3
+FEED_LOAD_TIMEOUT = 20  # seconds for a feed's first tweets to render
+SCROLL_SETTLE_TIMEOUT = 2.5  # seconds for a scroll to render more tweets
+MIN_ROUND_SECONDS = 1.0  # concurrent mode: minimum time between a tab's steps
+
+def build_feeds(search_query: str) -> List[Dict[str, Any]]:
+    """The feeds collected each cycle: Latest and Top search results, and Home."""
+    encoded_query = quote_plus(search_query)
+    return [
+        {
+            "name": "Latest/Live Feed", 
+            "url": f"https://x.com/search?q={encoded_query}&f=live",
+            "description": "Most recent tweets with your search query",
+            "kind": "latest",
+            "chronological": True,
+        },
+        {
+            "name": "Top Feed", 
+            "url": f"https://x.com/search?q={encoded_query}",
+            "description": "Popular/trending tweets with your search query",
+            "kind": "top",
+            "chronological": False,
+        },
+        {
+            "name": "Homepage Feed", 
+            "url": "https://x.com/home",
+            "description": "Your personalized timeline",
+            "kind": "home",
+            "chronological": False,
+        }
+    ]
+
+
+def feed_key(feed: Dict[str, Any], search_query: str) -> str:
+    """State key for a feed's watermark; search feeds are scoped to the query."""
+    if feed.get("kind") == "home":
+        return "home"
+    return f"{feed['kind']}:{search_query}"
+
+
+class FeedCursor:
+    """Collection progress of one feed, advanced one scroll step at a time."""
+
+    def __init__(self, max_count: int, watermark: Optional[int] = None,
+                 feed: Optional[Dict[str, Any]] = None, key: str = "", handle: Optional[str] = None,
+                 index: Optional[TweetIndex] = None):
+        self.max_count = max_count
+        self.watermark = watermark
+        self.feed = feed
+        self.key = key
+        self.handle = handle  # window handle of the feed's tab in concurrent mode
+        self.index = index if index is not None else TweetIndex()
+        self.results: List[Dict[str, Any]] = []
+        self.last_height = 0
+        self.last_rendered: Optional[str] = None
+        self.retries = 0
+        self.scroll_attempts = 0
+        self.refresh_attempts = 0
+        self.loaded = False
+        self.opened_at = time.time()
+        self.done = max_count <= 0
 
 
 class TwitterWatcher:
     def __init__(self, cfg: Config):
         self.cfg = cfg
         self.driver = None
+        self.capture: Optional[NetworkCapture] = None
+        self.lean: Optional[LeanFetch] = None
+        self.waits = WaitPolicy(cfg)
+        # Persistent-mode bookkeeping, reset whenever the driver is rebuilt
+        self.cycles = 0
+        self.baseline_rss_mb: Optional[float] = None
+        # A pre-warm and a scrape may both try to launch the browser
+        self.start_lock = threading.RLock()
 
-    def _build_driver(self):
-        print("[twitter] Building Chrome driver...")
-        import os  # Import os at the beginning
+    def _chrome_options(self, chrome_binary: Optional[str], perf_log: bool) -> "uc.ChromeOptions":
+        """Full launch options; uc.Chrome consumes them, so each launch needs a new set."""
+        import os
         opts = uc.ChromeOptions()
-        
-        # Specify Chrome binary path explicitly
-        chrome_binary = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
-        if os.path.exists(chrome_binary):
+        if chrome_binary:
             opts.binary_location = chrome_binary
-            print(f"[twitter] Using Chrome binary: {chrome_binary}")
-        
+
         # Use persistent user data directory to maintain sessions
         os.makedirs(self.cfg.user_data_dir, exist_ok=True)
         opts.add_argument(f"--user-data-dir={os.path.abspath(self.cfg.user_data_dir)}")
-        print(f"[twitter] Using user data directory: {os.path.abspath(self.cfg.user_data_dir)}")
         
         # Cloud-friendly options
         opts.add_argument("--no-sandbox")
@@ -76,20 +334,66 @@ class TwitterWatcher:
             # Default user agent for Windows
             opts.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
             
+        if perf_log:
+            opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return opts
+
+    def _launch_chrome(self, opts: "uc.ChromeOptions", driver_kwargs: Dict[str, Any]):
+        driver = uc.Chrome(options=opts, **driver_kwargs)
+        # Set more reasonable timeouts
+        driver.set_page_load_timeout(30)  # Reduced from default
+        # Probes use find_elements and condition waits; see WaitPolicy
+        driver.implicitly_wait(self.cfg.implicit_wait)
+        self.driver = driver
+        print("[twitter] Chrome driver ready with persistent session.")
+
+    def _build_driver(self):
+        print("[twitter] Building Chrome driver...")
+        build_started = time.monotonic()
+        import os  # Import os at the beginning
+
+        # Specify Chrome binary path explicitly
+        chrome_binary = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
+        if os.path.exists(chrome_binary):
+            print(f"[twitter] Using Chrome binary: {chrome_binary}")
+        else:
+            chrome_binary = None
+        print(f"[twitter] Using user data directory: {os.path.abspath(self.cfg.user_data_dir)}")
+
+        # Network capture reads timeline responses from the performance log,
+        # lean fetch counts the requests it blocked there
+        capture_enabled = self.cfg.capture_backend == "network"
+        perf_log = capture_enabled or bool(self.cfg.blocked_resources)
+        opts = self._chrome_options(chrome_binary, perf_log)
+
+        # Reuse the driver already patched for this Chrome version
+        cache = get_driver_cache(self.cfg.driver_cache_dir, chrome_binary) if self.cfg.driver_cache_dir else None
+        driver_kwargs = cache.launch_kwargs() if cache else {}
+        cache_state = "hit" if "driver_executable_path" in driver_kwargs else "miss" if cache else "off"
+            
         try:
-            self.driver = uc.Chrome(options=opts)
-            # Set more reasonable timeouts
-            self.driver.set_page_load_timeout(30)  # Reduced from default
-            self.driver.implicitly_wait(self.cfg.implicit_wait)
-            print("[twitter] Chrome driver ready with persistent session.")
+            self._launch_chrome(opts, driver_kwargs)
         except Exception as e:
             print(f"[twitter] Failed to create Chrome driver: {e}")
+            if cache_state == "hit":
+                # The cached binary may not match a just-updated Chrome: retry
+                # the full launch once with a freshly patched driver
+                print("[twitter] Dropping cached chromedriver and retrying.")
+                cache.invalidate()
+                cache_state = "miss"
+                try:
+                    self._launch_chrome(self._chrome_options(chrome_binary, perf_log), cache.launch_kwargs())
+                except Exception as retry_error:
+                    print(f"[twitter] Retry without the cached chromedriver failed: {retry_error}")
+        if self.driver is None:
             # Try with simpler options as fallback
             opts = uc.ChromeOptions()
             opts.add_argument("--no-sandbox")
             opts.add_argument("--disable-dev-shm-usage")
             if chrome_binary and os.path.exists(chrome_binary):
                 opts.binary_location = chrome_binary
+            if perf_log:
+                opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
             try:
                 self.driver = uc.Chrome(options=opts)
                 self.driver.set_page_load_timeout(30)
@@ -97,26 +401,185 @@ class TwitterWatcher:
             except Exception as fallback_error:
                 print(f"[twitter] Fallback Chrome driver creation also failed: {fallback_error}")
                 raise
+        if cache is not None and cache_state == "miss":
+            try:
+                if cache.store(self.driver):
+                    print(f"[twitter] Cached patched chromedriver for Chrome {cache.version}.")
+            except OSError as e:
+                print(f"[twitter] Could not cache chromedriver: {e}")
+        build_secs = time.monotonic() - build_started
+        metrics.DRIVER_BUILD_SECONDS.observe(build_secs, cache=cache_state)
+        print(f"[twitter] Driver built in {build_secs:.1f}s (driver cache {cache_state}).")
+        
+        if capture_enabled:
+            self.capture = NetworkCapture(self.driver, self.cfg.capture_dump_path)
+            print("[twitter] Network capture backend enabled.")
+        if self.cfg.blocked_resources:
+            self.lean = LeanFetch(self.driver, self.cfg.blocked_resources)
+            self.lean.apply()
+            if self.capture is not None:
+                self.capture.observers.append(self.lean.observe)
+            print(f"[twitter] Lean fetch: blocking {', '.join(self.cfg.blocked_resources)}.")
 
     def _jitter(self, a=0.5, b=1.4):
-        time.sleep(random.uniform(a, b))
+        self.waits.jitter(a, b)
 
     def start(self):
         print("[twitter] Starting watcher...")
         if self.driver is None:
             self._build_driver()
+            self.cycles = 0
+            self.baseline_rss_mb = None
 
     def stop(self):
         print("[twitter] Stopping watcher...")
         try:
             if self.driver:
                 self.driver.quit()
+        except Exception as e:
+            print(f"[twitter] Error while quitting driver: {e}")
         finally:
             self.driver = None
+            self.capture = None
+            self.lean = None
+
+    def is_healthy(self) -> bool:
+        """Cheap liveness probe: a single round trip to the browser."""
+        if self.driver is None:
+            return False
+        try:
+            self.driver.execute_script("return 1;")
+            return True
+        except Exception as e:
+            print(f"[twitter] Health check failed: {e}")
+            return False
+
+    def browser_rss_mb(self) -> Optional[float]:
+        """Resident memory of the Chrome process tree, or None if unavailable."""
+        if psutil is None or self.driver is None:
+            return None
+        pid = getattr(self.driver, "browser_pid", None)
+        if not pid:
+            return None
+        try:
+            root = psutil.Process(pid)
+            total = 0
+            for proc in [root] + root.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def _recycle_reason(self) -> Optional[str]:
+        """Return why the live driver should be rebuilt, or None to keep it."""
+        if self.driver is None:
+            return None
+        if not self.is_healthy():
+            return "driver is not responding"
+        max_cycles = self.cfg.watcher_max_cycles
+        if max_cycles > 0 and self.cycles >= max_cycles:
+            return f"reached {self.cycles} cycles"
+        max_growth = self.cfg.watcher_max_rss_growth_mb
+        if max_growth > 0 and self.baseline_rss_mb is not None:
+            rss = self.browser_rss_mb()
+            if rss is not None and rss - self.baseline_rss_mb > max_growth:
+                return f"RSS grew from {self.baseline_rss_mb:.0f}MB to {rss:.0f}MB"
+        return None
+
+    def ensure_ready(self):
+        """Prepare the watcher for a cycle, reusing the live browser when possible.
+
+        The driver is only (re)built and put through the login check when there
+        is none yet, it failed its health check, or it hit a recycle limit.
+        """
+        reason = self._recycle_reason()
+        if reason:
+            print(f"[twitter] Recycling Chrome driver: {reason}")
+            self.stop()
+        if self.driver is None:
+            self.warm_up()
+        else:
+            print(f"[twitter] Reusing live Chrome driver (cycle {self.cycles + 1}).")
+            self._refresh_session_cookies()
+        self.cycles += 1
+
+    def warm_up(self):
+        """Launch the browser and log in, ahead of the first cycle if called early."""
+        with self.start_lock:
+            if self.driver is not None:
+                return
+            self.start()
+            self.open_search()
+            self.baseline_rss_mb = self.browser_rss_mb()
+
+    def _bootstrap_session(self) -> bool:
+        """Inject the saved cookie jar when the browser has no session of its own.
+
+        Cookies can only be added for the domain that is loaded, so a tiny
+        x.com page is opened first. Returns True if cookies were injected.
+        """
+        saved = sess.read_cookies(self.cfg.cookies_path)
+        if not sess.has_auth_cookies(saved):
+            return False
+        try:
+            self.driver.get("https://x.com/robots.txt")
+            if sess.has_auth_cookies(self.driver.get_cookies()):
+                return False  # the Chrome profile is still logged in
+            if sess.load_cookies(self.driver, self.cfg.cookies_path):
+                age = sess.cookie_age_sec(self.cfg.cookies_path) or 0
+                print(f"[twitter] Injected saved session cookies ({age / 3600:.1f}h old).")
+                return True
+        except Exception as e:
+            print(f"[twitter] Could not inject saved cookies: {e}")
+        return False
+
+    def _refresh_session_cookies(self):
+        """Keep the saved cookie jar fresh while a live session is reused.
+
+        Once the jar is older than `cookie_refresh_sec` the browser's cookies
+        (X rotates ct0) are written back. If the session cookies expire within
+        `cookie_expiry_margin_sec`, the login flow runs now rather than
+        failing a cold start later; if it fails, the old (still valid)
+        session is put back.
+        """
+        age = sess.cookie_age_sec(self.cfg.cookies_path)
+        if age is not None and age < self.cfg.cookie_refresh_sec:
+            return
+        try:
+            cookies = self.driver.get_cookies()
+            if not sess.has_auth_cookies(cookies):
+                return
+            expires = sess.auth_expires_at(cookies)
+            if expires is not None and expires - time.time() < self.cfg.cookie_expiry_margin_sec:
+                print(f"[twitter] Session cookies expire in {(expires - time.time()) / 3600:.0f}h; logging in again...")
+                # Keep the working session on disk in case the new login fails
+                sess.save_cookies(self.driver, self.cfg.cookies_path)
+                # The login flow only renders for a logged-out browser
+                for name in sess.AUTH_COOKIES:
+                    self.driver.delete_cookie(name)
+                try:
+                    self._execute_login_script()
+                    relogged = sess.has_auth_cookies(self.driver.get_cookies())
+                except Exception as e:
+                    print(f"[twitter] Re-login failed: {e}")
+                    relogged = False
+                if not relogged:
+                    self.driver.get("https://x.com/robots.txt")
+                    sess.load_cookies(self.driver, self.cfg.cookies_path)
+                    print("[twitter] Restored the existing session; will retry the re-login later.")
+                    return
+            sess.save_cookies(self.driver, self.cfg.cookies_path)
+            print("[twitter] Refreshed saved cookies.")
+        except Exception as e:
+            print(f"[twitter] Cookie refresh error: {e}")
 
     def open_search(self):
         assert self.driver is not None
         print("[twitter] Checking if already logged in...")
+        injected = self._bootstrap_session()
         
         # Try to navigate to Twitter with retry logic
         max_retries = 3
@@ -135,27 +598,21 @@ class TwitterWatcher:
                         # Last resort: try with a shorter timeout
                         self.driver.set_page_load_timeout(15)
                         self.driver.get("https://x.com")
-                        time.sleep(5)
                         print("[twitter] Loaded basic Twitter page as fallback")
                     except Exception as final_error:
                         print(f"[twitter] Final attempt also failed: {final_error}")
                         raise
                 else:
-                    time.sleep(3)  # Wait before retry
-        
-        time.sleep(3)
+                    self.waits.pause(3, "retry backoff")  # Wait before retry
         
         # Check if we're already logged in by looking for home page elements
         if self._is_logged_in():
-            print("[twitter] Already logged in! Skipping login process.")
+            print("[twitter] Already logged in! Skipping login process."
+                  + (" (restored from saved cookies)" if injected else ""))
         else:
             print("[twitter] Not logged in, starting login process...")
             self._execute_login_script()
         
-        # Wait 20 seconds as requested before search
-        print("[twitter] Waiting 20 seconds before performing search...")
-        time.sleep(20)
-
         # Generate search URL dynamically from search query instead of using cached URL
         search_query = self.cfg.search_query
         from urllib.parse import quote_plus
@@ -173,8 +630,10 @@ class TwitterWatcher:
             
             self.driver.get(dynamic_search_url)
             try:
-                WebDriverWait(self.driver, self.cfg.explicit_wait).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, TWEET_SELECTOR))
+                self.waits.until(
+                    self.driver,
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, TWEET_SELECTOR)),
+                    self.cfg.explicit_wait, "search load",
                 )
                 print("[twitter] Search page loaded successfully.")
                 break  # Success, exit the retry loop
@@ -183,48 +642,66 @@ class TwitterWatcher:
                 print(f"[twitter] Timeout waiting for tweets to appear (attempt {search_load_attempts})")
                 if search_load_attempts < max_search_load_attempts:
                     print("[twitter] Retrying search page load...")
-                    time.sleep(3)  # Wait before retry
+                    self.waits.pause(3, "retry backoff")  # Wait before retry
                 else:
                     print("[twitter] Failed to load search page after all attempts.")
         
-        # Save cookies opportunistically
+        # Save cookies opportunistically (never overwrite a good jar with a logged-out one)
         try:
-            sess.save_cookies(self.driver, self.cfg.cookies_path)
-            print("[twitter] Cookies saved.")
+            if sess.has_auth_cookies(self.driver.get_cookies()):
+                sess.save_cookies(self.driver, self.cfg.cookies_path)
+                print("[twitter] Cookies saved.")
         except Exception as e:
             print(f"[twitter] Cookie save error: {e}")
 
     def _is_logged_in(self) -> bool:
-        """Check if we're already logged in by looking for home page indicators"""
-        try:
-            # Look for elements that only appear when logged in
-            logged_in_indicators = [
-                '[data-testid="SideNav_NewTweet_Button"]',  # Tweet button
-                '[data-testid="AppTabBar_Home_Link"]',       # Home link in sidebar
-                '[data-testid="primaryColumn"]',             # Main timeline column
-                '[data-testid="tweetTextarea_0"]',           # Tweet compose box
-                'nav[role="navigation"]'                     # Main navigation
-            ]
-            
-            for selector in logged_in_indicators:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    print(f"[twitter] Found logged-in indicator: {selector}")
-                    return True
-                    
-            # Also check URL - if we're redirected to login, we're not logged in
-            current_url = self.driver.current_url
+        """Check if we're already logged in by looking for home page indicators
+
+        Waits until either an indicator renders or X redirects to the login
+        flow, rather than sleeping first and probing each selector in turn.
+        """
+        def settled(driver):
+            if driver.find_elements(By.CSS_SELECTOR, LOGGED_IN_SELECTOR):
+                return "logged_in"
+            # If we're redirected to login, we're not logged in
+            current_url = driver.current_url
             if "login" in current_url or "flow" in current_url:
-                print(f"[twitter] Login required - current URL: {current_url}")
+                return "login"
+            return False
+        
+        started = time.monotonic()
+        try:
+            # No session cookie means no session: skip waiting for the page
+            if "x.com" in self.driver.current_url and not sess.has_auth_cookies(self.driver.get_cookies()):
+                print("[twitter] No session cookies in the browser.")
+                metrics.LOGIN_PROBE_SECONDS.observe(time.monotonic() - started, result="no_cookies")
+                return False
+            state = self.waits.poll(self.driver, settled, self.cfg.explicit_wait, "login probe")
+            metrics.LOGIN_PROBE_SECONDS.observe(time.monotonic() - started, result=state or "unknown")
+            if state == "logged_in":
+                print("[twitter] Found logged-in indicator.")
+                return True
+            if state == "login":
+                print(f"[twitter] Login required - current URL: {self.driver.current_url}")
                 return False
-                
             print("[twitter] No logged-in indicators found")
             return False
             
         except Exception as e:
             print(f"[twitter] Error checking login status: {e}")
+            metrics.LOGIN_PROBE_SECONDS.observe(time.monotonic() - started, result="error")
             return False
 
+    def _wait_for_login_complete(self):
+        """Wait for the post-login redirect instead of a fixed sleep."""
+        done = self.waits.poll(
+            self.driver,
+            lambda d: d.find_elements(By.CSS_SELECTOR, LOGGED_IN_SELECTOR) or "/home" in d.current_url,
+            self.cfg.explicit_wait, "login",
+        )
+        if not done:
+            print("[twitter] Logged-in page did not appear in time.")
+
     def _execute_login_script(self):
         """Execute the login.py logic using the current driver"""
         print("[twitter] Executing login.py approach...")
@@ -232,59 +709,49 @@ class TwitterWatcher:
             url = "https://x.com/i/flow/login"
             self.driver.get(url)
             print(f"[twitter] Navigated to {url}")
-            time.sleep(3)  # Give page time to load
 
             # Step 1: Enter username
-            username = WebDriverWait(self.driver, 20).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, 'input[autocomplete="username"]'))
+            username = self.waits.until(
+                self.driver,
+                EC.visibility_of_element_located((By.CSS_SELECTOR, 'input[autocomplete="username"]')),
+                20, "login",
             )
             username.send_keys(self.cfg.twitter_username)
             username.send_keys(Keys.ENTER)
             print("[twitter] Username entered and submitted.")
-            time.sleep(5)  # Wait longer for next page to load
 
             # Step 2: Check if email verification is needed
             print(f"[twitter] Current URL after username: {self.driver.current_url}")
             
-            # Check for email verification field first
-            try:
-                # Look for email verification input
-                email_input = WebDriverWait(self.driver, 5).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, 'input[data-testid="ocfEnterTextTextInput"]'))
-                )
+            # Wait for whichever step X shows next: email verification or password
+            def next_step(driver):
+                if driver.find_elements(By.CSS_SELECTOR, EMAIL_CHECK_SELECTOR):
+                    return "email"
+                if driver.find_elements(By.CSS_SELECTOR, PASSWORD_SELECTOR):
+                    return "password"
+                return False
+            
+            step = self.waits.poll(self.driver, next_step, 20, "login")
+            if step == "email":
+                email_input = self.driver.find_element(By.CSS_SELECTOR, EMAIL_CHECK_SELECTOR)
                 print("[twitter] Email verification step detected.")
                 
                 if self.cfg.twitter_email:
                     email_input.send_keys(self.cfg.twitter_email)
                     email_input.send_keys(Keys.ENTER)
                     print("[twitter] Email entered for verification.")
-                    time.sleep(5)  # Wait for verification
                 else:
                     print("[twitter] ERROR: Email verification required but TWITTER_EMAIL not configured!")
                     raise Exception("Email verification required but TWITTER_EMAIL not set in config")
-                    
-            except TimeoutException:
+            else:
                 print("[twitter] No email verification required, proceeding to password.")
             
-            # Step 3: Enter password - try multiple selectors
-            password_selectors = [
-                'input[name="password"]',
-                'input[type="password"]',
-                'input[autocomplete="current-password"]'
-            ]
-            
-            password = None
-            for selector in password_selectors:
-                try:
-                    print(f"[twitter] Trying password selector: {selector}")
-                    password = WebDriverWait(self.driver, 15).until(
-                        EC.visibility_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"[twitter] Found password field with selector: {selector}")
-                    break
-                except TimeoutException:
-                    print(f"[twitter] Password selector {selector} not found, trying next...")
-                    continue
+            # Step 3: Find the password field (any of the known selectors)
+            password = self.waits.poll(
+                self.driver,
+                EC.visibility_of_element_located((By.CSS_SELECTOR, PASSWORD_SELECTOR)),
+                20, "login",
+            )
                     
             if not password:
                 # Take a screenshot for debugging
@@ -299,7 +766,7 @@ class TwitterWatcher:
             password.send_keys(self.cfg.twitter_password)
             password.send_keys(Keys.ENTER)
             print("[twitter] Password entered and submitted.")
-            time.sleep(3)
+            self._wait_for_login_complete()
 
             print("[twitter] Login script execution complete.")
             print(f"[twitter] Final URL: {self.driver.current_url}")
@@ -332,8 +799,10 @@ class TwitterWatcher:
             
             # Enter username using the better selector
             print("[twitter] Waiting for username field...")
-            username = WebDriverWait(self.driver, 20).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, 'input[autocomplete="username"]'))
+            username = self.waits.until(
+                self.driver,
+                EC.visibility_of_element_located((By.CSS_SELECTOR, 'input[autocomplete="username"]')),
+                20, "login",
             )
             username.send_keys(cfg.twitter_username)
             username.send_keys(Keys.ENTER)
@@ -341,293 +810,493 @@ class TwitterWatcher:
             
             # Enter password
             print("[twitter] Waiting for password field...")
-            password = WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, 'input[name="password"]'))
+            password = self.waits.until(
+                self.driver,
+                EC.visibility_of_element_located((By.CSS_SELECTOR, 'input[name="password"]')),
+                10, "login",
             )
             password.send_keys(cfg.twitter_password)
             password.send_keys(Keys.ENTER)
             print("[twitter] Password entered and submitted.")
             
-            # Wait 20 seconds for login to complete as requested
-            print("[twitter] Waiting 20 seconds for login to complete...")
-            time.sleep(20)
+            print("[twitter] Waiting for login to complete...")
+            self._wait_for_login_complete()
             print(f"[twitter] Login complete. Current URL: {self.driver.current_url}")
             
         except Exception as e:
             print(f"[twitter] Login automation failed: {e}")
             raise Exception(f"[twitter] Login failed: {e}")
 
-    def collect_tweets_multi_feed(self, max_count_per_feed: int = 20) -> List[Dict[str, Any]]:
-        """Collect tweets from multiple feeds: Latest, Top, and Homepage"""
-        assert self.driver is not None
-        all_tweets = []
+    def collect_tweets_multi_feed(self, max_count_per_feed: int = 20,
+                                  watermarks: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """Collect tweets from multiple feeds: Latest, Top, and Homepage
+
+        Chronological feeds stop scrolling at their watermark from `watermarks`
+        (feed_key -> highest status id already processed). Every tweet is tagged
+        with its `feed_key` so callers can advance the watermarks afterwards.
+        With `concurrent_feeds` enabled each feed gets its own tab and their
+        scroll steps are interleaved.
+
+        Tweets are de-duplicated across all feeds by status id: each appears
+        once, with every feed it was seen in listed in `feed_sources`.
+        """
+        watermarks = watermarks or {}
         
-        # Get the search query from config
         search_query = self.cfg.search_query
-        from urllib.parse import quote_plus
-        encoded_query = quote_plus(search_query)
+        feeds = build_feeds(search_query)
+        index = TweetIndex()
+        cursors = []
+        for feed in feeds:
+            key = feed_key(feed, search_query)
+            watermark = watermarks.get(key) if feed['chronological'] else None
+            cursors.append(FeedCursor(max_count_per_feed, watermark, feed=feed, key=key, index=index))
         
-        feeds = [
-            {
-                "name": "Latest/Live Feed", 
-                "url": f"https://x.com/search?q={encoded_query}&f=live",
-                "description": "Most recent tweets with your search query"
-            },
-            {
-                "name": "Top Feed", 
-                "url": f"https://x.com/search?q={encoded_query}",
-                "description": "Popular/trending tweets with your search query"
-            },
-            {
-                "name": "Homepage Feed", 
-                "url": "https://x.com/home",
-                "description": "Your personalized timeline"
-            }
-        ]
+        self._collect_feeds(cursors)
+        
+        # Feed info is attached by the index as tweets are added
+        all_tweets = index.records
+        
+        print(f"\n[twitter] === MULTI-FEED COLLECTION COMPLETE ===")
+        print(f"[twitter] Total unique tweets collected: {len(all_tweets)} ({index.duplicates} repeat sightings merged)")
+        for cursor in cursors:
+            print(f"[twitter] - {cursor.feed['name']}: {len(cursor.results)} new tweets")
         
-        for i, feed in enumerate(feeds, 1):
-            print(f"\n[twitter] === FEED {i}/3: {feed['name']} ===")
+        return all_tweets
+
+    def _collect_feeds(self, cursors: List[FeedCursor]):
+        """Run every feed cursor to completion in the browser."""
+        assert self.driver is not None
+        if self.capture is not None:
+            # Responses from earlier navigation (or a previous cycle) are stale
+            self.capture.reset()
+        elif self.lean is not None:
+            self.lean.read_log()
+        if self.lean is not None:
+            self.lean.reset()
+        if self.cfg.concurrent_feeds:
+            self._collect_feeds_concurrent(cursors)
+        else:
+            self._collect_feeds_sequential(cursors)
+        self._report_lean_fetch()
+
+    def _report_lean_fetch(self):
+        if self.lean is None:
+            return
+        try:
+            if self.capture is not None:
+                self.capture.poll()
+            else:
+                self.lean.read_log()
+        except Exception as e:
+            print(f"[leanfetch] Could not read performance log: {e}")
+        self.lean.report()
+
+    def _collect_feeds_sequential(self, cursors: List[FeedCursor]):
+        """Visit the feeds one after another in the current tab."""
+        for i, cursor in enumerate(cursors, 1):
+            feed = cursor.feed
+            print(f"\n[twitter] === FEED {i}/{len(cursors)}: {feed['name']} ===")
             print(f"[twitter] {feed['description']}")
             print(f"[twitter] URL: {feed['url']}")
             
             try:
                 # Navigate to the feed
                 print(f"[twitter] Loading {feed['name']}...")
+                started = time.monotonic()
                 self.driver.get(feed['url'])
-                time.sleep(5)  # Wait for page to load
                 
                 # Wait for tweets to appear
                 try:
-                    WebDriverWait(self.driver, 15).until(
-                        EC.visibility_of_element_located((By.CSS_SELECTOR, TWEET_SELECTOR))
+                    self.waits.until(
+                        self.driver,
+                        EC.visibility_of_element_located((By.CSS_SELECTOR, TWEET_SELECTOR)),
+                        FEED_LOAD_TIMEOUT, "feed load",
                     )
+                    metrics.FEED_LOAD_SECONDS.observe(time.monotonic() - started, feed=feed['kind'], result="loaded")
                     print(f"[twitter] {feed['name']} loaded successfully")
                 except TimeoutException:
+                    metrics.FEED_LOAD_SECONDS.observe(time.monotonic() - started, feed=feed['kind'], result="timeout")
                     print(f"[twitter] No tweets found in {feed['name']}, skipping...")
                     continue
                 
                 # Collect tweets from this feed
-                feed_tweets = self.collect_tweets(max_count=max_count_per_feed)
-                print(f"[twitter] Collected {len(feed_tweets)} tweets from {feed['name']}")
-                
-                # Add feed info to each tweet
-                for tweet in feed_tweets:
-                    tweet['feed_source'] = feed['name']
-                    tweet['feed_url'] = feed['url']
-                
-                all_tweets.extend(feed_tweets)
+                self._run_cursor(cursor)
+                print(f"[twitter] Collected {len(cursor.results)} tweets from {feed['name']}")
                 
                 # Short break between feeds
-                if i < len(feeds):
-                    print(f"[twitter] Waiting 3 seconds before next feed...")
-                    time.sleep(3)
+                if i < len(cursors):
+                    self.waits.jitter(2.0, 4.0, "between feeds")
                     
             except Exception as e:
                 print(f"[twitter] Error collecting from {feed['name']}: {e}")
                 continue
-        
-        print(f"\n[twitter] === MULTI-FEED COLLECTION COMPLETE ===")
-        print(f"[twitter] Total tweets collected: {len(all_tweets)}")
-        for feed in feeds:
-            feed_count = len([t for t in all_tweets if t.get('feed_source') == feed['name']])
-            print(f"[twitter] - {feed['name']}: {feed_count} tweets")
-        
-        return all_tweets
 
-    def collect_tweets(self, max_count: int = 40) -> List[Dict[str, Any]]:
-        assert self.driver is not None
-        print(f"[twitter] Collecting up to {max_count} tweets...")
-        results = []
-        last_height = 0
-        retries = 0
-        scroll_attempts = 0
-        max_scroll_attempts = 15  # Increased from 5
-        refresh_attempts = 0
-        max_refresh_attempts = 3  # Max times to refresh search page
-        
-        while len(results) < max_count and retries < 8:  # Increased retry limit
-            articles = self.driver.find_elements(By.CSS_SELECTOR, TWEET_SELECTOR)
-            print(f"[twitter] Found {len(articles)} tweet articles on page.")
+    def _collect_feeds_concurrent(self, cursors: List[FeedCursor]):
+        """Load every feed in its own tab and interleave their scroll steps.
+
+        Navigation is started with a non-blocking location change, so while one
+        tab is still waiting on the network the others are being extracted and
+        scrolled. Wall time tends towards the slowest feed instead of the sum.
+        """
+        main_handle = self.driver.current_window_handle
+        print(f"\n[twitter] === Loading {len(cursors)} feeds in parallel tabs ===")
+        try:
+            for i, cursor in enumerate(cursors):
+                if i > 0:
+                    self.driver.switch_to.new_window('tab')
+                    if self.lean is not None:
+                        self.lean.apply()
+                cursor.handle = self.driver.current_window_handle
+                cursor.opened_at = time.time()
+                print(f"[twitter] Tab {i + 1}: {cursor.feed['name']} -> {cursor.feed['url']}")
+                self.driver.execute_script("window.location.href = arguments[0];", cursor.feed['url'])
             
-            # If no tweets found and we haven't scrolled much, try refreshing the search page
-            if len(articles) == 0 and scroll_attempts < 3 and refresh_attempts < max_refresh_attempts:
-                print(f"[twitter] No tweets found on search page. Refreshing... (attempt {refresh_attempts + 1}/{max_refresh_attempts})")
-                refresh_attempts += 1
+            while any(not c.done for c in cursors):
+                round_started = time.monotonic()
+                stepped = False
+                for cursor in cursors:
+                    if cursor.done:
+                        continue
+                    name = cursor.feed['name']
+                    try:
+                        self.driver.switch_to.window(cursor.handle)
+                        if not cursor.loaded:
+                            load_secs = time.time() - cursor.opened_at
+                            if self.driver.execute_script(TWEETS_PRESENT_JS):
+                                cursor.loaded = True
+                                metrics.FEED_LOAD_SECONDS.observe(load_secs, feed=cursor.feed['kind'], result="loaded")
+                                print(f"[twitter] {name} loaded after {load_secs:.1f}s")
+                            elif load_secs > FEED_LOAD_TIMEOUT:
+                                metrics.FEED_LOAD_SECONDS.observe(load_secs, feed=cursor.feed['kind'], result="timeout")
+                                print(f"[twitter] No tweets found in {name}, skipping...")
+                                cursor.done = True
+                            continue
+                        self._collect_step(cursor)
+                        stepped = True
+                        if cursor.done:
+                            print(f"[twitter] Collected {len(cursor.results)} tweets from {name}")
+                    except Exception as e:
+                        print(f"[twitter] Error collecting from {name}: {e}")
+                        cursor.done = True
+                # One pause per round: each tab has been idle while the others ran
+                if stepped:
+                    self._jitter(1.0, 2.5)
+                elapsed = time.monotonic() - round_started
+                if elapsed < MIN_ROUND_SECONDS:
+                    self.waits.pause(MIN_ROUND_SECONDS - elapsed, "scroll load" if stepped else "feed load")
+        finally:
+            for cursor in cursors:
+                if cursor.handle and cursor.handle != main_handle:
+                    try:
+                        self.driver.switch_to.window(cursor.handle)
+                        self.driver.close()
+                    except Exception:
+                        pass
+            try:
+                self.driver.switch_to.window(main_handle)
+            except Exception as e:
+                print(f"[twitter] Could not return to main tab: {e}")
+
+    def _extract_and_scroll(self, scroll_distance: int, seen_ids: Optional[List[str]] = None):
+        """Serialize the rendered tweets not in seen_ids and scroll, in a single WebDriver call.
+
+        Returns (article_count, tweets, seen_ids_on_page, page_height,
+        last_permalink) where the height and last rendered permalink are read
+        before scrolling.
+        """
+        res = self.driver.execute_script(EXTRACT_AND_SCROLL_JS, scroll_distance, seen_ids or []) or {}
+        return (res.get("count", 0), res.get("tweets") or [], res.get("seen") or [],
+                res.get("height", 0), res.get("last"))
+
+    def _extract_articles_webdriver(self, index: Optional[TweetIndex] = None):
+        """Extract the rendered tweets field by field (one WebDriver call per lookup).
+
+        Articles whose permalink is already in `index` are skipped after a
+        single lookup. Returns (article_count, tweets, seen_status_ids).
+        """
+        articles = self.driver.find_elements(By.CSS_SELECTOR, TWEET_SELECTOR)
+        records = []
+        seen_ids = []
+        for art in articles:
+            try:
+                if index is not None and len(index):
+                    links = art.find_elements(By.CSS_SELECTOR, 'a[href*="/status/"]')
+                    sid = parse_status_id(links[0].get_attribute('href')) if links else None
+                    if sid is not None and sid in index:
+                        seen_ids.append(sid)
+                        continue
+
+                tid = art.get_attribute("data-tweet-id") or art.get_attribute("id") or None
+                # fallback: use time href as unique-ish id
+                time_el = art.find_element(By.CSS_SELECTOR, TIME_SELECTOR)
+                tid = tid or time_el.get_attribute("datetime") or time_el.get_attribute("aria-label")
+                text_el = art.find_element(By.CSS_SELECTOR, TWEET_TEXT_SELECTOR)
+                text = text_el.text
                 
-                # Refresh the search page
-                self.driver.refresh()
-                time.sleep(5)  # Wait for page to reload
+                # Extract username
+                username = "Unknown User"
+                try:
+                    # Try multiple selectors for username
+                    username_selectors = [
+                        'div[data-testid="User-Name"] span:not([role="img"])',
+                        '[data-testid="User-Name"] span',
+                        'div[data-testid="User-Names"] span:first-child',
+                        'a[role="link"] span'
+                    ]
+                    for selector in username_selectors:
+                        username_els = art.find_elements(By.CSS_SELECTOR, selector)
+                        if username_els:
+                            username_text = username_els[0].text.strip()
+                            if username_text and not username_text.startswith('@'):
+                                username = username_text
+                                break
+                except Exception:
+                    pass
                 
-                # Wait for tweets to appear or timeout
+                # Extract timestamp
+                timestamp = "Unknown Time"
                 try:
-                    WebDriverWait(self.driver, 15).until(
-                        EC.visibility_of_element_located((By.CSS_SELECTOR, TWEET_SELECTOR))
-                    )
-                    print("[twitter] Search page refreshed and tweets loaded.")
-                except TimeoutException:
-                    print("[twitter] Timeout waiting for tweets after refresh. Continuing...")
+                    time_element = art.find_element(By.CSS_SELECTOR, TIME_SELECTOR)
+                    timestamp = time_element.get_attribute("datetime") or time_element.get_attribute("title") or time_element.text
+                except Exception:
+                    pass
                 
-                continue  # Restart the loop after refresh
-            
-            for art in articles:
+                # Extract post URL
+                post_url = "Unknown URL"
                 try:
-                    tid = art.get_attribute("data-tweet-id") or art.get_attribute("id") or None
-                    # fallback: use time href as unique-ish id
-                    time_el = art.find_element(By.CSS_SELECTOR, TIME_SELECTOR)
-                    tid = tid or time_el.get_attribute("datetime") or time_el.get_attribute("aria-label")
-                    text_el = art.find_element(By.CSS_SELECTOR, TWEET_TEXT_SELECTOR)
-                    text = text_el.text
-                    
-                    # Extract username
-                    username = "Unknown User"
-                    try:
-                        # Try multiple selectors for username
-                        username_selectors = [
-                            'div[data-testid="User-Name"] span:not([role="img"])',
-                            '[data-testid="User-Name"] span',
-                            'div[data-testid="User-Names"] span:first-child',
-                            'a[role="link"] span'
-                        ]
-                        for selector in username_selectors:
-                            username_els = art.find_elements(By.CSS_SELECTOR, selector)
-                            if username_els:
-                                username_text = username_els[0].text.strip()
-                                if username_text and not username_text.startswith('@'):
-                                    username = username_text
-                                    break
-                    except Exception:
-                        pass
-                    
-                    # Extract timestamp
-                    timestamp = "Unknown Time"
-                    try:
-                        time_element = art.find_element(By.CSS_SELECTOR, TIME_SELECTOR)
-                        timestamp = time_element.get_attribute("datetime") or time_element.get_attribute("title") or time_element.text
-                    except Exception:
-                        pass
+                    # Look for the permalink to the tweet
+                    time_link = art.find_element(By.CSS_SELECTOR, 'time').find_element(By.XPATH, '..')
+                    if time_link.tag_name == 'a':
+                        href = time_link.get_attribute('href')
+                        if href:
+                            post_url = href
+                except Exception:
+                    pass
+                
+                # Extract engagement metrics (likes, comments, reposts)
+                likes = "0"
+                comments = "0"
+                reposts = "0"
+                try:
+                    # Try multiple selectors for engagement buttons
+                    engagement_selectors = [
+                        'div[role="group"] button',
+                        'div[role="group"] div[role="button"]',
+                        '[data-testid="like"]',
+                        '[data-testid="reply"]',
+                        '[data-testid="retweet"]'
+                    ]
                     
-                    # Extract post URL
-                    post_url = "Unknown URL"
-                    try:
-                        # Look for the permalink to the tweet
-                        time_link = art.find_element(By.CSS_SELECTOR, 'time').find_element(By.XPATH, '..')
-                        if time_link.tag_name == 'a':
-                            href = time_link.get_attribute('href')
-                            if href:
-                                post_url = href
-                    except Exception:
-                        pass
+                    engagement_buttons = []
+                    for selector in engagement_selectors:
+                        try:
+                            buttons = art.find_elements(By.CSS_SELECTOR, selector)
+                            engagement_buttons.extend(buttons)
+                        except Exception:
+                            continue
                     
-                    # Extract engagement metrics (likes, comments, reposts)
-                    likes = "0"
-                    comments = "0"
-                    reposts = "0"
-                    try:
-                        # Try multiple selectors for engagement buttons
-                        engagement_selectors = [
-                            'div[role="group"] button',
-                            'div[role="group"] div[role="button"]',
-                            '[data-testid="like"]',
-                            '[data-testid="reply"]',
-                            '[data-testid="retweet"]'
-                        ]
-                        
-                        engagement_buttons = []
-                        for selector in engagement_selectors:
-                            try:
-                                buttons = art.find_elements(By.CSS_SELECTOR, selector)
-                                engagement_buttons.extend(buttons)
-                            except Exception:
-                                continue
-                        
-                        for button in engagement_buttons:
-                            try:
-                                aria_label = button.get_attribute('aria-label') or ""
-                                button_text = button.text or ""
-                                
-                                # Parse engagement counts from aria-labels and text
-                                import re
-                                combined_text = (aria_label + " " + button_text).lower()
-                                
-                                if any(word in combined_text for word in ['like', 'heart']):
-                                    match = re.search(r'(\d+)', combined_text)
-                                    if match:
-                                        likes = match.group(1)
-                                elif any(word in combined_text for word in ['repl', 'comment']):
-                                    match = re.search(r'(\d+)', combined_text)
-                                    if match:
-                                        comments = match.group(1)
-                                elif any(word in combined_text for word in ['repost', 'retweet', 'share']):
-                                    match = re.search(r'(\d+)', combined_text)
-                                    if match:
-                                        reposts = match.group(1)
-                            except Exception:
-                                continue
-                    except Exception:
-                        pass
-                    
-                    results.append({
-                        "id": tid,
-                        "text": text,
-                        "username": username,
-                        "timestamp": timestamp,
-                        "post_url": post_url,
-                        "likes": likes,
-                        "comments": comments,
-                        "reposts": reposts,
-                    })
+                    for button in engagement_buttons:
+                        try:
+                            aria_label = button.get_attribute('aria-label') or ""
+                            button_text = button.text or ""
+                            
+                            # Parse engagement counts from aria-labels and text
+                            import re
+                            combined_text = (aria_label + " " + button_text).lower()
+                            
+                            if any(word in combined_text for word in ['like', 'heart']):
+                                match = re.search(r'(\d+)', combined_text)
+                                if match:
+                                    likes = match.group(1)
+                            elif any(word in combined_text for word in ['repl', 'comment']):
+                                match = re.search(r'(\d+)', combined_text)
+                                if match:
+                                    comments = match.group(1)
+                            elif any(word in combined_text for word in ['repost', 'retweet', 'share']):
+                                match = re.search(r'(\d+)', combined_text)
+                                if match:
+                                    reposts = match.group(1)
+                        except Exception:
+                            continue
                 except Exception:
-                    continue
+                    pass
+                
+                records.append({
+                    "id": tid,
+                    "text": text,
+                    "username": username,
+                    "timestamp": timestamp,
+                    "post_url": post_url,
+                    "likes": likes,
+                    "comments": comments,
+                    "reposts": reposts,
+                })
+            except Exception:
+                continue
+
+        return len(articles), records, seen_ids
+
+    def collect_tweets(self, max_count: int = 40, watermark: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Scroll the current timeline and collect up to max_count tweets.
+
+        When a watermark (status id) is given the timeline is assumed to be
+        newest-first: tweets at or below it are dropped and scrolling stops as
+        soon as one is reached.
+        """
+        assert self.driver is not None
+        cursor = FeedCursor(max_count, watermark)
+        self._run_cursor(cursor)
+        return cursor.results
+
+    def _run_cursor(self, cursor: FeedCursor):
+        """Step a single feed in the current tab until it is done."""
+        if cursor.watermark:
+            print(f"[twitter] Collecting up to {cursor.max_count} tweets newer than {cursor.watermark}...")
+        else:
+            print(f"[twitter] Collecting up to {cursor.max_count} tweets...")
+        while not cursor.done:
+            self._collect_step(cursor)
+            if not cursor.done:
+                self._settle(cursor)
+        print(f"[twitter] Finished collecting. Got {len(cursor.results)} tweets after {cursor.scroll_attempts} scroll attempts.")
+
+    def _settle(self, cursor: FeedCursor):
+        """Wait for the last scroll to render new tweets, then a budgeted jitter."""
+        self.waits.poll(
+            self.driver,
+            lambda d: d.execute_script(LAST_RENDERED_JS) != cursor.last_rendered,
+            SCROLL_SETTLE_TIMEOUT, "scroll load",
+        )
+        self._jitter(0.3, 1.2)
 
-            # More aggressive scrolling
-            scroll_distance = random.randint(800, 1500)  # Increased scroll distance
+    def _collect_step(self, cursor: FeedCursor):
+        """Extract the rendered tweets of the current tab and scroll once.
+
+        The page height is read before scrolling, so it reflects whatever
+        loaded during the pause since the previous step.
+        """
+        # More aggressive scrolling
+        scroll_distance = random.randint(800, 1500)  # Increased scroll distance
+        metrics.SCROLL_PASSES.inc(feed=cursor.feed["kind"] if cursor.feed else "timeline")
+        if self.capture is not None:
+            res = self.driver.execute_script(SCROLL_ONLY_JS, scroll_distance) or {}
+            article_count, new_height = res.get("count", 0), res.get("height", 0)
+            cursor.last_rendered = res.get("last")
+            kind = cursor.feed["kind"] if cursor.feed else None
+            batch = self.capture.drain(kind)
+            seen_ids = []
+        elif self.cfg.extraction_mode == "observer":
+            res = self.driver.execute_script(OBSERVE_AND_SCROLL_JS, scroll_distance) or {}
+            article_count, batch, seen_ids = res.get("count", 0), res.get("tweets") or [], []
+            new_height, cursor.last_rendered = res.get("height", 0), res.get("last")
+        elif self.cfg.extraction_mode == "script":
+            article_count, batch, seen_ids, new_height, cursor.last_rendered = \
+                self._extract_and_scroll(scroll_distance, cursor.index.ids())
+        else:
+            article_count, batch, seen_ids = self._extract_articles_webdriver(cursor.index)
+            new_height = self.driver.execute_script("return document.body.scrollHeight")
             self.driver.execute_script(f"window.scrollBy(0, {scroll_distance});")
-            print(f"[twitter] Scrolled {scroll_distance}px. Collected {len(results)} tweets so far.")
-            self._jitter(1.0, 2.5)  # Longer wait between scrolls
+        print(f"[twitter] Found {article_count} tweet articles on page.")
+        
+        # If no tweets found and we haven't scrolled much, try refreshing the search page
+        if article_count == 0 and cursor.scroll_attempts < 3 and cursor.refresh_attempts < MAX_REFRESH_ATTEMPTS:
+            # Responses drained from the capture are gone once we refresh
+            if batch and self._accept_batch(cursor, batch, seen_ids):
+                cursor.done = True
+                return
+            print(f"[twitter] No tweets found on search page. Refreshing... (attempt {cursor.refresh_attempts + 1}/{MAX_REFRESH_ATTEMPTS})")
+            cursor.refresh_attempts += 1
             
-            # Check if we've scrolled to more content
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                retries += 1
-                print(f"[twitter] No new content loaded. Retry {retries}/8")
-                # Try scrolling to bottom then back up to trigger loading
-                if retries % 2 == 0:
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    self.driver.execute_script(f"window.scrollBy(0, -{scroll_distance});")
-            else:
-                retries = 0
-                print(f"[twitter] Page height changed from {last_height} to {new_height}")
+            # Refresh the search page
+            self.driver.refresh()
             
-            last_height = new_height
-            scroll_attempts += 1
+            # Wait for tweets to appear or timeout
+            try:
+                self.waits.until(
+                    self.driver,
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, TWEET_SELECTOR)),
+                    FEED_LOAD_TIMEOUT, "refresh",
+                )
+                print("[twitter] Search page refreshed and tweets loaded.")
+            except TimeoutException:
+                print("[twitter] Timeout waiting for tweets after refresh. Continuing...")
             
-            if scroll_attempts >= max_scroll_attempts:
-                print(f"[twitter] Reached max scroll attempts ({max_scroll_attempts})")
-                break
-                
-        print(f"[twitter] Finished collecting. Got {len(results)} tweets after {scroll_attempts} scroll attempts.")
-        return results
+            return  # Restart from a fresh extraction after refresh
+        
+        if self._accept_batch(cursor, batch, seen_ids):
+            print(f"[twitter] Reached watermark {cursor.watermark}. Collected {len(cursor.results)} new tweets.")
+            cursor.done = True
+            return
+        print(f"[twitter] Scrolled {scroll_distance}px. Collected {len(cursor.results)} tweets so far.")
+        
+        # Check if we've scrolled to more content
+        if new_height == cursor.last_height:
+            cursor.retries += 1
+            print(f"[twitter] No new content loaded. Retry {cursor.retries}/{MAX_STALL_RETRIES}")
+            # Try scrolling to bottom then back up to trigger loading
+            if cursor.retries % 2 == 0:
+                bottom = self.driver.execute_script(
+                    "window.scrollTo(0, document.body.scrollHeight); return document.body.scrollHeight;"
+                )
+                self.waits.poll(
+                    self.driver,
+                    lambda d: d.execute_script("return document.body.scrollHeight") > bottom,
+                    2, "scroll load",
+                )
+                self.driver.execute_script(f"window.scrollBy(0, -{scroll_distance});")
+        else:
+            cursor.retries = 0
+            print(f"[twitter] Page height changed from {cursor.last_height} to {new_height}")
+        
+        cursor.last_height = new_height
+        cursor.scroll_attempts += 1
+        
+        if cursor.scroll_attempts >= MAX_SCROLL_ATTEMPTS:
+            print(f"[twitter] Reached max scroll attempts ({MAX_SCROLL_ATTEMPTS})")
+            cursor.done = True
+        elif len(cursor.results) >= cursor.max_count or cursor.retries >= MAX_STALL_RETRIES:
+            cursor.done = True
+
+    def _accept_batch(self, cursor: FeedCursor, batch: List[Dict[str, Any]], seen_ids: List[Any]) -> bool:
+        """Index one step's tweets into the cursor; True once its watermark is reached."""
+        reached_watermark = False
+        if cursor.watermark:
+            fresh = []
+            for tweet in batch:
+                sid = parse_status_id(tweet)
+                if sid is not None and sid <= cursor.watermark:
+                    reached_watermark = True
+                else:
+                    fresh.append(tweet)
+            batch = fresh
+        for sid in seen_ids:
+            cursor.index.mark_seen(sid, cursor.feed, cursor.key)
+        batch = [t for t in batch if cursor.index.add(t, cursor.feed, cursor.key)]
+        cursor.results.extend(batch)
+        if batch:
+            metrics.TWEETS_EXTRACTED.inc(len(batch), feed=cursor.feed["kind"] if cursor.feed else "timeline")
+        return reached_watermark
 
     def filter_matches(self, tweets: List[Dict[str, Any]]):
         print(f"[twitter] Filtering {len(tweets)} tweets for matches...")
+        # Compiled once per phrase set and reused for every tweet
+        matcher = get_matcher(self.cfg.required_post_keywords)
         matches = []
+        no_address = no_phrase = 0
         for t in tweets:
             text = t.get("text", "")
+            addrs, links = matcher.extract_candidates(text)
             
             # Check for contract address only if required
-            if self.cfg.contact_address_required and not has_contact_address(text):
+            if self.cfg.contact_address_required and not (addrs or links):
+                no_address += 1
                 continue
                 
             # Check for launch phrases only if keywords are configured
-            launch_phrases = get_launch_phrases()
-            if launch_phrases and len(launch_phrases) > 0:
-                # If launch phrases are configured, require them
-                if not contains_launch_phrase(text):
-                    continue
-            # If no launch phrases configured, skip this filter
+            if matcher.phrases and not matcher.contains_launch_phrase(text):
+                no_phrase += 1
+                continue
                 
-            addrs, links = extract_candidates(text)
             matches.append({
                 "id": t.get("id"), 
                 "text": text, 
@@ -639,12 +1308,19 @@ class TwitterWatcher:
                 "reposts": t.get("reposts", "0"),
                 "feed_source": t.get("feed_source", "Unknown Feed"),
                 "feed_url": t.get("feed_url", ""),
-                "mints": list(set(addrs + links))
+                "feed_sources": t.get("feed_sources", []),
+                "feed_keys": t.get("feed_keys", []),
+                "handle": t.get("handle", ""),
+                "mints": list(dict.fromkeys(addrs + links))
             })
         
+        metrics.FILTER_RESULTS.inc(len(matches), result="matched")
+        metrics.FILTER_RESULTS.inc(no_address, result="no_contract_address")
+        metrics.FILTER_RESULTS.inc(no_phrase, result="no_launch_phrase")
+
         # Update the log message based on filtering criteria
         filter_msg = []
-        if get_launch_phrases():
+        if matcher.phrases:
             filter_msg.append("launch keywords")
         if self.cfg.contact_address_required:
             filter_msg.append("contract address")
@@ -0,0 +1,81 @@
+import random
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from . import metrics
+from .config import Config
+
+
+class WaitPolicy:
+    """Condition-based waits for the scraper, with time accounted per stage.
+
+    Every wait goes through here so a cycle can report how long it sat idle and
+    why. Random pauses used purely to look less robotic are a separate knob:
+    `jitter` draws from a per-cycle budget (`jitter_budget_sec`) and returns
+    immediately once it is spent.
+    """
+
+    def __init__(self, cfg: Config):
+        self.cfg = cfg
+        self.poll_interval = 0.2
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.jitter_spent = 0.0
+
+    def reset(self):
+        """Start accounting for a new cycle (also refills the jitter budget)."""
+        self.stage_seconds.clear()
+        self.jitter_spent = 0.0
+
+    def _account(self, stage: str, started: float):
+        elapsed = time.monotonic() - started
+        self.stage_seconds[stage] += elapsed
+        metrics.WAIT_SECONDS.inc(elapsed, stage=stage)
+
+    def until(self, driver, condition: Callable[[Any], Any], timeout: float, stage: str) -> Any:
+        """Wait until condition(driver) is truthy and return it.
+
+        Raises TimeoutException like WebDriverWait.
+        """
+        started = time.monotonic()
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=self.poll_interval).until(condition)
+        finally:
+            self._account(stage, started)
+
+    def poll(self, driver, condition: Callable[[Any], Any], timeout: float, stage: str) -> Optional[Any]:
+        """Like until(), but returns None on timeout instead of raising."""
+        try:
+            return self.until(driver, condition, timeout, stage)
+        except TimeoutException:
+            return None
+
+    def pause(self, seconds: float, stage: str):
+        """A fixed wait with nothing to poll for (e.g. retry backoff)."""
+        started = time.monotonic()
+        time.sleep(seconds)
+        self._account(stage, started)
+
+    def jitter(self, a: float, b: float, stage: str = "jitter"):
+        """Random anti-detection pause, capped by the remaining cycle budget."""
+        remaining = self.cfg.jitter_budget_sec - self.jitter_spent
+        if remaining <= 0:
+            return
+        delay = min(random.uniform(a, b), remaining)
+        self.jitter_spent += delay
+        self.pause(delay, stage)
+
+    def total(self) -> float:
+        return sum(self.stage_seconds.values())
+
+    def report(self):
+        """Print the idle time spent in each stage this cycle."""
+        if not self.stage_seconds:
+            return
+        print(f"[waits] Idle {self.total():.1f}s this cycle "
+              f"(jitter {self.jitter_spent:.1f}/{self.cfg.jitter_budget_sec}s budget):")
+        for stage, seconds in sorted(self.stage_seconds.items(), key=lambda kv: -kv[1]):
+            print(f"[waits] - {stage}: {seconds:.1f}s")
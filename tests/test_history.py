@@ -0,0 +1,23 @@
+from src.history import MatchHistory
+
+
+def _history(tmp_path) -> MatchHistory:
+    history = MatchHistory(str(tmp_path / "history.db"))
+    history.record([{
+        "username": "Foo Bar",
+        "handle": "@foo",
+        "text": "new token",
+        "post_url": "https://x.com/foo/status/1900000000000000000",
+        "mints": ["MintAddress111"],
+    }])
+    return history
+
+
+def test_search_by_handle_with_or_without_at(tmp_path):
+    history = _history(tmp_path)
+    try:
+        for username in ("@foo", "foo", "Foo Bar"):
+            assert len(history.search(username=username)["items"]) == 1
+        assert history.search(username="bar")["items"] == []
+    finally:
+        history.close()
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+
+from src.config import Config
+from src.scheduler import AdaptiveScheduler
+
+
+def _cfg() -> Config:
+    return Config(use_env=False).replace(run_interval_sec=300, min_interval_sec=60, max_interval_sec=1800)
+
+
+def _tweet(age_min: float, likes: str) -> dict:
+    posted = datetime.now(timezone.utc) - timedelta(minutes=age_min)
+    return {"timestamp": posted.isoformat(), "likes": likes, "comments": "0", "reposts": "0", "mints": []}
+
+
+def test_popular_old_tweet_does_not_hold_interval_at_floor():
+    scheduler = AdaptiveScheduler(_cfg())
+    # Top/Home keep returning the same popular tweet, already alerted on
+    intervals = [scheduler.record("q", tweets=20, new_items=[]) for _ in range(4)]
+    assert intervals == sorted(intervals)
+    assert intervals[-1] > 300
+
+
+def test_fast_new_tweet_shortens_interval():
+    scheduler = AdaptiveScheduler(_cfg())
+    assert scheduler.record("q", tweets=20, new_items=[_tweet(120, "3.1K")]) == 150